@@ -12,6 +12,7 @@ import data_recorder
 from simworld.config import Config
 from simworld.communicator.communicator import Communicator
 from simworld.communicator.unrealcv import UnrealCV
+from simworld.communicator.session_record import ReplayClient
 from simworld.llm.a2a_llm import A2ALLM
 from simworld.map.map import Map
 from simworld.agent.humanoid import Humanoid
@@ -30,6 +31,15 @@ parser.add_argument("--ue_port", type=int, default=9000, help="UnrealCV 后端
 parser.add_argument(
     "--vllm_port", type=int, default=8000, help="VLLM 端口 (已内置则忽略)"
 )
+parser.add_argument(
+    "--record", type=str, default=None, help="Record the UnrealCV session to this file"
+)
+parser.add_argument(
+    "--replay", type=str, default=None, help="Replay a recorded UnrealCV session instead of connecting to UE"
+)
+parser.add_argument(
+    "--replay_realtime", action="store_true", help="Replay with the recorded UnrealCV latency"
+)
 args = parser.parse_args()
 
 # Set API Key
@@ -40,7 +50,12 @@ os.environ["OPENAI_API_KEY"] = "EMPTY"
 # 2. 初始化 UnrealCV 连接 (使用传入的端口)
 # ==========================================================
 print(f"[{args.round}] Initializing UnrealCV on Port: {args.ue_port}")
-unrealcv = UnrealCV(port=args.ue_port)
+if args.replay:
+    unrealcv = UnrealCV(port=args.ue_port, client=ReplayClient(args.replay, realtime=args.replay_realtime))
+else:
+    unrealcv = UnrealCV(port=args.ue_port)
+if args.record:
+    unrealcv.start_recording(args.record)
 communicator = Communicator(unrealcv)
 config = Config()
 
@@ -520,5 +535,6 @@ if __name__ == "__main__":
     try:
         main()
     finally:
+        unrealcv.stop_recording()
         # 强制退出，防止并行进程中的多线程导致僵死
         os._exit(0)
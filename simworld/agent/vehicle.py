@@ -138,6 +138,15 @@ class Vehicle(BaseAgent):
         """
         return self.position.distance(self.current_lane.end) < self.config['traffic.vehicle.distance_to_end'] + self.length / 2
 
+    def is_close_to_leader(self):
+        """Check if the vehicle ahead on the same lane is within the following distance.
+
+        Returns:
+            bool: True if the gap to the leading vehicle is too small.
+        """
+        leader, gap = self.current_lane.get_leader(self)
+        return leader is not None and gap <= 1.5 * self.config['traffic.distance_between_objects']
+
     def is_close_to_object(self, vehicles, pedestrians):
         """Detect objects in the vehicle's path.
 
@@ -197,9 +206,9 @@ class Vehicle(BaseAgent):
         Args:
             next_lane: The lane to change to.
         """
-        self.current_lane.vehicles.remove(self)
+        self.current_lane.remove_vehicle(self)
         self.current_lane = next_lane
-        self.current_lane.vehicles.append(self)
+        self.current_lane.add_vehicle(self)
 
         waypoints = cal_waypoints(next_lane.start, next_lane.end, self.config['traffic.gap_between_waypoints'])
         self.add_waypoint(waypoints)
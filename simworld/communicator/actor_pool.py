@@ -0,0 +1,252 @@
+"""Actor pool module.
+
+This module keeps UE actors that are no longer needed parked out of view instead
+of destroying them, and hands them back to later spawns of the same model with one
+teleport and state reset, so that an episode reset only spawns the actors it is
+missing.
+"""
+import threading
+from collections import defaultdict
+
+from simworld.communicator.unrealcv import UnrealCV
+
+VEHICLE_PREFIX = 'GEN_BP_Vehicle_'
+PEDESTRIAN_PREFIX = 'GEN_BP_Pedestrian_'
+
+
+class ActorPool:
+    """Pool of parked UE actors, grouped by model.
+
+    The pool only tracks actors spawned while it is enabled, since the model of an
+    actor is needed to hand it back to a matching spawn.
+    """
+
+    def __init__(self, park_location: tuple = (0.0, 0.0, -20000.0), park_spacing: float = 500.0,
+                 park_columns: int = 100):
+        """Initialize the pool.
+
+        Args:
+            park_location: Location (x, y, z) of the first parking slot, out of view of the cameras.
+            park_spacing: Distance between parking slots, so that parked actors do not overlap.
+            park_columns: Number of parking slots per row.
+        """
+        self.park_location = park_location
+        self.park_spacing = park_spacing
+        self.park_columns = park_columns
+
+        self.lock = threading.Lock()
+        self.models = {}  # {actor_name: model_path} of all pooled actors, parked or in use
+        self.parked = defaultdict(dict)  # {model_path: {actor_name: None}}, in parking order
+        self.hits = 0
+        self.misses = 0
+        self._next_slot = 0
+
+    def __len__(self):
+        """Get the number of parked actors.
+
+        Returns:
+            int: Number of parked actors.
+        """
+        with self.lock:
+            return sum(len(names) for names in self.parked.values())
+
+    def __contains__(self, actor_name):
+        """Check whether an actor is tracked by the pool.
+
+        Args:
+            actor_name: Name of the actor in UE.
+
+        Returns:
+            bool: True if the actor is parked or in use.
+        """
+        return actor_name in self.models
+
+    def is_parked(self, actor_name: str):
+        """Check whether an actor is parked.
+
+        Args:
+            actor_name: Name of the actor in UE.
+
+        Returns:
+            bool: True if the actor is parked.
+        """
+        with self.lock:
+            model_path = self.models.get(actor_name)
+            return model_path is not None and actor_name in self.parked[model_path]
+
+    def register(self, actor_name: str, model_path: str):
+        """Track a freshly spawned actor as in use.
+
+        Args:
+            actor_name: Name of the actor in UE.
+            model_path: Blueprint path the actor was spawned from.
+        """
+        with self.lock:
+            self._discard(actor_name)
+            self.models[actor_name] = model_path
+
+    def forget(self, *actor_names):
+        """Stop tracking actors, e.g. because they were destroyed.
+
+        Args:
+            *actor_names: Names of the actors in UE.
+        """
+        with self.lock:
+            for actor_name in actor_names:
+                self._discard(actor_name)
+
+    def park(self, actor_names):
+        """Mark actors as parked and build the commands that park them.
+
+        Each actor is stopped, made movable, hidden, stripped of collision and
+        teleported to its own parking slot. Vehicles also stop simulating physics,
+        which drops their velocity and keeps them in their slot.
+
+        Args:
+            actor_names: Names of the actors in UE.
+
+        Returns:
+            tuple: (cmds, unknown_names), with cmds a mapping from actor name to its
+            parking commands and unknown_names the actors that are not tracked by the
+            pool and therefore not parked.
+        """
+        cmds, unknown_names = {}, []
+        with self.lock:
+            for actor_name in actor_names:
+                model_path = self.models.get(actor_name)
+                if model_path is None:
+                    unknown_names.append(actor_name)
+                    continue
+                if actor_name in self.parked[model_path]:
+                    continue
+                self.parked[model_path][actor_name] = None
+                x, y, z = self._slot_location(self._next_slot)
+                self._next_slot += 1
+                cmds[actor_name] = self._stop_cmds(actor_name) + [
+                    f'vset /object/{actor_name}/object_mobility True',
+                    f'vset /object/{actor_name}/hide',
+                    f'vset /object/{actor_name}/collision False',
+                    f'vset /object/{actor_name}/location {x} {y} {z}',
+                ]
+        return cmds, unknown_names
+
+    def acquire(self, actor_name: str, model_path: str, exact: bool = True):
+        """Take a parked actor of a model out of the pool.
+
+        Args:
+            actor_name: Requested actor name.
+            model_path: Requested blueprint path.
+            exact: Whether only the actor with the requested name may be handed back.
+                If False, any parked actor of the model is.
+
+        Returns:
+            str or None: Name of the parked actor handed back, or None if there is none.
+        """
+        with self.lock:
+            parked = self.parked.get(model_path)
+            if parked:
+                if actor_name in parked:
+                    del parked[actor_name]
+                    self.hits += 1
+                    return actor_name
+                if not exact:
+                    name = next(iter(parked))
+                    del parked[name]
+                    self.hits += 1
+                    return name
+            return None
+
+    def evict(self, actor_name: str, model_path: str):
+        """Drop a parked actor whose name is requested for a different model.
+
+        Args:
+            actor_name: Requested actor name.
+            model_path: Requested blueprint path.
+
+        Returns:
+            bool: True if a parked actor of another model holds the name and was
+            dropped, meaning it has to be destroyed before the name can be spawned.
+        """
+        with self.lock:
+            parked_model = self.models.get(actor_name)
+            if parked_model is None or parked_model == model_path or actor_name not in self.parked[parked_model]:
+                return False
+            self._discard(actor_name)
+            return True
+
+    def count_miss(self, count: int = 1):
+        """Count spawns that found no parked actor.
+
+        Args:
+            count: Number of spawns.
+        """
+        with self.lock:
+            self.misses += count
+
+    @staticmethod
+    def reuse_cmds(actor: dict, parked_name: str):
+        """Build the commands that hand a parked actor back to a spawn.
+
+        They are the spawn commands of the actor without the spawn itself, preceded by
+        renaming the parked actor to the requested name if needed, stopping it and
+        showing it again. Vehicles simulate physics again once in place, starting at rest.
+
+        Args:
+            actor: Spawn description, see ``Communicator.spawn_actors``.
+            parked_name: Name of the parked actor in UE.
+
+        Returns:
+            list: Commands to send.
+        """
+        name = actor['name']
+        cmds = [f'vset /object/{parked_name}/name {name}'] if parked_name != name else []
+        cmds.extend(ActorPool._stop_cmds(name))
+        cmds.append(f'vset /object/{name}/show')
+        cmds.extend(UnrealCV.spawn_cmds(
+            actor['model_path'], name, actor['location'], actor['orientation'],
+            scale=actor.get('scale', (1, 1, 1)),
+            hasCollision=actor.get('collision', True),
+            isMovable=actor.get('movable', True),
+            color=actor.get('color'))[1:])
+        if name.startswith(VEHICLE_PREFIX):
+            cmds.append(f'vset /object/{name}/physics True')
+        return cmds
+
+    @staticmethod
+    def _stop_cmds(actor_name):
+        """Build the commands that reset the runtime state of an actor.
+
+        Vehicles get full brake and no throttle or steering, and stop simulating
+        physics, which zeroes their velocity. Pedestrians stop walking. Other actors
+        have no runtime state to reset.
+
+        Args:
+            actor_name: Name of the actor in UE.
+
+        Returns:
+            list: Commands to send.
+        """
+        if actor_name.startswith(VEHICLE_PREFIX):
+            return [f'vbp {actor_name} SetState 0 1 0', f'vset /object/{actor_name}/physics False']
+        if actor_name.startswith(PEDESTRIAN_PREFIX):
+            return [f'vbp {actor_name} StopPedestrian']
+        return []
+
+    def _discard(self, actor_name):
+        """Remove an actor from the pool. The caller holds the lock."""
+        model_path = self.models.pop(actor_name, None)
+        if model_path is not None:
+            self.parked[model_path].pop(actor_name, None)
+
+    def _slot_location(self, slot):
+        """Get the location of a parking slot.
+
+        Args:
+            slot: Slot index.
+
+        Returns:
+            tuple: (x, y, z) location.
+        """
+        row, column = divmod(slot, self.park_columns)
+        x, y, z = self.park_location
+        return (x + column * self.park_spacing, y + row * self.park_spacing, z)
@@ -0,0 +1,414 @@
+"""Asyncio UnrealCV client module.
+
+This module provides an asyncio client for the UnrealCV wire protocol that keeps
+many commands in flight on one connection. Every request returns an awaitable
+resolved by a single reader task, so agents, planners and recorders can overlap
+their I/O without holding a lock around a round trip or running one thread each.
+"""
+import asyncio
+import socket
+import struct
+
+import numpy as np
+
+from simworld.communicator.unrealcv import UnrealCV
+from simworld.communicator.world_snapshot import WorldSnapshot
+from simworld.utils.logger import Logger
+
+# Message framing used by UnrealCV: uint32 magic, uint32 payload size, payload
+MAGIC = 0x9E2B83C1
+HEADER = struct.Struct('<II')
+
+
+class AsyncUnrealCV:
+    """Asyncio client for communication with Unreal Engine.
+
+    Commands are written to the socket as soon as they are issued and matched to
+    their responses by message ID, so the latency of many requests overlaps instead
+    of adding up.
+    """
+
+    def __init__(self, port=9000, ip='127.0.0.1', resolution=(1280, 720)):
+        """Initialize the asyncio UnrealCV client. Call ``connect`` before sending requests.
+
+        Args:
+            port: Connection port, defaults to 9000.
+            ip: Connection IP address, defaults to 127.0.0.1.
+            resolution: Resolution of the display window, defaults to (1280, 720).
+        """
+        self.ip = ip
+        self.port = port
+        self.resolution = resolution
+        self.logger = Logger.get_logger('AsyncUnrealCV')
+
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._next_message_id = 0
+        self._pending = {}  # {message_id: future}
+
+    async def connect(self, timeout=5):
+        """Connect to the UnrealCV server and start the response reader.
+
+        Args:
+            timeout: Seconds to wait for the connection confirmation.
+
+        Raises:
+            ConnectionError: If the server does not confirm the connection.
+        """
+        self._reader, self._writer = await asyncio.wait_for(asyncio.open_connection(self.ip, self.port), timeout)
+        sock = self._writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        message = await asyncio.wait_for(self._read_payload(), timeout)
+        if message is None or not message.startswith(b'connected'):
+            await self.disconnect()
+            raise ConnectionError(f'UnrealCV server at {self.ip}:{self.port} did not confirm the connection')
+        self.logger.info(f'Connected to UnrealCV server at {self.ip}:{self.port}')
+
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_loop())
+        [w, h] = self.resolution
+        await self.request(f'vrun setres {w}x{h}w')
+
+    async def disconnect(self):
+        """Disconnect from Unreal Engine and fail all pending requests."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self._writer = None
+        self._fail_pending(ConnectionError('UnrealCV client disconnected'))
+
+    def isconnected(self):
+        """Check whether the client is connected.
+
+        Returns:
+            bool: True if connected.
+        """
+        return self._writer is not None and not self._writer.is_closing()
+
+    def send(self, cmd):
+        """Send a command without waiting for its response.
+
+        Args:
+            cmd: Command string.
+
+        Returns:
+            asyncio.Future: Future resolved with the server response.
+
+        Raises:
+            ConnectionError: If the client is not connected.
+        """
+        if not self.isconnected():
+            raise ConnectionError('UnrealCV client is not connected')
+        message_id = self._next_message_id
+        self._next_message_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+
+        payload = b'%d:%s' % (message_id, cmd.encode('utf-8'))
+        self._writer.write(HEADER.pack(MAGIC, len(payload)) + payload)
+        return future
+
+    async def request(self, cmd, timeout=5):
+        """Send a command and wait for its response.
+
+        Args:
+            cmd: Command string.
+            timeout: Timeout in seconds.
+
+        Returns:
+            str or bytes: Server response.
+        """
+        future = self.send(cmd)
+        await self._writer.drain()
+        return await asyncio.wait_for(future, timeout)
+
+    async def request_batch(self, cmds, timeout=5):
+        """Send a list of commands at once and wait for all responses.
+
+        Args:
+            cmds: List of command strings.
+            timeout: Timeout in seconds for the whole batch.
+
+        Returns:
+            list: List of server responses, in the same order as ``cmds``.
+        """
+        futures = [self.send(cmd) for cmd in cmds]
+        await self._writer.drain()
+        return await asyncio.wait_for(asyncio.gather(*futures), timeout)
+
+    async def _read_payload(self):
+        """Read one framed payload from the socket.
+
+        Returns:
+            bytes: Payload, or None if the connection was closed.
+        """
+        try:
+            header = await self._reader.readexactly(HEADER.size)
+            magic, size = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ConnectionError(f'Malformed message, unexpected magic number {magic:#x}')
+            return await self._reader.readexactly(size)
+        except asyncio.IncompleteReadError:
+            return None
+
+    async def _read_loop(self):
+        """Resolve pending requests with the responses read from the socket."""
+        try:
+            while True:
+                payload = await self._read_payload()
+                if payload is None:
+                    raise ConnectionError('UnrealCV server closed the connection')
+                message_id, _, body = payload.partition(b':')
+                future = self._pending.pop(int(message_id), None)
+                if future is None or future.done():
+                    continue
+                try:
+                    future.set_result(body.decode('utf-8'))
+                except UnicodeDecodeError:
+                    future.set_result(body)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f'UnrealCV reader stopped: {e}')
+            self._fail_pending(e if isinstance(e, ConnectionError) else ConnectionError(str(e)))
+
+    def _fail_pending(self, error):
+        """Fail every pending request with an error.
+
+        Args:
+            error: Exception to set on the pending futures.
+        """
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    ##############################################################
+    # Queries
+    ##############################################################
+    async def get_location(self, actor_name):
+        """Get object location.
+
+        Args:
+            actor_name: Actor name.
+
+        Returns:
+            Location coordinates array.
+        """
+        res = await self.request(f'vget /object/{actor_name}/location')
+        return np.array([float(i) for i in res.split()])
+
+    async def get_orientation(self, actor_name):
+        """Get object orientation.
+
+        Args:
+            actor_name: Actor name.
+
+        Returns:
+            Orientation array.
+        """
+        res = await self.request(f'vget /object/{actor_name}/rotation')
+        return np.array([float(i) for i in res.split()])
+
+    async def get_location_batch(self, actor_names):
+        """Batch get object locations.
+
+        Args:
+            actor_names: List of actor names.
+
+        Returns:
+            List of location coordinate arrays.
+        """
+        res = await self.request_batch([f'vget /object/{actor_name}/location' for actor_name in actor_names])
+        return [np.array([float(i) for i in r.split()]) for r in res]
+
+    async def get_informations(self, manager_object_name):
+        """Get the state information of the UE manager.
+
+        Args:
+            manager_object_name: Name of the manager object to get information from.
+
+        Returns:
+            str: Information string containing the current state of the environment.
+        """
+        return await self.request(f'vbp {manager_object_name} GetInformation')
+
+    async def get_image(self, cam_id, viewmode, mode='direct', img_path=None):
+        """Get image.
+
+        Args:
+            cam_id: Camera ID.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'file', 'fast', 'file_path'.
+            img_path: Image path, used by 'file_path' mode.
+
+        Returns:
+            Decoded image, or a black image if the capture failed.
+        """
+        try:
+            res = await self.request(UnrealCV.image_cmd(cam_id, viewmode, mode, img_path))
+            # Decoding is CPU bound, keep it off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                None, UnrealCV.decode_image, res, cam_id, viewmode, mode)
+        except Exception as e:
+            self.logger.error(f'Failed to get image from camera {cam_id} (viewmode={viewmode}, mode={mode}): {str(e)}')
+            return np.zeros((480, 640, 3), dtype=np.uint8)
+
+
+class AsyncCommunicator:
+    """Asyncio facade over the Communicator API.
+
+    Actor naming and state decoding are shared with a regular Communicator, while
+    every call goes through an AsyncUnrealCV client and returns an awaitable.
+    """
+
+    def __init__(self, async_unrealcv: AsyncUnrealCV, communicator=None):
+        """Initialize the async communicator.
+
+        Args:
+            async_unrealcv: Connected AsyncUnrealCV client.
+            communicator: Communicator providing actor names and the UE manager name.
+                Defaults to a new Communicator without a synchronous client.
+        """
+        # Lazy import to avoid circular dependency
+        from simworld.communicator.communicator import Communicator
+
+        self.unrealcv = async_unrealcv
+        self.communicator = communicator if communicator is not None else Communicator()
+
+    async def get_world_snapshot(self):
+        """Get the decoded state of all actors reported by the UE manager.
+
+        Returns:
+            WorldSnapshot: The decoded snapshot.
+        """
+        payload = await self.unrealcv.get_informations(self.communicator.ue_manager_name)
+        return WorldSnapshot.from_payload(payload, tick_id=self.communicator.tick_id)
+
+    async def get_position_and_direction(self, vehicle_ids=[], pedestrian_ids=[], traffic_signal_ids=[], humanoid_ids=[],
+                                         scooter_ids=[]):
+        """Get position and direction of vehicles, pedestrians, and traffic signals.
+
+        Args:
+            vehicle_ids: List of vehicle IDs.
+            pedestrian_ids: List of pedestrian IDs.
+            traffic_signal_ids: List of traffic signal IDs.
+            humanoid_ids: List of humanoid IDs.
+            scooter_ids: List of scooter IDs.
+
+        Returns:
+            Dictionary containing position and direction information for all objects.
+        """
+        snapshot = await self.get_world_snapshot()
+        return self.communicator.position_and_direction_from_snapshot(snapshot, vehicle_ids, pedestrian_ids,
+                                                                      traffic_signal_ids, humanoid_ids, scooter_ids)
+
+    async def get_camera_observation(self, cam_id, viewmode, mode='direct'):
+        """Get camera observation.
+
+        Args:
+            cam_id: Camera ID.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'file', 'fast'.
+
+        Returns:
+            Image data.
+        """
+        return await self.unrealcv.get_image(cam_id, viewmode, mode)
+
+    async def get_camera_observation_multicam(self, cam_ids, viewmode, mode='direct'):
+        """Get observations of several cameras with all captures in flight at once.
+
+        Args:
+            cam_ids: List of camera IDs.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'file', 'fast'.
+
+        Returns:
+            list: Images, in the same order as ``cam_ids``.
+        """
+        return list(await asyncio.gather(*(self.unrealcv.get_image(cam_id, viewmode, mode) for cam_id in cam_ids)))
+
+    async def get_humanoid_location(self, humanoid_id):
+        """Get the location of a humanoid.
+
+        Args:
+            humanoid_id: Humanoid ID.
+
+        Returns:
+            Location coordinates array.
+        """
+        return await self.unrealcv.get_location(self.communicator.get_humanoid_name(humanoid_id))
+
+    async def update_vehicles(self, states):
+        """Batch update multiple vehicle states.
+
+        Args:
+            states: Dictionary mapping vehicle IDs to (throttle, brake, steering) tuples.
+        """
+        states_str = self.communicator.vehicle_states_str(states)
+        return await self.unrealcv.request(f'vbp {self.communicator.ue_manager_name} VSetState {states_str}')
+
+    async def update_pedestrians(self, states):
+        """Batch update multiple pedestrian states.
+
+        Args:
+            states: Dictionary mapping pedestrian IDs to states.
+        """
+        states_str = self.communicator.pedestrian_states_str(states)
+        return await self.unrealcv.request(f'vbp {self.communicator.ue_manager_name} PSetState {states_str}')
+
+    async def humanoid_move_forward(self, humanoid_id):
+        """Move humanoid forward.
+
+        Args:
+            humanoid_id: Humanoid ID.
+        """
+        return await self.unrealcv.request(f'vbp {self.communicator.get_humanoid_name(humanoid_id)} MoveForward')
+
+    async def humanoid_stop(self, humanoid_id):
+        """Stop humanoid.
+
+        Args:
+            humanoid_id: Humanoid ID.
+        """
+        return await self.unrealcv.request(f'vbp {self.communicator.get_humanoid_name(humanoid_id)} StopAgent')
+
+    async def humanoid_rotate(self, humanoid_id, angle, direction='left'):
+        """Rotate humanoid and wait for the turn to finish.
+
+        Args:
+            humanoid_id: Humanoid ID.
+            angle: Rotation angle in degrees.
+            direction: Direction of rotation, either 'left' or 'right'.
+        """
+        if direction == 'right':
+            clockwise = 1
+        elif direction == 'left':
+            angle = -angle
+            clockwise = -1
+        humanoid_name = self.communicator.get_humanoid_name(humanoid_id)
+        res = await self.unrealcv.request(f'vbp {humanoid_name} TurnAround {1} {angle} {clockwise}')
+        await asyncio.sleep(1)
+        return res
+
+    async def humanoid_step_forward(self, humanoid_id, duration, direction=0):
+        """Step forward and wait for the step to finish.
+
+        Args:
+            humanoid_id: Humanoid ID.
+            duration: Duration of the step in seconds.
+            direction: Direction of the step.
+        """
+        humanoid_name = self.communicator.get_humanoid_name(humanoid_id)
+        res = await self.unrealcv.request(f'vbp {humanoid_name} StepForward {duration} {direction}')
+        await asyncio.sleep(duration)
+        return res
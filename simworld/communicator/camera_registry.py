@@ -0,0 +1,146 @@
+"""Camera registry module.
+
+This module keeps track of which UE camera is bound to which actor. Bindings are
+resolved in bulk (one batch request for all camera locations and one for all actor
+locations) and cached until the actor is spawned, respawned or gets on or off a
+scooter, instead of probing every camera on every lookup.
+"""
+import threading
+
+import numpy as np
+
+from simworld.communicator.unrealcv import UnrealCV
+from simworld.utils.logger import Logger
+
+
+class CameraRegistry:
+    """Cache of camera bindings, matched by distance between cameras and actors."""
+
+    def __init__(self, unrealcv: UnrealCV, max_cameras: int = 16):
+        """Initialize the registry.
+
+        Args:
+            unrealcv: UnrealCV instance for communication with Unreal Engine.
+            max_cameras: Number of camera IDs to consider when the server does not
+                report its cameras.
+        """
+        self.unrealcv = unrealcv
+        self.max_cameras = max_cameras
+        self.logger = Logger.get_logger('CameraRegistry')
+
+        self.lock = threading.Lock()
+        self.bindings = {}  # {actor_name: (camera_id or None, distance)}
+
+    def discover_cameras(self, max_cameras: int = None):
+        """Get the locations of all cameras in one batch request.
+
+        Args:
+            max_cameras: Number of camera IDs to consider. Defaults to the number of
+                cameras reported by the server, or ``self.max_cameras``.
+
+        Returns:
+            tuple: (camera_ids, locations) with locations an (N, 3) array. Cameras
+            whose location cannot be read are left out.
+        """
+        if max_cameras is None:
+            max_cameras = self.max_cameras
+            try:
+                cameras = self.unrealcv.get_cameras()
+                if isinstance(cameras, str) and not UnrealCV.is_error_response(cameras) and cameras.split():
+                    max_cameras = len(cameras.split())
+            except Exception:
+                pass
+        camera_ids = list(range(max_cameras))
+        responses = self.unrealcv.get_camera_location_multicam(camera_ids)
+        return self._parse_locations(camera_ids, responses)
+
+    def bind(self, actor_names):
+        """Resolve the cameras of several actors at once and cache the bindings.
+
+        Each actor is bound to the camera closest to it.
+
+        Args:
+            actor_names: Names of the actors in UE.
+
+        Returns:
+            dict: Mapping from actor name to (camera_id, distance), with camera_id
+            None if no camera could be matched.
+        """
+        actor_names = list(actor_names)
+        if not actor_names:
+            return {}
+        camera_ids, camera_locations = self.discover_cameras()
+        responses = self.unrealcv.request_batch([f'vget /object/{name}/location' for name in actor_names])
+        found_names, actor_locations = self._parse_locations(actor_names, responses)
+
+        bindings = {name: (None, float('inf')) for name in actor_names}
+        if camera_ids and found_names:
+            distances = np.linalg.norm(actor_locations[:, None, :] - camera_locations[None, :, :], axis=2)
+            nearest = distances.argmin(axis=1)
+            for row, name in enumerate(found_names):
+                bindings[name] = (camera_ids[nearest[row]], float(distances[row, nearest[row]]))
+        with self.lock:
+            self.bindings.update(bindings)
+        return bindings
+
+    def get_camera_id(self, actor_name: str, distance_threshold: float = float('inf')):
+        """Get the camera bound to an actor, resolving it only if not cached.
+
+        Args:
+            actor_name: Name of the actor in UE.
+            distance_threshold: Maximum distance (Unreal units) between the actor and
+                its camera to accept the binding.
+
+        Returns:
+            int or None: Camera ID, or None if no camera is close enough.
+        """
+        with self.lock:
+            binding = self.bindings.get(actor_name)
+        if binding is None:
+            binding = self.bind([actor_name])[actor_name]
+        camera_id, distance = binding
+        if camera_id is None or distance > distance_threshold:
+            return None
+        return camera_id
+
+    def invalidate(self, *actor_names):
+        """Drop cached bindings.
+
+        Unmatched actors are always dropped, since the event that invalidates a
+        binding may have created the camera they were missing.
+
+        Args:
+            *actor_names: Actors whose bindings are dropped. Defaults to all actors.
+        """
+        with self.lock:
+            if not actor_names:
+                self.bindings.clear()
+                return
+            for actor_name in actor_names:
+                self.bindings.pop(actor_name, None)
+            for name in [name for name, (camera_id, _) in self.bindings.items() if camera_id is None]:
+                del self.bindings[name]
+
+    @staticmethod
+    def _parse_locations(keys, responses):
+        """Parse 'x y z' location responses, skipping errors.
+
+        Args:
+            keys: Camera IDs or actor names, in the same order as ``responses``.
+            responses: Server responses.
+
+        Returns:
+            tuple: (keys, locations) of the valid responses, locations an (N, 3) array.
+        """
+        valid_keys, locations = [], []
+        for key, res in zip(keys, responses):
+            if UnrealCV.is_error_response(res) or isinstance(res, (bytes, bytearray)):
+                continue
+            try:
+                location = [float(v) for v in res.split()[:3]]
+            except ValueError:
+                continue
+            if len(location) == 3:
+                valid_keys.append(key)
+                locations.append(location)
+        return valid_keys, np.array(locations, dtype=float).reshape(-1, 3)
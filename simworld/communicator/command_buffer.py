@@ -0,0 +1,176 @@
+"""Write-behind command buffer module.
+
+This module collects the per-tick write commands of the traffic system (vehicle and
+pedestrian states, speeds, rotations and traffic signal switches) instead of sending
+them one round trip at a time. Writes to the same actor attribute within a tick are
+coalesced, so superseded commands are never sent, and the remaining commands are
+flushed together in a single batch request.
+"""
+import threading
+
+from simworld.utils.logger import Logger
+
+# Blueprint functions that overwrite the same actor attribute: function -> attribute
+REPLACING_FUNCTIONS = {
+    'StopPedestrian': 'motion',
+    'MoveForward': 'motion',
+    'SetState': 'state',
+    'SetMaxSpeed': 'speed',
+    'SwitchVehicleFrontGreen': 'signal',
+    'SetPedestrianWalk': 'signal',
+}
+# Blueprint functions of the UE manager updating several actors: 'name,values;name,values'
+MERGING_FUNCTIONS = ('VSetState', 'PSetState')
+# Blueprint functions applying a relative rotation: '<duration> <signed angle> <clockwise>'
+ROTATING_FUNCTIONS = ('Rotate_Angle',)
+
+
+class CommandBuffer:
+    """Buffer of write commands, coalesced per (actor, attribute) until flushed.
+
+    Within one flush:
+
+    * commands that overwrite an attribute (e.g. ``StopPedestrian`` then
+      ``MoveForward``) only keep the last one,
+    * relative rotations of an actor are summed into one rotation,
+    * batch state updates through the UE manager are merged per actor, keeping the
+      last state of each,
+    * any other command is sent as is.
+
+    Coalesced commands take the position of their last write, so the flushed batch
+    keeps the order in which the final values were written.
+    """
+
+    def __init__(self, unrealcv, chunk_size: int = 500):
+        """Initialize the buffer.
+
+        Args:
+            unrealcv: UnrealCV instance the buffered commands are flushed through.
+            chunk_size: Maximum number of commands per batch request.
+        """
+        self.unrealcv = unrealcv
+        self.chunk_size = chunk_size
+        self.logger = Logger.get_logger('CommandBuffer')
+
+        self.lock = threading.Lock()
+        self._pending = {}  # {key: command string, rotation [duration, angle] or merged {name: values}}
+        self._passthrough_count = 0
+        self.write_count = 0
+        self.sent_count = 0
+
+    def __len__(self):
+        """Get the number of commands that the next flush sends.
+
+        Returns:
+            int: Number of pending commands.
+        """
+        with self.lock:
+            return len(self._pending)
+
+    def put(self, cmd: str):
+        """Buffer a write command.
+
+        Args:
+            cmd: Command string.
+        """
+        parts = cmd.split(' ', 3)
+        with self.lock:
+            self.write_count += 1
+            if len(parts) >= 3 and parts[0] == 'vbp':
+                actor, function = parts[1], parts[2]
+                args = parts[3] if len(parts) > 3 else ''
+                if function in REPLACING_FUNCTIONS:
+                    self._replace((actor, REPLACING_FUNCTIONS[function]), cmd)
+                    return
+                if function in MERGING_FUNCTIONS:
+                    self._merge((actor, function), args)
+                    return
+                if function in ROTATING_FUNCTIONS and self._rotate((actor, function), args):
+                    return
+            # Not coalescible: keep it in order under a key of its own
+            self._passthrough_count += 1
+            self._pending[('', self._passthrough_count)] = cmd
+
+    def drain(self):
+        """Take all pending commands out of the buffer without sending them.
+
+        The caller is responsible for sending them, e.g. as part of a larger batch.
+
+        Returns:
+            list: Coalesced command strings, in order.
+        """
+        with self.lock:
+            pending, self._pending = self._pending, {}
+        cmds = [cmd for cmd in (self._build(key, value) for key, value in pending.items()) if cmd is not None]
+        with self.lock:
+            self.sent_count += len(cmds)
+        return cmds
+
+    def flush(self):
+        """Send all pending commands in one batch request.
+
+        Returns:
+            list: (cmd, response) pairs of the commands sent, in order.
+        """
+        cmds = self.drain()
+        if not cmds:
+            return []
+        responses = self.unrealcv.request_chunked(cmds, self.chunk_size)
+        for cmd, res in zip(cmds, responses):
+            if self.unrealcv.is_error_response(res):
+                self.logger.warning(f'Buffered command "{cmd}" returned {res}')
+        return list(zip(cmds, responses))
+
+    def discard(self):
+        """Drop all pending commands without sending them."""
+        with self.lock:
+            self._pending.clear()
+
+    def _replace(self, key, cmd):
+        """Overwrite the pending command of a key. The caller holds the lock."""
+        self._pending.pop(key, None)
+        self._pending[key] = cmd
+
+    def _merge(self, key, args):
+        """Merge 'name,values;name,values' updates into the pending ones. The caller holds the lock."""
+        merged = self._pending.pop(key, None) or {}
+        for entry in args.split(';'):
+            name, _, values = entry.partition(',')
+            if name:
+                merged.pop(name, None)
+                merged[name] = values
+        self._pending[key] = merged
+
+    def _rotate(self, key, args):
+        """Add a relative rotation to the pending one of a key. The caller holds the lock.
+
+        Returns:
+            bool: False if the arguments cannot be parsed, in which case the command is
+            not coalesced.
+        """
+        try:
+            duration, angle, _ = args.split()
+            angle = float(angle)
+        except ValueError:
+            return False
+        rotation = self._pending.pop(key, None)
+        self._pending[key] = [duration, angle + (rotation[1] if rotation else 0.0)]
+        return True
+
+    @staticmethod
+    def _build(key, value):
+        """Build the command of a pending entry.
+
+        Returns:
+            str or None: Command string, or None if the entry cancelled out.
+        """
+        if isinstance(value, str):
+            return value
+        actor, function = key
+        if isinstance(value, dict):
+            states = ';'.join(f'{name},{values}' if values else name for name, values in value.items())
+            return f'vbp {actor} {function} {states}'
+        duration, angle = value
+        if angle == 0:
+            return None
+        return f'vbp {actor} {function} {duration} {angle} {1 if angle > 0 else -1}'
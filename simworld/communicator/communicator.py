@@ -6,18 +6,89 @@ through the UnrealCV client, handling vehicle, pedestrian, and traffic signal ma
 import json
 import math
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
+from typing import NamedTuple
 
 import numpy as np
-import pandas as pd
 
+from simworld.communicator.actor_pool import ActorPool
+from simworld.communicator.camera_registry import CameraRegistry
+from simworld.communicator.command_buffer import CommandBuffer
+from simworld.communicator.state_subscriber import StateSubscriber
 from simworld.communicator.unrealcv import UnrealCV
+from simworld.communicator.unrealcv_pool import UnrealCVPool
+from simworld.communicator.world_diff import diff_world, is_world_node
+from simworld.communicator.world_loader import (WorldLoadProgress,
+                                                build_asset_table,
+                                                iter_world_nodes,
+                                                node_to_actor)
+from simworld.communicator.world_snapshot import WorldSnapshot
 from simworld.utils.load_json import load_json
 from simworld.utils.logger import Logger
 from simworld.utils.vector import Vector
 from simworld.utils.video_recorder import VideoRecorder
 
 
+class CameraObservations(NamedTuple):
+    """Images of several view modes of one camera, captured together.
+
+    Attributes:
+        cam_id: Camera ID.
+        tick_id: Simulation tick the capture was requested in.
+        timestamp: Time the capture was requested.
+        images: Mapping from view mode to image.
+    """
+    cam_id: int
+    tick_id: int
+    timestamp: float
+    images: dict
+
+
+class StepQueries(NamedTuple):
+    """State and image queries answered by ``Communicator.step``.
+
+    Attributes:
+        world: Whether to query the UE manager for a world snapshot.
+        locations: Names of the UE objects whose location is queried.
+        rotations: Names of the UE objects whose rotation is queried.
+        collisions: IDs of the humanoids whose collision numbers are queried.
+        images: (camera ID, view mode) pairs to capture.
+        image_mode: Capture mode of the images, see ``UnrealCV.image_cmd``.
+    """
+    world: bool = True
+    locations: tuple = ()
+    rotations: tuple = ()
+    collisions: tuple = ()
+    images: tuple = ()
+    image_mode: str = 'direct'
+
+
+class StepResult(NamedTuple):
+    """State of the world after one ``Communicator.step``.
+
+    Attributes:
+        tick_id: Simulation tick the state belongs to.
+        timestamp: Time the step was sent.
+        snapshot: Decoded world snapshot, or None if not queried.
+        locations: Mapping from object name to its (x, y, z) location array.
+        rotations: Mapping from object name to its (pitch, yaw, roll) array.
+        collisions: Mapping from humanoid ID to its (human, object, building, vehicle)
+            collision numbers.
+        images: Mapping from (camera ID, view mode) to image.
+        errors: (cmd, response) pairs of the commands of the step that failed.
+    """
+    tick_id: int
+    timestamp: float
+    snapshot: WorldSnapshot
+    locations: dict
+    rotations: dict
+    collisions: dict
+    images: dict
+    errors: list
+
+
 class Communicator:
     """Class for communicating with Unreal Engine through UnrealCV.
 
@@ -25,14 +96,26 @@ class Communicator:
     including the management of vehicles, pedestrians, and traffic signals.
     """
 
-    def __init__(self, unrealcv: UnrealCV = None):
+    def __init__(self, unrealcv: UnrealCV = None, spawn_chunk_size: int = 50, snapshot_max_age: float = 0.05,
+                 image_pool: UnrealCVPool = None, actor_pool: ActorPool = None):
         """Initialize the communicator.
 
         Args:
             unrealcv: UnrealCV instance for communication with Unreal Engine.
+            spawn_chunk_size: Number of actors spawned per batch request in bulk spawns.
+            snapshot_max_age: Seconds a decoded world snapshot is reused within the same tick.
+            image_pool: Optional pool of UnrealCV connections used for camera captures, keeping
+                image traffic off the connection used for actor commands.
+            actor_pool: Optional pool of parked actors. If set, traffic cleanups park the
+                actors instead of destroying them and spawns reuse parked actors.
         """
         self.unrealcv = unrealcv
+        self.image_pool = image_pool
+        self.actor_pool = actor_pool
+        self.spawn_chunk_size = spawn_chunk_size
+        self.snapshot_max_age = snapshot_max_age
         self.ue_manager_name = None
+        self.applied_world = {}  # {node_id: spawn description} of the world nodes generated last
         self.logger = Logger.get_logger('Communicator')
 
         self.vehicle_id_to_name = {}
@@ -45,6 +128,16 @@ class Communicator:
         self.lock = Lock()
         self.background_recorders = {}
 
+        self.tick_id = 0
+        self._snapshot = None
+        self._snapshot_lock = Lock()
+        self.state_subscriber = None
+        self._decode_executor = None
+        self.camera_registry = CameraRegistry(unrealcv)
+        self._camera_sync_lock = Lock()
+        self._camera_sync_time = 0.0
+        self._camera_sync_poses = {}
+
     ##############################################################
     # Humanoid Methods
     ##############################################################
@@ -101,6 +194,7 @@ class Communicator:
             humanoid_id: humanoid ID.
         """
         self.unrealcv.humanoid_get_on_scooter(self.get_humanoid_name(humanoid_id))
+        self.camera_registry.invalidate(self.get_humanoid_name(humanoid_id))
 
     def humanoid_get_off_scooter(self, humanoid_id, scooter_id):
         """Get off scooter.
@@ -125,6 +219,7 @@ class Communicator:
         if old_humanoid_name not in objects:
             # Update the mapping to bind the new humanoid with the scooter ID
             self.unrealcv.set_object_name(new_humanoid, old_humanoid_name)
+        self.camera_registry.invalidate(old_humanoid_name)
 
     def humanoid_sit_down(self, humanoid_id):
         """Sit down.
@@ -170,6 +265,10 @@ class Communicator:
         Args:
             object_name: Object name.
         """
+        self.camera_registry.invalidate(object_name)
+        self.applied_world.pop(object_name, None)
+        if self.actor_pool is not None:
+            self.actor_pool.forget(object_name)
         return self.unrealcv.destroy(object_name)
 
     def destroy_humanoid(self, humanoid_id):
@@ -179,6 +278,9 @@ class Communicator:
             humanoid_id: Humanoid ID.
         """
         name = self.get_humanoid_name(humanoid_id)
+        self.camera_registry.invalidate(name)
+        if self.actor_pool is not None:
+            self.actor_pool.forget(name)
         return self.unrealcv.destroy(name)
 
     ##############################################################
@@ -211,67 +313,123 @@ class Communicator:
     # Camera-related methods
     ##############################################################
 
-    def get_camera_observation(self, cam_id, viewmode, mode='direct'):
+    def get_camera_observation(self, cam_id, viewmode, mode='direct', out=None):
         """Get camera observation.
 
         Args:
             cam_id: Camera ID.
             viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
-            mode: Mode, possible values are 'direct', 'file', 'fast'.
+            mode: Mode, possible values are 'direct', 'raw', 'file', 'fast'. 'raw' returns
+                metric float32 depth, and RGB decoded into ``out`` if given.
+            out: Optional preallocated (H, W, 3) uint8 array reused across 'raw' captures.
 
         Returns:
             Image data.
         """
-        return self.unrealcv.get_image(cam_id, viewmode, mode)
+        if self.image_pool is not None:
+            return self.image_pool.get_image(cam_id, viewmode, mode, out=out)
+        return self.unrealcv.get_image(cam_id, viewmode, mode, out=out)
 
     def get_camera_observation_multicam(self, cam_ids, viewmode, mode='direct'):
-        """Get camera observation batch."""
-        if isinstance(cam_ids, list):
-            images = []
-            for cam_id in cam_ids:
-                images.append(self.unrealcv.get_image(cam_id, viewmode, mode))
-            return images
-        else:
-            return self.unrealcv.get_image(cam_ids, viewmode, mode)
+        """Get camera observation batch.
+
+        With an image pool the captures are spread across the pool connections,
+        otherwise they are fetched one after another.
+
+        Args:
+            cam_ids: List of camera IDs, or a single camera ID.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'raw', 'file', 'fast'.
+
+        Returns:
+            List of images in the same order as ``cam_ids``, or a single image.
+        """
+        if not isinstance(cam_ids, list):
+            return self.get_camera_observation(cam_ids, viewmode, mode)
+        if self.image_pool is not None:
+            return self.image_pool.get_images(cam_ids, viewmode, mode)
+        return [self.unrealcv.get_image(cam_id, viewmode, mode) for cam_id in cam_ids]
+
+    def get_camera_observations(self, cam_id, viewmodes=('lit', 'depth', 'object_mask'), mode='direct',
+                                pause_game=False):
+        """Capture several view modes of one camera in a single round trip.
+
+        The capture commands are sent together in one batch request, so the view
+        modes show the same frame unless the engine ticks while serving the batch.
+        With ``pause_game`` the batch is wrapped in pause/resume commands, which rules
+        that out at the cost of pausing the game for the duration of the capture. If
+        the game is already paused, e.g. by a clock in ``sync`` mode, the engine only
+        ticks on request and the batch is sent as is, so that the game stays paused.
+
+        Args:
+            cam_id: Camera ID.
+            viewmodes: View modes to capture, e.g. ('lit', 'depth', 'object_mask').
+            mode: Mode, possible values are 'direct', 'raw', 'fast'.
+            pause_game: Whether to pause the game while capturing.
+
+        Returns:
+            CameraObservations: Images of all view modes, with the tick they belong to.
+        """
+        viewmodes = list(viewmodes)
+        cmds = [UnrealCV.image_cmd(cam_id, viewmode, mode) for viewmode in viewmodes]
+        pause_game = pause_game and not self.unrealcv.paused
+        if pause_game:
+            cmds = ['vset /action/game/pause'] + cmds + ['vset /action/game/resume']
+        timestamp = time.time()
+        client = self.image_pool if self.image_pool is not None else self.unrealcv
+        responses = client.request_batch(cmds)
+        if pause_game:
+            responses = responses[1:-1]
+
+        if self._decode_executor is None:
+            self._decode_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ImageDecode')
+        images = UnrealCV.decode_images(responses, cam_id, viewmodes, mode, self._decode_executor)
+        return CameraObservations(cam_id, self.tick_id, timestamp, images)
+
+    def open_image_pool(self, size=4):
+        """Open a pool of connections to the same server for camera captures.
+
+        Only servers that accept several clients support a pool; the stock UnrealCV
+        server rejects any client besides the control connection. If the server
+        rejects the pool, captures keep going through the control connection.
+
+        Args:
+            size: Maximum number of connections in the pool.
+
+        Returns:
+            UnrealCVPool: The opened pool, or None if the server rejected it.
+        """
+        if self.image_pool is not None:
+            self.image_pool.disconnect()
+            self.image_pool = None
+        try:
+            self.image_pool = UnrealCVPool.from_client(self.unrealcv, size)
+        except ConnectionError as e:
+            self.logger.warning(f'No image pool, using the control connection for captures: {e}')
+        return self.image_pool
 
     def find_camera_id_for_actor(self, actor_name: str, max_camera_checks: int = 16, distance_threshold: float = 5.0):
         """Find the camera ID whose location is closest to the given actor.
 
         This is a heuristic used to recover camera bindings after the actor is
         respawned/renamed (for example when a humanoid gets on/off a scooter).
+        Bindings are cached in ``camera_registry`` and only resolved again after the
+        actor is spawned, destroyed or gets on or off a scooter.
 
         Args:
             actor_name: name of the actor in UE (e.g. returned by get_humanoid_name)
-            max_camera_checks: number of camera IDs to probe starting from 0
+            max_camera_checks: number of camera IDs to consider if the server does not report its cameras
             distance_threshold: maximum distance (Unreal units) to accept a match
 
         Returns:
             int or None: the camera_id closest to actor (or None if not found)
         """
+        self.camera_registry.max_cameras = max_camera_checks
         try:
-            actor_loc = self.unrealcv.get_location(actor_name)
+            return self.camera_registry.get_camera_id(actor_name, distance_threshold)
         except Exception:
             return None
 
-        best_cam = None
-        best_dist = float('inf')
-        # probe camera ids from 0..max_camera_checks-1
-        for cam_id in range(max_camera_checks):
-            try:
-                cam_loc = self.unrealcv.get_camera_location(cam_id)
-            except Exception:
-                # invalid camera id or unreachable — skip
-                continue
-            # cam_loc and actor_loc are numpy arrays
-            dist = float(((cam_loc - actor_loc) ** 2).sum()) ** 0.5
-            if dist < best_dist:
-                best_dist = dist
-                best_cam = cam_id
-
-        if best_cam is not None and best_dist <= distance_threshold:
-            return best_cam
-        return None
-
     def sync_camera_to_actor(self, actor_id: int, camera_id: int, height_offset: float = 160.0):
         """Synchronize camera location to follow an actor (humanoid).
 
@@ -286,22 +444,80 @@ class Communicator:
         Returns:
             tuple: (location, rotation) if successful, (None, None) otherwise.
         """
-        try:
-            actor_name = self.get_humanoid_name(actor_id)
-            actor_loc = self.unrealcv.get_location(actor_name)
-            actor_rot = self.unrealcv.get_orientation(actor_name)
+        return self.sync_cameras_to_actors({actor_id: camera_id}, height_offset)[actor_id]
 
-            # Position camera above actor's feet (standard eye level)
-            camera_loc = (actor_loc[0], actor_loc[1], actor_loc[2] + height_offset)
+    def sync_cameras_to_actors(self, actor_camera_ids: dict, height_offset: float = 160.0):
+        """Synchronize several cameras to their actors (humanoids) in two round trips.
 
-            # Sync camera position and rotation
-            self.unrealcv.set_camera_location(camera_id, camera_loc)
-            self.unrealcv.set_camera_rotation(camera_id, actor_rot)
+        The transforms of all actors are read in one batch request and all cameras
+        are moved in a second one, independently of the number of actors.
+
+        Args:
+            actor_camera_ids: Mapping from humanoid ID to the camera ID following it.
+            height_offset: Height above actor's feet (default 170 = humanoid eye level).
 
-            return camera_loc, actor_rot
+        Returns:
+            dict: Mapping from humanoid ID to (location, rotation) of its camera, or
+            (None, None) if the actor could not be synchronized.
+        """
+        poses = {actor_id: (None, None) for actor_id in actor_camera_ids}
+        if not actor_camera_ids:
+            return poses
+        try:
+            cmds = []
+            for actor_id in actor_camera_ids:
+                actor_name = self.get_humanoid_name(actor_id)
+                cmds.extend([f'vget /object/{actor_name}/location', f'vget /object/{actor_name}/rotation'])
+            responses = self.unrealcv.request_batch(cmds)
+
+            set_cmds = []
+            for index, (actor_id, camera_id) in enumerate(actor_camera_ids.items()):
+                try:
+                    actor_loc = [float(v) for v in responses[2 * index].split()]
+                    actor_rot = np.array([float(v) for v in responses[2 * index + 1].split()])
+                except (AttributeError, ValueError):
+                    self.logger.warning(f'Failed to sync camera {camera_id} to actor {actor_id}: '
+                                        f'{responses[2 * index]} / {responses[2 * index + 1]}')
+                    continue
+                # Position camera above actor's feet (standard eye level)
+                camera_loc = (actor_loc[0], actor_loc[1], actor_loc[2] + height_offset)
+                set_cmds.extend([
+                    f'vset /camera/{camera_id}/location {camera_loc[0]} {camera_loc[1]} {camera_loc[2]}',
+                    f'vset /camera/{camera_id}/rotation {actor_rot[0]} {actor_rot[1]} {actor_rot[2]}',
+                ])
+                poses[actor_id] = (camera_loc, actor_rot)
+
+            # Sync camera positions and rotations
+            if set_cmds:
+                self.unrealcv.request_batch(set_cmds)
         except Exception as e:
-            self.logger.warning(f"Failed to sync camera {camera_id} to actor {actor_id}: {str(e)}")
-            return None, None
+            self.logger.warning(f'Failed to sync cameras to actors {list(actor_camera_ids)}: {str(e)}')
+            return {actor_id: (None, None) for actor_id in actor_camera_ids}
+        return poses
+
+    def sync_recording_cameras(self, max_age: float = 0.0, height_offset: float = 160.0):
+        """Synchronize the cameras of all humanoids with a background recording at once.
+
+        Recorder threads call this every frame. The first call within ``max_age``
+        seconds syncs every tracked camera in one batched pass, later calls reuse its
+        result, so the cost per frame does not grow with the number of recordings.
+
+        Args:
+            max_age: Seconds a previous synchronization is reused.
+            height_offset: Height above actor's feet.
+
+        Returns:
+            dict: Mapping from humanoid ID to (location, rotation) of its camera.
+        """
+        with self._camera_sync_lock:
+            if time.time() - self._camera_sync_time > max_age:
+                actor_camera_ids = {
+                    humanoid_id: recorder.humanoid.camera_id
+                    for humanoid_id, recorder in list(self.background_recorders.items())
+                }
+                self._camera_sync_poses = self.sync_cameras_to_actors(actor_camera_ids, height_offset)
+                self._camera_sync_time = time.time()
+            return self._camera_sync_poses
 
     def show_img(self, image):
         """Show image.
@@ -319,7 +535,7 @@ class Communicator:
         """
         self.unrealcv.show_video(video_path)
 
-    def start_background_recording(self, humanoid, output_dir='../videos', fps=20.0, resolution=(1280, 720)):
+    def start_background_recording(self, humanoid, output_dir='../videos', fps=20.0, resolution=(1280, 720), clock=None):
         """Start recording video from a humanoid's camera in the background.
 
         Args:
@@ -327,6 +543,7 @@ class Communicator:
             output_dir: Output directory.
             fps: Recording FPS.
             resolution: Camera resolution.
+            clock: Optional SimClock pacing the capture in simulated time.
         """
         recorder = VideoRecorder(
             communicator=self,
@@ -334,7 +551,8 @@ class Communicator:
             output_dir=output_dir,
             resolution=resolution,
             fps=fps,
-            frame_num=-1  # Unlimited recording until stopped
+            frame_num=-1,  # Unlimited recording until stopped
+            clock=clock
         )
         recorder.start_async()
         self.background_recorders[humanoid.id] = recorder
@@ -387,16 +605,19 @@ class Communicator:
             states: Dictionary containing multiple vehicle states,
                    where keys are vehicle IDs and values are state tuples.
         """
-        vehicles_states_str = ''
-        for vehicle_id, state in states.items():
-            name = self.get_vehicle_name(vehicle_id)
-            vehicle_state = f'{name},{state[0]},{state[1]},{state[2]}'
+        self.unrealcv.v_set_states(self.ue_manager_name, self.vehicle_states_str(states))
 
-            if vehicles_states_str:
-                vehicles_states_str += ';'
-            vehicles_states_str += vehicle_state
+    def vehicle_states_str(self, states):
+        """Format vehicle states for the UE manager's batch update.
 
-        self.unrealcv.v_set_states(self.ue_manager_name, vehicles_states_str)
+        Args:
+            states: Dictionary mapping vehicle IDs to (throttle, brake, steering) tuples.
+
+        Returns:
+            str: States string, e.g. ``'GEN_BP_Vehicle_0,1,0,0;GEN_BP_Vehicle_1,0,1,0'``.
+        """
+        return ';'.join(f'{self.get_vehicle_name(vehicle_id)},{state[0]},{state[1]},{state[2]}'
+                        for vehicle_id, state in states.items())
 
     def get_vehicle_name(self, vehicle_id):
         """Get vehicle name.
@@ -461,16 +682,18 @@ class Communicator:
             states: Dictionary containing multiple pedestrian states,
                    where keys are pedestrian IDs and values are states.
         """
-        pedestrians_states_str = ''
-        for pedestrian_id, state in states.items():
-            name = self.get_pedestrian_name(pedestrian_id)
-            pedestrian_state = f'{name},{state}'
+        self.unrealcv.p_set_states(self.ue_manager_name, self.pedestrian_states_str(states))
+
+    def pedestrian_states_str(self, states):
+        """Format pedestrian states for the UE manager's batch update.
 
-            if pedestrians_states_str:
-                pedestrians_states_str += ';'
-            pedestrians_states_str += pedestrian_state
+        Args:
+            states: Dictionary mapping pedestrian IDs to states.
 
-        self.unrealcv.p_set_states(self.ue_manager_name, pedestrians_states_str)
+        Returns:
+            str: States string, e.g. ``'GEN_BP_Pedestrian_0,1;GEN_BP_Pedestrian_1,0'``.
+        """
+        return ';'.join(f'{self.get_pedestrian_name(pedestrian_id)},{state}' for pedestrian_id, state in states.items())
 
     def p_set_waypoints(self, pedestrian_id, waypoints):
         """Set pedestrian waypoints.
@@ -592,7 +815,18 @@ class Communicator:
         Returns:
             Human collision number, object collision number, building collision number, vehicle collision number.
         """
-        collision_json = self.unrealcv.get_collision_num(self.get_humanoid_name(humanoid_id))
+        return self._parse_collision_number(self.unrealcv.get_collision_num(self.get_humanoid_name(humanoid_id)))
+
+    @staticmethod
+    def _parse_collision_number(collision_json):
+        """Parse the response of a ``GetCollisionNum`` command.
+
+        Args:
+            collision_json: Server response.
+
+        Returns:
+            Human collision number, object collision number, building collision number, vehicle collision number.
+        """
         collision_data = json.loads(collision_json)
         human_collision_num = int(collision_data['HumanCollision'])
         object_collision_num = int(collision_data['ObjectCollision'])
@@ -600,6 +834,179 @@ class Communicator:
         vehicle_collision_num = int(collision_data['VehicleCollision'])
         return human_collision_num, object_collision_num, building_collision_num, vehicle_collision_num
 
+    def next_tick(self):
+        """Advance the tick counter so that the next state query decodes a fresh snapshot.
+
+        Writes still buffered from the previous tick are flushed first.
+
+        Returns:
+            int: The new tick ID.
+        """
+        self.flush()
+        self.tick_id += 1
+        return self.tick_id
+
+    def step(self, commands=(), queries=None, tick=True):
+        """Send control commands, tick and query the resulting state in one batch request.
+
+        The batch holds the writes buffered by the command buffer, then ``commands``,
+        then the tick if the game is paused in synchronous mode (see
+        ``UnrealCV.set_mode``), then all queries, so a step costs a single round trip
+        instead of one per call. The world snapshot of the step becomes the cached
+        snapshot of the new tick.
+
+        Args:
+            commands: Additional command strings to send before the tick.
+            queries: StepQueries, or a dict of its fields. Defaults to a world snapshot only.
+            tick: Whether the step starts a new tick. The tick counter advances, and the
+                game is ticked if it is paused.
+
+        Returns:
+            StepResult: The queried state, images and the commands that failed.
+        """
+        if queries is None:
+            queries = StepQueries()
+        elif isinstance(queries, dict):
+            queries = StepQueries(**queries)
+
+        cmds = []
+        if self.unrealcv.command_buffer is not None:
+            cmds.extend(self.unrealcv.command_buffer.drain())
+        cmds.extend(commands)
+        if tick and self.unrealcv.paused:
+            cmds.append('vset /action/tick')
+        query_start = len(cmds)
+        if queries.world:
+            cmds.append(f'vbp {self.ue_manager_name} GetInformation')
+        cmds.extend(f'vget /object/{name}/location' for name in queries.locations)
+        cmds.extend(f'vget /object/{name}/rotation' for name in queries.rotations)
+        cmds.extend(f'vbp {self.get_humanoid_name(humanoid_id)} GetCollisionNum' for humanoid_id in queries.collisions)
+        cmds.extend(UnrealCV.image_cmd(cam_id, viewmode, queries.image_mode) for cam_id, viewmode in queries.images)
+
+        timestamp = time.time()
+        responses = self.unrealcv.request_batch(cmds)
+        if tick:
+            self.tick_id += 1
+        errors = [(cmd, res) for cmd, res in zip(cmds, responses) if UnrealCV.is_error_response(res)]
+        for cmd, res in errors:
+            self.logger.warning(f'Step command "{cmd}" returned {res}')
+
+        replies = iter(responses[query_start:])
+        snapshot = None
+        if queries.world:
+            res = next(replies)
+            if not UnrealCV.is_error_response(res):
+                snapshot = WorldSnapshot.from_payload(res, tick_id=self.tick_id, timestamp=timestamp)
+                with self._snapshot_lock:
+                    self._snapshot = snapshot
+        locations, rotations, collisions, images = {}, {}, {}, {}
+        for table, names in ((locations, queries.locations), (rotations, queries.rotations)):
+            for name in names:
+                res = next(replies)
+                if not UnrealCV.is_error_response(res):
+                    table[name] = np.array([float(i) for i in res.split()])
+        for humanoid_id in queries.collisions:
+            res = next(replies)
+            if not UnrealCV.is_error_response(res):
+                collisions[humanoid_id] = self._parse_collision_number(res)
+        if queries.images:
+            if self._decode_executor is None:
+                self._decode_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ImageDecode')
+
+            def _decode(image, res):
+                cam_id, viewmode = image
+                return UnrealCV.decode_images([res], cam_id, [viewmode], queries.image_mode)[viewmode]
+
+            images = dict(zip(queries.images, self._decode_executor.map(_decode, queries.images, replies)))
+
+        return StepResult(self.tick_id, timestamp, snapshot, locations, rotations, collisions, images, errors)
+
+    def enable_command_buffer(self, chunk_size=500):
+        """Buffer vehicle, pedestrian and traffic signal writes until the next flush.
+
+        Writes to the same actor attribute are coalesced and the remaining commands are
+        sent in one batch request by ``flush``, which ``next_tick`` calls once per tick.
+
+        Args:
+            chunk_size: Maximum number of commands per batch request.
+
+        Returns:
+            CommandBuffer: The command buffer.
+        """
+        if self.unrealcv.command_buffer is None:
+            self.unrealcv.command_buffer = CommandBuffer(self.unrealcv, chunk_size)
+        return self.unrealcv.command_buffer
+
+    def disable_command_buffer(self):
+        """Flush the buffered writes and send writes immediately from now on."""
+        self.flush()
+        self.unrealcv.command_buffer = None
+
+    def flush(self):
+        """Send the buffered writes now.
+
+        Returns:
+            list: (cmd, response) pairs of the commands sent, empty if no command buffer is enabled.
+        """
+        if self.unrealcv is None or self.unrealcv.command_buffer is None:
+            return []
+        return self.unrealcv.command_buffer.flush()
+
+    def get_world_snapshot(self, refresh=False):
+        """Get the decoded state of all actors reported by the UE manager.
+
+        If a state subscriber is running, its latest snapshot is returned without a
+        round trip to UE, unless it is stale or its poll started before the current
+        tick, in which case it may miss the commands sent since. Otherwise the snapshot
+        is cached and shared by every caller within the same tick, as long as it is not
+        older than ``snapshot_max_age`` seconds.
+
+        Args:
+            refresh: Whether to ignore the cached and published snapshots and query UE again.
+
+        Returns:
+            WorldSnapshot: The decoded snapshot.
+        """
+        subscriber = self.state_subscriber
+        if not refresh and subscriber is not None and not subscriber.is_stale():
+            published = subscriber.snapshot
+            if published is not None and published.tick_id >= self.tick_id:
+                return published
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if (refresh or snapshot is None or snapshot.tick_id != self.tick_id
+                    or snapshot.age > self.snapshot_max_age):
+                payload = self.unrealcv.get_informations(self.ue_manager_name)
+                snapshot = WorldSnapshot.from_payload(payload, tick_id=self.tick_id)
+                self._snapshot = snapshot
+            return snapshot
+
+    def start_state_subscriber(self, rate=20.0, stale_after=None):
+        """Poll the world state in a background thread and serve snapshots from it.
+
+        While the subscriber runs, ``get_world_snapshot`` and everything built on it
+        (``get_position_and_direction``, the traffic controller, planners and recorders)
+        read the latest published snapshot instead of querying UE themselves.
+
+        Args:
+            rate: Number of polls per second.
+            stale_after: Age in seconds after which a published snapshot is no longer
+                served and UE is queried directly. Defaults to three poll periods.
+
+        Returns:
+            StateSubscriber: The running subscriber.
+        """
+        if self.state_subscriber is None:
+            self.state_subscriber = StateSubscriber(self, rate, stale_after)
+        self.state_subscriber.start()
+        return self.state_subscriber
+
+    def stop_state_subscriber(self):
+        """Stop background state polling and query UE directly again."""
+        if self.state_subscriber is not None:
+            self.state_subscriber.stop()
+            self.state_subscriber = None
+
     def get_position_and_direction(self, vehicle_ids=[], pedestrian_ids=[], traffic_signal_ids=[], humanoid_ids=[], scooter_ids=[]):
         """Get position and direction of vehicles, pedestrians, and traffic signals.
 
@@ -613,96 +1020,177 @@ class Communicator:
         Returns:
             Dictionary containing position and direction information for all objects.
         """
-        info = json.loads(self.unrealcv.get_informations(self.ue_manager_name))
+        return self.position_and_direction_from_snapshot(self.get_world_snapshot(), vehicle_ids, pedestrian_ids,
+                                                         traffic_signal_ids, humanoid_ids, scooter_ids)
+
+    def position_and_direction_from_snapshot(self, snapshot, vehicle_ids=[], pedestrian_ids=[], traffic_signal_ids=[],
+                                             humanoid_ids=[], scooter_ids=[]):
+        """Look up positions, directions and signal states of the given IDs in a snapshot.
+
+        Args:
+            snapshot: Decoded world snapshot.
+            vehicle_ids: List of vehicle IDs.
+            pedestrian_ids: List of pedestrian IDs.
+            traffic_signal_ids: List of traffic signal IDs.
+            humanoid_ids: List of humanoid IDs.
+            scooter_ids: List of scooter IDs.
+
+        Returns:
+            Dictionary containing position and direction information for all objects found.
+        """
         result = {}
 
-        # Process vehicles
-        locations = info['VLocations']
-        rotations = info['VRotations']
-        for vehicle_id in vehicle_ids:
-            name = self.get_vehicle_name(vehicle_id)
-
-            # Parse location
-            location_pattern = f'{name}X=(.*?) Y=(.*?) Z='
-            match = re.search(location_pattern, locations)
-            if match:
-                x, y = float(match.group(1)), float(match.group(2))
-                position = Vector(x, y)
-
-                # Parse rotation
-                rotation_pattern = f'{name}P=.*? Y=(.*?) R='
-                match = re.search(rotation_pattern, rotations)
-                if match:
-                    direction = float(match.group(1))
-                    result[('vehicle', vehicle_id)] = (position, direction)
-
-        # Process pedestrians
-        locations = info['PLocations']
-        rotations = info['PRotations']
-        for pedestrian_id in pedestrian_ids:
-            name = self.get_pedestrian_name(pedestrian_id)
-
-            location_pattern = f'{name}X=(.*?) Y=(.*?) Z='
-            match = re.search(location_pattern, locations)
-            if match:
-                x, y = float(match.group(1)), float(match.group(2))
-                position = Vector(x, y)
-
-                rotation_pattern = f'{name}P=.*? Y=(.*?) R='
-                match = re.search(rotation_pattern, rotations)
-                if match:
-                    direction = float(match.group(1))
-                    result[('pedestrian', pedestrian_id)] = (position, direction)
-
-        # Process traffic signals
-        light_states = info['LStates']
+        for kind, ids, get_name in (('vehicle', vehicle_ids, self.get_vehicle_name),
+                                    ('pedestrian', pedestrian_ids, self.get_pedestrian_name),
+                                    ('humanoid', humanoid_ids, self.get_humanoid_name),
+                                    ('scooter', scooter_ids, self.get_scooter_name)):
+            table = snapshot.transforms[kind]
+            for object_id in ids:
+                transform = table.get(get_name(object_id))
+                if transform is not None:
+                    x, y, _, yaw = transform
+                    result[(kind, object_id)] = (Vector(x, y), yaw)
+
         for traffic_signal_id in traffic_signal_ids:
-            name = self.get_traffic_signal_name(traffic_signal_id)
-            pattern = rf'{name}(true|false)(true|false)(\d+\.\d+)'
-            match = re.search(pattern, light_states)
-            if match:
-                is_vehicle_green = match.group(1) == 'true'
-                is_pedestrian_walk = match.group(2) == 'true'
-                left_time = float(match.group(3))
-
-                result[('traffic_signal', traffic_signal_id)] = (is_vehicle_green, is_pedestrian_walk, left_time)
-
-        # process humanoids
-        locations = info['ALocations']
-        rotations = info['ARotations']
-        for humanoid_id in humanoid_ids:
-            name = self.get_humanoid_name(humanoid_id)
-            location_pattern = f'{name}X=(.*?) Y=(.*?) Z='
-            match = re.search(location_pattern, locations)
-            if match:
-                x, y = float(match.group(1)), float(match.group(2))
-                position = Vector(x, y)
-
-                rotation_pattern = f'{name}P=.*? Y=(.*?) R='
-                match = re.search(rotation_pattern, rotations)
-                if match:
-                    direction = float(match.group(1))
-                    result[('humanoid', humanoid_id)] = (position, direction)
-
-        # process scooters
-        locations = info['SLocations']
-        rotations = info['SRotations']
-        for scooter_id in scooter_ids:
-            name = self.get_scooter_name(scooter_id)
-            location_pattern = f'{name}X=(.*?) Y=(.*?) Z='
-            match = re.search(location_pattern, locations)
-            if match:
-                x, y = float(match.group(1)), float(match.group(2))
-                position = Vector(x, y)
-
-                rotation_pattern = f'{name}P=.*? Y=(.*?) R='
-                match = re.search(rotation_pattern, rotations)
-                if match:
-                    direction = float(match.group(1))
-                    result[('scooter', scooter_id)] = (position, direction)
+            light_state = snapshot.get_light_state(self.get_traffic_signal_name(traffic_signal_id))
+            if light_state is not None:
+                result[('traffic_signal', traffic_signal_id)] = light_state
 
         return result
 
+    @staticmethod
+    def _orientation_from_direction(direction):
+        """Convert a 2D direction vector to a 3D orientation (rotation around Z axis).
+
+        Args:
+            direction: Direction vector.
+
+        Returns:
+            tuple: (pitch, yaw, roll) in degrees.
+        """
+        return (0, math.degrees(math.atan2(direction.y, direction.x)), 0)
+
+    def spawn_actors(self, actors, chunk_size=None):
+        """Spawn many actors through pipelined batch requests.
+
+        The spawn, color, location, rotation, scale, collision and mobility commands
+        of each actor are built up front and sent ``chunk_size`` actors at a time,
+        instead of waiting for one round trip per command.
+
+        If an actor pool is enabled, parked actors of the same model are handed back
+        first, renamed if needed, and only the remaining actors are spawned.
+
+        Args:
+            actors: Iterable of dicts with keys ``name``, ``model_path``, ``location``
+                and ``orientation``, and optional keys ``scale`` (defaults to (1, 1, 1)),
+                ``collision`` (defaults to True), ``movable`` (defaults to True) and
+                ``color`` (defaults to None, meaning the color is not set).
+            chunk_size: Number of actors per batch request. Defaults to ``self.spawn_chunk_size``.
+
+        Returns:
+            dict: Names of the actors that failed to spawn, mapped to the first error response.
+        """
+        chunk_size = chunk_size or self.spawn_chunk_size
+        actors = list(actors)
+        failures = {}
+        chunk = []
+        if self.actor_pool is not None:
+            actors = self._reuse_parked_actors(actors, chunk_size)
+
+        def _flush(chunk):
+            cmds, owners = [], []
+            for actor in chunk:
+                actor_cmds = UnrealCV.spawn_cmds(
+                    actor['model_path'], actor['name'], actor['location'], actor['orientation'],
+                    scale=actor.get('scale', (1, 1, 1)),
+                    hasCollision=actor.get('collision', True),
+                    isMovable=actor.get('movable', True),
+                    color=actor.get('color'))
+                cmds.extend(actor_cmds)
+                owners.extend([actor['name']] * len(actor_cmds))
+            try:
+                responses = self.unrealcv.request_batch(cmds)
+            except Exception as e:
+                for actor in chunk:
+                    failures.setdefault(actor['name'], str(e))
+                return
+            for owner, cmd, res in zip(owners, cmds, responses):
+                if owner not in failures and UnrealCV.is_error_response(res):
+                    failures[owner] = res
+                    self.logger.error(f'Failed to spawn {owner}: "{cmd}" returned {res}')
+
+        for actor in actors:
+            chunk.append(actor)
+            if len(chunk) >= chunk_size:
+                _flush(chunk)
+                chunk = []
+        if chunk:
+            _flush(chunk)
+
+        if self.actor_pool is not None:
+            for actor in actors:
+                if actor['name'] not in failures:
+                    self.actor_pool.register(actor['name'], actor['model_path'])
+        if actors:
+            self.camera_registry.invalidate(*(actor['name'] for actor in actors))
+        return failures
+
+    def _reuse_parked_actors(self, actors, chunk_size):
+        """Hand parked actors back to spawns.
+
+        Args:
+            actors: List of spawn descriptions, see ``spawn_actors``.
+            chunk_size: Number of actors per batch request.
+
+        Returns:
+            list: Spawn descriptions of the actors that still have to be spawned.
+        """
+        pool = self.actor_pool
+        reused, pending, evicted, to_spawn = [], [], [], []
+
+        # Exact names first, so that no parked actor is renamed away from a spawn requesting it
+        for actor in actors:
+            if pool.acquire(actor['name'], actor['model_path']) is not None:
+                reused.append((actor, actor['name']))
+            else:
+                if pool.evict(actor['name'], actor['model_path']):
+                    evicted.append(actor['name'])
+                pending.append(actor)
+        for actor in pending:
+            parked_name = pool.acquire(actor['name'], actor['model_path'], exact=False)
+            if parked_name is None:
+                to_spawn.append(actor)
+            else:
+                reused.append((actor, parked_name))
+
+        if evicted:
+            # Parked actors of another model holding requested names
+            self.unrealcv.destroy_batch(evicted, chunk_size)
+            self.unrealcv.clean_garbage()
+
+        # Teleport and reset the reused actors; the ones gone from UE are spawned again
+        cmds, owners = [], []
+        for actor, parked_name in reused:
+            actor_cmds = ActorPool.reuse_cmds(actor, parked_name)
+            cmds.extend(actor_cmds)
+            owners.extend([parked_name] * len(actor_cmds))
+        lost = {}
+        for parked_name, res in zip(owners, self.unrealcv.request_chunked(cmds, chunk_size * 8)):
+            if parked_name not in lost and UnrealCV.is_error_response(res):
+                lost[parked_name] = res
+                self.logger.warning(f'Failed to reuse parked actor {parked_name} ({res}), spawning it again')
+        for actor, parked_name in reused:
+            pool.forget(parked_name)
+            if parked_name in lost:
+                to_spawn.append(actor)
+            else:
+                pool.register(actor['name'], actor['model_path'])
+        if reused:
+            self.camera_registry.invalidate(*(parked_name for _, parked_name in reused))
+
+        pool.count_miss(len(to_spawn))
+        return to_spawn
+
     def spawn_object(self, object_name, model_path, position, direction):
         """Spawn object.
 
@@ -712,24 +1200,12 @@ class Communicator:
             position: Position. Tuple (x, y, z).
             direction: Direction. Tuple (pitch, yaw, roll).
         """
-        self.unrealcv.spawn_bp_asset(model_path, object_name)
-        # Convert 2D position to 3D (x,y -> x,y,z)
-        location_3d = (
-            position[0],  # Unreal X = 2D Y
-            position[1],  # Unreal Y = 2D X
-            position[2]  # Z coordinate (ground level)
-        )
-        # Convert 2D direction to 3D orientation (assuming rotation around Z axis)
-        orientation_3d = (
-            direction[0],  # Pitch
-            direction[1],  # Yaw
-            direction[2]  # Roll
-        )
-        self.unrealcv.set_location(location_3d, object_name)
-        self.unrealcv.set_orientation(orientation_3d, object_name)
-        self.unrealcv.set_scale((1, 1, 1), object_name)
-        self.unrealcv.set_collision(object_name, True)
-        self.unrealcv.set_movable(object_name, True)
+        return self.spawn_actors([{
+            'name': object_name,
+            'model_path': model_path,
+            'location': (position[0], position[1], position[2]),
+            'orientation': (direction[0], direction[1], direction[2]),
+        }])
 
     # Initialization methods
     def spawn_agent(self, agent, name, position=None, model_path='/Game/TrafficSystem/Pedestrian/Base_User_Agent.Base_User_Agent_C', type='humanoid'):
@@ -750,7 +1226,6 @@ class Communicator:
             else:
                 name = name
 
-        self.unrealcv.spawn_bp_asset(model_path, name)
         # Convert 2D position to 3D (x,y -> x,y,z)
         if position is None:
             location_3d = (
@@ -764,18 +1239,13 @@ class Communicator:
                 position[1],
                 position[2]
             )
-        # Convert 2D direction to 3D orientation (assuming rotation around Z axis)
-        orientation_3d = (
-            0,  # Pitch
-            math.degrees(math.atan2(agent.direction.y, agent.direction.x)),  # Yaw
-            0  # Roll
-        )
         print(location_3d)
-        self.unrealcv.set_location(location_3d, name)
-        self.unrealcv.set_orientation(orientation_3d, name)
-        self.unrealcv.set_scale((1, 1, 1), name)  # Default scale
-        self.unrealcv.set_collision(name, True)
-        self.unrealcv.set_movable(name, True)
+        return self.spawn_actors([{
+            'name': name,
+            'model_path': model_path,
+            'location': location_3d,
+            'orientation': self._orientation_from_direction(agent.direction),
+        }])
 
     def spawn_scooter(self, scooter, model_path):
         """Spawn scooter.
@@ -784,52 +1254,28 @@ class Communicator:
             scooter: Scooter object.
             model_path: Model path.
         """
-        name = self.get_scooter_name(scooter.id)
-        self.unrealcv.spawn_bp_asset(model_path, name)
-        # Convert 2D position to 3D (x,y -> x,y,z)
-        location_3d = (
-            scooter.position.x,  # Unreal X = 2D Y
-            scooter.position.y,  # Unreal Y = 2D X
-            0  # Z coordinate (ground level)
-        )
-        # Convert 2D direction to 3D orientation (assuming rotation around Z axis)
-        orientation_3d = (
-            0,  # Pitch
-            math.degrees(math.atan2(scooter.direction.y, scooter.direction.x)),  # Yaw
-            0  # Roll
-        )
-        self.unrealcv.set_location(location_3d, name)
-        self.unrealcv.set_orientation(orientation_3d, name)
-        self.unrealcv.set_scale((1, 1, 1), name)  # Default scale
-        self.unrealcv.set_collision(name, True)
-        self.unrealcv.set_movable(name, True)
+        return self.spawn_actors([{
+            'name': self.get_scooter_name(scooter.id),
+            'model_path': model_path,
+            'location': (scooter.position.x, scooter.position.y, 0),  # Z coordinate (ground level)
+            'orientation': self._orientation_from_direction(scooter.direction),
+        }])
 
     def spawn_vehicles(self, vehicles):
         """Spawn vehicles.
 
         Args:
             vehicles: List of vehicle objects.
+
+        Returns:
+            dict: Names of the vehicles that failed to spawn, mapped to the error response.
         """
-        for vehicle in vehicles:
-            name = self.get_vehicle_name(vehicle.id)
-            self.unrealcv.spawn_bp_asset(vehicle.vehicle_reference, name)
-            # Convert 2D position to 3D (x,y -> x,y,z)
-            location_3d = (
-                vehicle.position.x,  # Unreal X = 2D Y
-                vehicle.position.y,  # Unreal Y = 2D X
-                0  # Z coordinate (ground level)
-            )
-            # Convert 2D direction to 3D orientation (assuming rotation around Z axis)
-            orientation_3d = (
-                0,  # Pitch
-                math.degrees(math.atan2(vehicle.direction.y, vehicle.direction.x)),  # Yaw
-                0  # Roll
-            )
-            self.unrealcv.set_location(location_3d, name)
-            self.unrealcv.set_orientation(orientation_3d, name)
-            self.unrealcv.set_scale((1, 1, 1), name)  # Default scale
-            self.unrealcv.set_collision(name, True)
-            self.unrealcv.set_movable(name, True)
+        return self.spawn_actors({
+            'name': self.get_vehicle_name(vehicle.id),
+            'model_path': vehicle.vehicle_reference,
+            'location': (vehicle.position.x, vehicle.position.y, 0),  # Z coordinate (ground level)
+            'orientation': self._orientation_from_direction(vehicle.direction),
+        } for vehicle in vehicles)
 
     def spawn_pedestrians(self, pedestrians, model_path='/Game/TrafficSystem/Pedestrian/Base_Pedestrian.Base_Pedestrian_C'):
         """Spawn pedestrians.
@@ -837,27 +1283,16 @@ class Communicator:
         Args:
             pedestrians: List of pedestrian objects.
             model_path: Pedestrian model path.
+
+        Returns:
+            dict: Names of the pedestrians that failed to spawn, mapped to the error response.
         """
-        for pedestrian in pedestrians:
-            name = self.get_pedestrian_name(pedestrian.id)
-            self.unrealcv.spawn_bp_asset(model_path, name)
-            # Convert 2D position to 3D (x,y -> x,y,z)
-            location_3d = (
-                pedestrian.position.x,  # Unreal X = 2D Y
-                pedestrian.position.y,  # Unreal Y = 2D X
-                110  # Z coordinate (ground level)
-            )
-            # Convert 2D direction to 3D orientation (assuming rotation around Z axis)
-            orientation_3d = (
-                0,  # Pitch
-                math.degrees(math.atan2(pedestrian.direction.y, pedestrian.direction.x)),  # Yaw
-                0  # Roll
-            )
-            self.unrealcv.set_location(location_3d, name)
-            self.unrealcv.set_orientation(orientation_3d, name)
-            self.unrealcv.set_scale((1, 1, 1), name)  # Default scale
-            self.unrealcv.set_collision(name, True)
-            self.unrealcv.set_movable(name, True)
+        return self.spawn_actors({
+            'name': self.get_pedestrian_name(pedestrian.id),
+            'model_path': model_path,
+            'location': (pedestrian.position.x, pedestrian.position.y, 110),  # Z coordinate (ground level)
+            'orientation': self._orientation_from_direction(pedestrian.direction),
+        } for pedestrian in pedestrians)
 
     def spawn_traffic_signals(self, traffic_signals, traffic_light_model_path='/Game/city_props/BP/props/street_light/BP_street_light.BP_street_light_C', pedestrian_light_model_path='/Game/city_props/BP/props/street_light/BP_street_light_ped.BP_street_light_ped_C'):
         """Spawn traffic signals.
@@ -866,31 +1301,24 @@ class Communicator:
             traffic_signals: List of traffic signal objects to spawn.
             traffic_light_model_path: Path to the traffic light model asset.
             pedestrian_light_model_path: Path to the pedestrian signal light model asset.
+
+        Returns:
+            dict: Names of the traffic signals that failed to spawn, mapped to the error response.
         """
+        actors = []
         for traffic_signal in traffic_signals:
-            name = self.get_traffic_signal_name(traffic_signal.id)
             if traffic_signal.type == 'pedestrian':
                 model_name = pedestrian_light_model_path
             elif traffic_signal.type == 'both':
                 model_name = traffic_light_model_path
-            self.unrealcv.spawn_bp_asset(model_name, name)
-            # Convert 2D position to 3D (x,y -> x,y,z)
-            location_3d = (
-                traffic_signal.position.x,
-                traffic_signal.position.y,
-                0  # Z coordinate (ground level)
-            )
-            # Convert 2D direction to 3D orientation (assuming rotation around Z axis)
-            orientation_3d = (
-                0,  # Pitch
-                math.degrees(math.atan2(traffic_signal.direction.y, traffic_signal.direction.x)),  # Yaw
-                0  # Roll
-            )
-            self.unrealcv.set_location(location_3d, name)
-            self.unrealcv.set_orientation(orientation_3d, name)
-            self.unrealcv.set_scale((1, 1, 1), name)  # Default scale
-            self.unrealcv.set_collision(name, True)
-            self.unrealcv.set_movable(name, False)
+            actors.append({
+                'name': self.get_traffic_signal_name(traffic_signal.id),
+                'model_path': model_name,
+                'location': (traffic_signal.position.x, traffic_signal.position.y, 0),  # Z coordinate (ground level)
+                'orientation': self._orientation_from_direction(traffic_signal.direction),
+                'movable': False,
+            })
+        return self.spawn_actors(actors)
 
     def spawn_intersection(self, intersection_name, model_path):
         """Spawn intersection.
@@ -907,27 +1335,18 @@ class Communicator:
         Args:
             waypoints: List of waypoint objects.
             model_path: Waypoint mark model path.
+
+        Returns:
+            dict: Names of the waypoint marks that failed to spawn, mapped to the error response.
         """
-        id_counter = 0
-        for waypoint in waypoints:
-            name = self.get_waypoint_mark_name(id_counter)
-            id_counter += 1
-            self.unrealcv.spawn_bp_asset(model_path, name)
-            location_3d = (
-                waypoint.position.x,
-                waypoint.position.y,
-                30  # Z coordinate (ground level)
-            )
-            self.unrealcv.set_location(location_3d, name)
-            orientation_3d = (
-                0,  # Pitch
-                math.degrees(math.atan2(waypoint.direction.y, waypoint.direction.x)),  # Yaw
-                0  # Roll
-            )
-            self.unrealcv.set_orientation(orientation_3d, name)
-            self.unrealcv.set_scale((1, 1, 1), name)
-            self.unrealcv.set_collision(name, False)
-            self.unrealcv.set_movable(name, False)
+        return self.spawn_actors({
+            'name': self.get_waypoint_mark_name(id_counter),
+            'model_path': model_path,
+            'location': (waypoint.position.x, waypoint.position.y, 30),  # Z coordinate (ground level)
+            'orientation': self._orientation_from_direction(waypoint.direction),
+            'collision': False,
+            'movable': False,
+        } for id_counter, waypoint in enumerate(waypoints))
 
     def spawn_ue_manager(self, ue_manager_path):
         """Spawn UE manager.
@@ -942,76 +1361,157 @@ class Communicator:
         """Update objects."""
         self.unrealcv.update_objects(self.ue_manager_name)
 
-    def generate_world(self, world_json, ue_asset_path, run_time=True):
+    def generate_world(self, world_json, ue_asset_path, run_time=True, diff=False, start_node=0,
+                       chunk_size=None, progress_callback=None):
         """Generate world.
 
+        Nodes are streamed from the world JSON and spawned ``chunk_size`` at a time, so
+        huge worlds are never loaded whole and an interrupted generation can be resumed.
+
         Args:
             world_json: World configuration JSON file path.
             ue_asset_path: Unreal Engine asset path.
             run_time: Whether to run the world generation in real time.
+            diff: Whether to only apply the difference to the world generated last: nodes
+                that are new are spawned, nodes that are gone are destroyed and nodes whose
+                transform changed are moved. If no world was generated by this communicator,
+                the world nodes found in UE are compared instead.
+            start_node: Number of nodes to skip, e.g. ``WorldLoadProgress.nodes_done`` of an
+                interrupted generation.
+            chunk_size: Number of nodes per bulk spawn. Defaults to ``self.spawn_chunk_size``.
+            progress_callback: Optional function called with a ``WorldLoadProgress`` after
+                every chunk.
 
         Returns:
-            set: A set of generated object IDs.
+            set: A set of generated object IDs. In diff mode, the IDs of all nodes of the
+            new world present in UE.
+
+        Raises:
+            ValueError: If ``start_node`` is combined with ``diff``, which needs all nodes.
         """
+        if diff and start_node:
+            raise ValueError('start_node cannot be used with diff, which compares all nodes')
+        chunk_size = chunk_size or self.spawn_chunk_size
         generated_ids = set()
-        # Load world from JSON
-        world_setting = load_json(world_json)
-        # Use pandas data structure, convert JSON data to pandas dataframe
-        nodes = world_setting['nodes']
-        node_df = pd.json_normalize(nodes, sep='_')
-        node_df.set_index('id', inplace=True)
-
-        # Load asset library
-        asset_library = load_json(ue_asset_path)
-
-        def _parse_rgb(color_str):
-            """Parse RGB values from color string like '(R=255,G=255,B=0)'.
-
-            Args:
-                color_str: Color string.
-            """
-            pattern = r'R=(\d+),G=(\d+),B=(\d+)'
-            match = re.search(pattern, color_str)
-            if match:
-                return [int(match.group(1)), int(match.group(2)), int(match.group(3))]
-            return [0, 0, 0]  # Default to black if parsing fails
-
-        def _process_node(row):
-            """Process a single node.
-
-            Args:
-                row: Node row.
-            """
-            # Spawn each node on the map
-            id = row.name  # name is the index of the row
+        # Resolve the asset path and color of each asset once
+        asset_table = build_asset_table(load_json(ue_asset_path))
+
+        actors = []
+        nodes_done, spawned, failed = 0, 0, 0
+        bytes_read, total_bytes = 0, None
+
+        def _flush():
+            nonlocal spawned, failed
+            failures = self.spawn_actors(actors, chunk_size)
+            for actor in actors:
+                if actor['name'] in failures:
+                    failed += 1
+                else:
+                    generated_ids.add(actor['name'])
+                    self.applied_world[actor['name']] = actor
+                    spawned += 1
+            actors.clear()
+            self._report_world_progress(
+                WorldLoadProgress(nodes_done, spawned, failed, bytes_read, total_bytes), progress_callback)
+
+        for node, bytes_read, total_bytes in iter_world_nodes(world_json):
+            nodes_done += 1
+            if nodes_done <= start_node:
+                continue
             try:
-                instance_ref = asset_library[node_df.loc[id, 'instance_name']]['asset_path']
-                color = asset_library['colors'][asset_library[node_df.loc[id, 'instance_name']]['color']]
-                rgb_values = _parse_rgb(color)
+                actors.append(node_to_actor(node, asset_table, run_time))
             except KeyError:
-                self.logger.error(f"Can't find node {node_df.loc[id, 'instance_name']} in asset library")
-                return
-            else:
-                self.unrealcv.spawn_bp_asset(instance_ref, id)
-                if run_time:
-                    self.unrealcv.set_color(id, rgb_values)
-                location = node_df.loc[id, ['properties_location_x', 'properties_location_y', 'properties_location_z']].to_list()
-                self.unrealcv.set_location(location, id)
-                orientation = node_df.loc[id, ['properties_orientation_pitch', 'properties_orientation_yaw', 'properties_orientation_roll']].to_list()
-                self.unrealcv.set_orientation(orientation, id)
-                scale = node_df.loc[id, ['properties_scale_x', 'properties_scale_y', 'properties_scale_z']].to_list()
-                self.unrealcv.set_scale(scale, id)
-                self.unrealcv.set_collision(id, True)
-                self.unrealcv.set_movable(id, False)
-                generated_ids.add(id)
-
-        node_df.apply(_process_node, axis=1)
+                self.logger.error(f"Can't find node {node.get('instance_name')} in asset library")
+                failed += 1
+                continue
+            if not diff and len(actors) >= chunk_size:
+                _flush()
+
+        if diff:
+            return self._apply_world_diff(actors)
+        if actors:
+            _flush()
 
         return generated_ids
 
+    def _report_world_progress(self, progress, progress_callback):
+        """Log the progress of a world generation and pass it to the callback.
+
+        Args:
+            progress: WorldLoadProgress.
+            progress_callback: Optional function called with the progress.
+        """
+        fraction = progress.fraction
+        self.logger.info(f'Generated {progress.spawned} world nodes ({progress.failed} failed), '
+                         f'{progress.nodes_done} nodes processed'
+                         + (f' ({fraction:.0%})' if fraction is not None else ''))
+        if progress_callback is not None:
+            progress_callback(progress)
+
+    def _apply_world_diff(self, actors):
+        """Bring the world nodes in UE in line with the spawn descriptions of a new world.
+
+        Args:
+            actors: Spawn descriptions of all nodes of the new world.
+
+        Returns:
+            set: IDs of the nodes of the new world present in UE.
+        """
+        previous = dict(self.applied_world)
+        if not previous:
+            previous = {name: None for name in self.unrealcv.get_objects() if is_world_node(name)}
+        world_diff = diff_world(previous, actors)
+        self.logger.info(f'World diff: {len(world_diff.added)} added, {len(world_diff.removed)} removed, '
+                         f'{len(world_diff.moved)} moved, {len(world_diff.unchanged)} unchanged')
+
+        failures = {}
+        if world_diff.removed:
+            self.destroy_actors(world_diff.removed)
+            # Free the names of the nodes respawned with another model
+            self.unrealcv.clean_garbage()
+        failures.update(self.move_actors(world_diff.moved))
+        failures.update(self.spawn_actors(world_diff.added))
+
+        self.applied_world = {actor['name']: actor for actor in actors if actor['name'] not in failures}
+        return set(self.applied_world)
+
+    def move_actors(self, actors, chunk_size=100):
+        """Move existing actors with chunked batch requests.
+
+        Args:
+            actors: Iterable of spawn descriptions, see ``spawn_actors``. The model path is ignored.
+            chunk_size: Number of actors per batch request.
+
+        Returns:
+            dict: Names of the actors that failed to be moved, mapped to the first error response.
+        """
+        cmds, owners = [], []
+        for actor in actors:
+            actor_cmds = UnrealCV.transform_cmds(
+                actor['name'], actor['location'], actor['orientation'],
+                scale=actor.get('scale', (1, 1, 1)),
+                isMovable=actor.get('movable', True),
+                color=actor.get('color'))
+            cmds.extend(actor_cmds)
+            owners.extend([actor['name']] * len(actor_cmds))
+
+        failures = {}
+        for owner, cmd, res in zip(owners, cmds, self.unrealcv.request_chunked(cmds, chunk_size * 6)):
+            if owner not in failures and UnrealCV.is_error_response(res):
+                failures[owner] = res
+                self.logger.error(f'Failed to move {owner}: "{cmd}" returned {res}')
+        return failures
+
     # Utility methods
-    def clear_env(self, keep_roads=False):
-        """Clear all objects in the environment."""
+    def clear_env(self, keep_roads=False, wait=True):
+        """Clear all objects in the environment.
+
+        Args:
+            keep_roads: Whether to keep the road actors.
+            wait: Whether to wait for UE to destroy the actors and collect garbage.
+                If False, the commands are queued and the method returns immediately;
+                later requests are served once UE has finished.
+        """
         # Lazy import to avoid circular dependency
         from simworld.agent.humanoid import Humanoid
         from simworld.agent.pedestrian import Pedestrian
@@ -1019,7 +1519,8 @@ class Communicator:
         from simworld.agent.vehicle import Vehicle
 
         # Get all objects in the environment
-        objects = [obj.lower() for obj in self.unrealcv.get_objects()]  # Convert objects to lowercase
+        names = self.unrealcv.get_objects()
+        objects = [obj.lower() for obj in names]  # Convert objects to lowercase
         # Define unwanted objects
         if keep_roads:
             unwanted_terms = ['GEN_BP_']
@@ -1030,36 +1531,154 @@ class Communicator:
         # Get all objects starting with the unwanted terms
         indexes = np.concatenate([np.flatnonzero(np.char.startswith(objects, term)) for term in unwanted_terms])
         # Destroy them
-        if indexes is not None:
-            for index in indexes:
-                self.unrealcv.destroy(objects[index])
+        self.destroy_actors([names[index] for index in indexes], wait=wait)
 
-        self.unrealcv.clean_garbage()
+        self.unrealcv.clean_garbage(wait=wait)
+        self.camera_registry.invalidate()
         Humanoid._id_counter = 0
         Scooter._id_counter = 0
         Pedestrian._id_counter = 0
         Vehicle._id_counter = 0
 
-    def clean_traffic_only(self, vehicles, pedestrians, traffic_signals):
+    def clean_traffic_only(self, vehicles, pedestrians, traffic_signals, wait=True):
         """Clean traffic objects only.
 
+        If an actor pool is enabled, the vehicles, pedestrians and traffic signals are
+        parked for the next spawn instead of being destroyed.
+
         Args:
             vehicles: List of vehicles.
             pedestrians: List of pedestrians.
             traffic_signals: List of traffic signals.
+            wait: Whether to wait for UE to destroy the actors and collect garbage.
         """
-        for vehicle in vehicles:
-            self.unrealcv.destroy(self.get_vehicle_name(vehicle.id))
-        for traffic_signal in traffic_signals:
-            self.unrealcv.destroy(self.get_traffic_signal_name(traffic_signal.id))
-        for pedestrian in pedestrians:
-            self.unrealcv.destroy(self.get_pedestrian_name(pedestrian.id))
+        self.flush()
+        names = [self.get_vehicle_name(vehicle.id) for vehicle in vehicles]
+        names.extend(self.get_traffic_signal_name(traffic_signal.id) for traffic_signal in traffic_signals)
+        names.extend(self.get_pedestrian_name(pedestrian.id) for pedestrian in pedestrians)
+
+        self.park_actors(names, wait=wait)
+        if self.ue_manager_name is not None:
+            self.destroy_actors([self.ue_manager_name], wait=wait)
+        self.unrealcv.clean_garbage(wait=wait)
+
+    def enable_actor_pool(self, park_location=(0.0, 0.0, -20000.0), park_spacing=500.0):
+        """Park unused actors for later spawns instead of destroying them.
+
+        Only actors spawned from now on are pooled.
 
-        self.unrealcv.destroy(self.ue_manager_name)
-        self.unrealcv.clean_garbage()
+        Args:
+            park_location: Location (x, y, z) of the first parking slot, out of view of the cameras.
+            park_spacing: Distance between parking slots.
+
+        Returns:
+            ActorPool: The actor pool.
+        """
+        if self.actor_pool is None:
+            self.actor_pool = ActorPool(park_location, park_spacing)
+        return self.actor_pool
+
+    def park_actors(self, actor_names, wait=True):
+        """Park actors out of view so that later spawns of the same model reuse them.
+
+        Actors the actor pool does not track, or all actors if no actor pool is
+        enabled, are destroyed instead.
+
+        Args:
+            actor_names: Names of the actors in UE.
+            wait: Whether to wait for the responses.
+
+        Returns:
+            dict: Names of the actors that failed to be parked or destroyed, mapped to the error response.
+        """
+        actor_names = list(actor_names)
+        if self.actor_pool is None:
+            return self.destroy_actors(actor_names, wait=wait)
+
+        park_cmds, unknown_names = self.actor_pool.park(actor_names)
+        failures = self.destroy_actors(unknown_names, wait=wait)
+        if not park_cmds:
+            return failures
+        self.camera_registry.invalidate(*park_cmds)
+
+        cmds = [cmd for actor_cmds in park_cmds.values() for cmd in actor_cmds]
+        if not wait:
+            self.unrealcv.request_batch_async(cmds)
+            return failures
+        owners = [name for name, actor_cmds in park_cmds.items() for _ in actor_cmds]
+        for name, res in zip(owners, self.unrealcv.request_chunked(cmds)):
+            if name not in failures and UnrealCV.is_error_response(res):
+                failures[name] = res
+                self.actor_pool.forget(name)
+                self.logger.error(f'Failed to park {name}: {res}')
+        return failures
+
+    def destroy_actors(self, actor_names, chunk_size=100, wait=True):
+        """Destroy many actors with chunked batch requests.
+
+        Args:
+            actor_names: Names of the actors in UE.
+            chunk_size: Maximum number of destroy commands per batch request.
+            wait: Whether to wait for the responses. If False, the commands are queued
+                and no failures are reported.
+
+        Returns:
+            dict: Names of the actors that failed to be destroyed, mapped to the error response.
+        """
+        actor_names = list(actor_names)
+        if not actor_names:
+            return {}
+        self.camera_registry.invalidate(*actor_names)
+        for name in actor_names:
+            self.applied_world.pop(name, None)
+        if self.actor_pool is not None:
+            self.actor_pool.forget(*actor_names)
+        responses = self.unrealcv.destroy_batch(actor_names, chunk_size, wait)
+        if not wait:
+            return {}
+
+        failures = {}
+        for name, res in zip(actor_names, responses):
+            if UnrealCV.is_error_response(res):
+                failures[name] = res
+                self.logger.error(f'Failed to destroy {name}: {res}')
+        return failures
+
+    def enable_profiling(self, max_events=100000):
+        """Collect per-command latency and payload statistics of the UnrealCV traffic.
+
+        Args:
+            max_events: Number of most recent requests kept for the Chrome trace.
+
+        Returns:
+            RequestProfiler: Profiler shared by the control connection and the image pool.
+        """
+        profiler = self.unrealcv.enable_profiling(max_events)
+        if self.image_pool is not None:
+            self.image_pool.profiler = profiler
+        return profiler
+
+    def health_check(self, timeout=2.0):
+        """Check whether Unreal Engine answers in time, without waiting for a reconnect.
+
+        Args:
+            timeout: Seconds the check may take.
+
+        Returns:
+            ConnectionHealth: The health report of the command connection.
+        """
+        return self.unrealcv.health_check(timeout)
 
     def disconnect(self):
         """Disconnect from Unreal Engine."""
+        self.stop_state_subscriber()
+        self.flush()
+        if self.image_pool is not None:
+            self.image_pool.disconnect()
+            self.image_pool = None
+        if self._decode_executor is not None:
+            self._decode_executor.shutdown(wait=True)
+            self._decode_executor = None
         self.unrealcv.disconnect()
 
     ##############################################################
@@ -0,0 +1,169 @@
+"""Connection robustness module for the UnrealCV client.
+
+This module holds the pieces ``UnrealCV`` uses to survive a crashed or hung Unreal
+Engine instance: the reconnect policy with exponential backoff, the request
+deadline watchdog, the classification of commands that are safe to replay after a
+reconnect, and the health report used by orchestration to recycle dead instances.
+"""
+import threading
+import time
+from typing import NamedTuple
+
+
+class ReconnectPolicy(NamedTuple):
+    """Reconnect and deadline settings of an UnrealCV client.
+
+    Attributes:
+        max_attempts: Maximum number of connection attempts per reconnect.
+        base_delay: Seconds to wait after the first failed attempt, doubled after each
+            further one.
+        max_delay: Upper bound of the wait between attempts.
+        connect_deadline: Seconds after which a reconnect gives up, whatever the
+            number of attempts left.
+        request_deadline: Default seconds a batch request may take before it is
+            aborted and the connection is reset.
+        max_replays: Number of times a request made only of idempotent commands is
+            replayed after a reconnect before giving up.
+    """
+    max_attempts: int = 8
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    connect_deadline: float = 60.0
+    request_deadline: float = 30.0
+    max_replays: int = 2
+
+    def delays(self):
+        """Iterate over the waits between connection attempts.
+
+        Yields:
+            float: Seconds to wait before the next attempt.
+        """
+        delay = self.base_delay
+        for _ in range(self.max_attempts - 1):
+            yield delay
+            delay = min(delay * 2, self.max_delay)
+
+
+class ConnectionHealth(NamedTuple):
+    """Health report of an UnrealCV client.
+
+    Attributes:
+        healthy: Whether the server answered the health check in time.
+        latency: Seconds the health check took.
+        reconnects: Number of reconnects since the client was created.
+        failures: Number of failed requests since the client was created.
+        last_error: Description of the last failure, or None.
+    """
+    healthy: bool
+    latency: float
+    reconnects: int
+    failures: int
+    last_error: str
+
+
+def is_idempotent(cmd):
+    """Check whether a command can be replayed without changing the outcome.
+
+    Queries (``vget``) and blueprint getters (``vbp <object> Get...``) only read
+    state, so sending them again after a reconnect is safe. Everything else may
+    already have been applied before the connection broke.
+
+    Args:
+        cmd: Command string.
+
+    Returns:
+        bool: True if the command only reads state.
+    """
+    if not isinstance(cmd, str):
+        return False
+    if cmd.startswith('vget '):
+        return True
+    parts = cmd.split(' ', 3)
+    return len(parts) >= 3 and parts[0] == 'vbp' and parts[2].startswith('Get')
+
+
+class RequestWatchdog:
+    """Deadline enforcer for requests that the UnrealCV client waits on forever.
+
+    A request is armed with a deadline before it is sent. If it is still running when
+    the deadline passes, a ``TimeoutError`` is pushed to the response queue of the
+    client, so the waiting request raises instead of blocking. One watchdog serves
+    one connection, whose requests are serialized.
+    """
+
+    def __init__(self):
+        """Initialize the watchdog. Its thread starts with the first armed request."""
+        self._condition = threading.Condition()
+        self._armed = None  # (token, response queue, expiry time, timeout)
+        self._fired = False
+        self._token = 0
+        self._closed = False
+        self._thread = None
+
+    def arm(self, client, timeout: float):
+        """Start watching a request.
+
+        Args:
+            client: Client the request is sent through. Clients without a response
+                queue, such as replay clients, are not watched.
+            timeout: Seconds the request may take.
+
+        Returns:
+            int or None: Token to pass to ``disarm``, or None if the request is not watched.
+        """
+        responses = getattr(client, 'recv_data_q', None)
+        if responses is None:
+            return None
+        with self._condition:
+            self._token += 1
+            self._armed = (self._token, responses, time.monotonic() + timeout, timeout)
+            self._fired = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, name='RequestWatchdog', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+            return self._token
+
+    def disarm(self, token):
+        """Stop watching a request.
+
+        Args:
+            token: Token returned by ``arm``.
+
+        Returns:
+            bool: True if the deadline passed and a timeout was pushed to the client,
+            in which case the connection is out of sync and has to be reset.
+        """
+        if token is None:
+            return False
+        with self._condition:
+            fired = self._fired and self._token == token
+            self._armed = None
+            self._fired = False
+            return fired
+
+    def close(self):
+        """Stop the watchdog thread."""
+        with self._condition:
+            self._closed = True
+            self._armed = None
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        """Push a timeout to the client of each request that outlives its deadline."""
+        with self._condition:
+            while not self._closed:
+                if self._armed is None:
+                    self._condition.wait()
+                    continue
+                _, responses, expires_at, timeout = self._armed
+                remaining = expires_at - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                responses.put(TimeoutError(f'Request timed out after {timeout} seconds'))
+                self._armed = None
+                self._fired = True
@@ -0,0 +1,499 @@
+"""Headless kinematic backend module for running traffic without Unreal Engine.
+
+This module provides ``KinematicCommunicator``, a drop-in ``Communicator`` for the
+vehicle, pedestrian and intersection managers. Instead of sending commands to UE it
+keeps the actors in NumPy arrays and integrates them once per tick: vehicles with a
+kinematic bicycle model driven by throttle, brake and steering, pedestrians with a
+unicycle model driven by the move, rotate and stop commands, and traffic signals
+with the green, yellow and pedestrian walk timers UE would run.
+
+Example:
+    Run the traffic controllers at simulation speed::
+
+        traffic_controller = TrafficController(config)
+        traffic_controller.init_communicator(KinematicCommunicator(dt=traffic_controller.dt))
+        traffic_controller.spawn_objects_in_unreal_engine()
+        traffic_controller.pedestrian_manager.set_pedestrians_max_speed(traffic_controller.communicator)
+        traffic_controller.intersection_manager.set_traffic_signal_duration(traffic_controller.communicator)
+        for _ in range(10000):
+            traffic_controller.step(traffic_controller.update_states)
+"""
+import math
+
+import numpy as np
+
+from simworld.communicator.communicator import Communicator
+from simworld.communicator.world_snapshot import WorldSnapshot
+
+# Traffic signal phases
+_RED, _GREEN, _YELLOW, _WALK = range(4)
+
+
+def _wrap_degrees(angles):
+    """Wrap angles in degrees to [-180, 180)."""
+    return (angles + 180.0) % 360.0 - 180.0
+
+
+def _yaw_of(direction):
+    """Get the yaw in degrees of a direction vector."""
+    return math.degrees(math.atan2(direction.y, direction.x))
+
+
+class KinematicWorld:
+    """Kinematic state of vehicles, pedestrians and traffic signals in NumPy arrays.
+
+    Distances are in UE units (centimeters), angles in degrees and times in seconds.
+    Positive yaw rates turn right, as in UE.
+    """
+
+    def __init__(self, max_speed: float = 1000.0, max_acceleration: float = 300.0, max_deceleration: float = 1000.0,
+                 max_wheel_angle: float = 35.0, wheelbase_ratio: float = 0.6, u_turn_rate: float = 60.0,
+                 u_turn_speed: float = 200.0, pedestrian_turn_rate: float = 180.0):
+        """Initialize an empty world.
+
+        Args:
+            max_speed: Speed a vehicle reaches at full throttle.
+            max_acceleration: Acceleration of a vehicle at full throttle from standstill.
+            max_deceleration: Deceleration of a vehicle at full brake.
+            max_wheel_angle: Wheel angle of a vehicle at full steering.
+            wheelbase_ratio: Wheelbase of a vehicle as a fraction of its length.
+            u_turn_rate: Yaw rate of a vehicle making a U-turn.
+            u_turn_speed: Maximum speed of a vehicle making a U-turn.
+            pedestrian_turn_rate: Yaw rate of a rotating pedestrian.
+        """
+        self.max_speed = max_speed
+        self.max_acceleration = max_acceleration
+        self.max_deceleration = max_deceleration
+        self.max_wheel_angle = max_wheel_angle
+        self.wheelbase_ratio = wheelbase_ratio
+        self.u_turn_rate = u_turn_rate
+        self.u_turn_speed = u_turn_speed
+        self.pedestrian_turn_rate = pedestrian_turn_rate
+        self.time = 0.0
+        self.clear()
+
+    def clear(self):
+        """Remove all actors."""
+        # Vehicles
+        self.vehicle_rows = {}  # {name: row}
+        self.vehicle_names = []
+        self.vehicle_state = np.zeros((0, 8))
+        self.vx, self.vy, self.vyaw, self.vspeed, self.throttle, self.brake, self.steering, self.wheelbase = \
+            self.vehicle_state.T
+        self.u_turn = np.zeros(0)  # degrees left to turn
+
+        # Pedestrians
+        self.pedestrian_rows = {}
+        self.pedestrian_names = []
+        self.pedestrian_state = np.zeros((0, 5))
+        self.px, self.py, self.pyaw, self.pspeed, self.turn = self.pedestrian_state.T
+        self.moving = np.zeros(0, dtype=bool)
+
+        # Traffic signals
+        self.signal_rows = {}
+        self.signal_names = []
+        self.phase = np.zeros(0, dtype=int)
+        self.left_time = np.zeros(0)
+        self.durations = np.zeros((0, 3))  # green, yellow, pedestrian green
+
+    def add_vehicles(self, names, x, y, yaw, length):
+        """Add vehicles at rest.
+
+        Args:
+            names: Vehicle names.
+            x: X coordinates.
+            y: Y coordinates.
+            yaw: Yaw angles.
+            length: Vehicle lengths.
+        """
+        rows = np.zeros((len(names), 8))
+        rows[:, 0], rows[:, 1], rows[:, 2] = x, y, yaw
+        rows[:, 7] = np.asarray(length, dtype=float) * self.wheelbase_ratio
+        self.vehicle_rows.update((name, len(self.vehicle_names) + i) for i, name in enumerate(names))
+        self.vehicle_names.extend(names)
+        self.vehicle_state = np.concatenate([self.vehicle_state, rows])
+        self.vx, self.vy, self.vyaw, self.vspeed, self.throttle, self.brake, self.steering, self.wheelbase = \
+            self.vehicle_state.T
+        self.u_turn = np.concatenate([self.u_turn, np.zeros(len(names))])
+
+    def add_pedestrians(self, names, x, y, yaw, speed):
+        """Add standing pedestrians.
+
+        Args:
+            names: Pedestrian names.
+            x: X coordinates.
+            y: Y coordinates.
+            yaw: Yaw angles.
+            speed: Walking speeds.
+        """
+        rows = np.zeros((len(names), 5))
+        rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3] = x, y, yaw, speed
+        self.pedestrian_rows.update((name, len(self.pedestrian_names) + i) for i, name in enumerate(names))
+        self.pedestrian_names.extend(names)
+        self.pedestrian_state = np.concatenate([self.pedestrian_state, rows])
+        self.px, self.py, self.pyaw, self.pspeed, self.turn = self.pedestrian_state.T
+        self.moving = np.concatenate([self.moving, np.zeros(len(names), dtype=bool)])
+
+    def add_signals(self, names, green_duration: float = 10.0, yellow_duration: float = 2.0,
+                    pedestrian_green_duration: float = 30.0):
+        """Add traffic signals, all red.
+
+        Args:
+            names: Traffic signal names.
+            green_duration: Default green duration.
+            yellow_duration: Default yellow duration.
+            pedestrian_green_duration: Default pedestrian walk duration.
+        """
+        self.signal_rows.update((name, len(self.signal_names) + i) for i, name in enumerate(names))
+        self.signal_names.extend(names)
+        self.phase = np.concatenate([self.phase, np.full(len(names), _RED)])
+        self.left_time = np.concatenate([self.left_time, np.zeros(len(names))])
+        durations = np.tile([green_duration, yellow_duration, pedestrian_green_duration], (len(names), 1))
+        self.durations = np.concatenate([self.durations, durations])
+
+    def set_vehicle_controls(self, rows, controls):
+        """Set the throttle, brake and steering of vehicles.
+
+        Args:
+            rows: Vehicle rows.
+            controls: One (throttle, brake, steering) tuple per row.
+        """
+        self.vehicle_state[np.asarray(rows, dtype=int).reshape(-1), 4:7] = np.asarray(controls, dtype=float).reshape(-1, 3)
+
+    def make_u_turn(self, row):
+        """Start a U-turn to the left.
+
+        Args:
+            row: Vehicle row.
+        """
+        self.u_turn[row] = 180.0
+
+    def move_pedestrian(self, row, moving: bool):
+        """Start or stop a pedestrian.
+
+        Args:
+            row: Pedestrian row.
+            moving: Whether the pedestrian walks.
+        """
+        self.moving[row] = moving
+
+    def rotate_pedestrian(self, row, angle: float, direction: str):
+        """Start rotating a pedestrian.
+
+        Args:
+            row: Pedestrian row.
+            angle: Angle to rotate by.
+            direction: 'left' or 'right'.
+        """
+        self.turn[row] = angle if direction == 'right' else -angle
+
+    def switch_signal(self, row, phase: int):
+        """Switch a traffic signal to green or pedestrian walk, for its configured duration.
+
+        Args:
+            row: Traffic signal row.
+            phase: Phase to switch to.
+        """
+        self.phase[row] = phase
+        self.left_time[row] = self.durations[row, 0 if phase == _GREEN else 2]
+
+    def step(self, dt: float):
+        """Integrate all actors over one time step.
+
+        Args:
+            dt: Time step in seconds.
+        """
+        self.time += dt
+        self._step_vehicles(dt)
+        self._step_pedestrians(dt)
+        self._step_signals(dt)
+
+    def _step_vehicles(self, dt):
+        """Integrate the vehicles with a kinematic bicycle model."""
+        if not len(self.vehicle_names):
+            return
+        # Linear drag so that full throttle settles at max_speed
+        drag = self.max_acceleration / self.max_speed
+        acceleration = self.throttle * self.max_acceleration - self.brake * self.max_deceleration - drag * self.vspeed
+        self.vspeed[:] = np.clip(self.vspeed + acceleration * dt, 0.0, self.max_speed)
+
+        wheel_angle = np.radians(np.clip(self.steering, -1.0, 1.0) * self.max_wheel_angle)
+        yaw_rate = np.degrees(self.vspeed / self.wheelbase * np.tan(wheel_angle))
+
+        # U-turns are scripted: turn left at a fixed rate and low speed until 180 degrees are done
+        turning = self.u_turn > 0
+        if turning.any():
+            yaw_rate[turning] = -self.u_turn_rate
+            self.vspeed[turning] = np.minimum(self.vspeed[turning], self.u_turn_speed)
+            self.u_turn[turning] = np.maximum(self.u_turn[turning] - self.u_turn_rate * dt, 0.0)
+
+        self.vyaw[:] = _wrap_degrees(self.vyaw + yaw_rate * dt)
+        heading = np.radians(self.vyaw)
+        self.vx += self.vspeed * np.cos(heading) * dt
+        self.vy += self.vspeed * np.sin(heading) * dt
+
+    def _step_pedestrians(self, dt):
+        """Integrate the pedestrians with a unicycle model."""
+        if not len(self.pedestrian_names):
+            return
+        rotation = np.clip(self.turn, -self.pedestrian_turn_rate * dt, self.pedestrian_turn_rate * dt)
+        self.pyaw[:] = _wrap_degrees(self.pyaw + rotation)
+        self.turn -= rotation
+
+        speed = np.where(self.moving, self.pspeed, 0.0)
+        heading = np.radians(self.pyaw)
+        self.px += speed * np.cos(heading) * dt
+        self.py += speed * np.sin(heading) * dt
+
+    def _step_signals(self, dt):
+        """Run the traffic signal timers: green to yellow to red, and walk to red."""
+        if not len(self.signal_names):
+            return
+        timed = self.phase != _RED
+        self.left_time[timed] -= dt
+        expired = timed & (self.left_time <= 0)
+        to_yellow = expired & (self.phase == _GREEN)
+        self.phase[expired] = _RED
+        self.left_time[expired] = 0.0
+        self.phase[to_yellow] = _YELLOW
+        self.left_time[to_yellow] = self.durations[to_yellow, 1]
+
+    def snapshot(self, tick_id: int = 0):
+        """Build a world snapshot of the current state.
+
+        Args:
+            tick_id: Identifier of the simulation tick.
+
+        Returns:
+            WorldSnapshot: Snapshot in the same form as one decoded from UE.
+        """
+        vehicles = dict(zip(self.vehicle_names, zip(self.vx.tolist(), self.vy.tolist(),
+                                                    [0.0] * len(self.vehicle_names), self.vyaw.tolist())))
+        pedestrians = dict(zip(self.pedestrian_names, zip(self.px.tolist(), self.py.tolist(),
+                                                          [110.0] * len(self.pedestrian_names), self.pyaw.tolist())))
+        light_states = dict(zip(self.signal_names, zip((self.phase == _GREEN).tolist(), (self.phase == _WALK).tolist(),
+                                                       np.maximum(self.left_time, 0.0).tolist())))
+        transforms = {'vehicle': vehicles, 'pedestrian': pedestrians, 'humanoid': {}, 'scooter': {}}
+        return WorldSnapshot(transforms, light_states, tick_id)
+
+
+class KinematicCommunicator(Communicator):
+    """Communicator that simulates the traffic actors instead of driving UE.
+
+    It implements the methods used by ``VehicleManager``, ``PedestrianManager``,
+    ``IntersectionManager`` and ``TrafficController``. The world advances by ``dt``
+    on every ``next_tick``, and the state queries (``get_world_snapshot``,
+    ``get_position_and_direction``) read the simulated state. Methods that need UE,
+    such as camera captures or humanoid agents, are not available.
+    """
+
+    def __init__(self, dt: float = 0.1, world: KinematicWorld = None):
+        """Initialize the communicator.
+
+        Args:
+            dt: Simulated seconds per tick.
+            world: Kinematic world to use, e.g. one with custom vehicle dynamics.
+                Defaults to a new world with the default parameters.
+        """
+        super().__init__(None)
+        self.dt = dt
+        self.world = world if world is not None else KinematicWorld()
+
+    ##############################################################
+    # Simulation
+    ##############################################################
+
+    def next_tick(self):
+        """Integrate the world over one time step.
+
+        Returns:
+            int: The new tick ID.
+        """
+        self.world.step(self.dt)
+        self.tick_id += 1
+        return self.tick_id
+
+    def get_world_snapshot(self, refresh=False):
+        """Get the simulated state of all actors.
+
+        Args:
+            refresh: Whether to rebuild the snapshot even if one exists for this tick.
+
+        Returns:
+            WorldSnapshot: The snapshot of the current tick.
+        """
+        snapshot = self._snapshot
+        if refresh or snapshot is None or snapshot.tick_id != self.tick_id:
+            snapshot = self.world.snapshot(self.tick_id)
+            self._snapshot = snapshot
+        return snapshot
+
+    def clean_traffic_only(self, vehicles, pedestrians, traffic_signals, wait=True):
+        """Remove all simulated actors.
+
+        Args:
+            vehicles: List of vehicles.
+            pedestrians: List of pedestrians.
+            traffic_signals: List of traffic signals.
+            wait: Unused, kept for compatibility with ``Communicator``.
+        """
+        self.world.clear()
+        self._snapshot = None
+
+    def disconnect(self):
+        """Release the resources of the communicator. There is no connection to close."""
+        self.stop_state_subscriber()
+        self.world.clear()
+
+    ##############################################################
+    # Spawning
+    ##############################################################
+
+    def spawn_vehicles(self, vehicles):
+        """Add vehicles to the simulated world.
+
+        Args:
+            vehicles: List of vehicle objects.
+
+        Returns:
+            dict: Empty, spawning cannot fail.
+        """
+        self.world.add_vehicles([self.get_vehicle_name(vehicle.id) for vehicle in vehicles],
+                                [vehicle.position.x for vehicle in vehicles], [vehicle.position.y for vehicle in vehicles],
+                                [_yaw_of(vehicle.direction) for vehicle in vehicles], [vehicle.length for vehicle in vehicles])
+        return {}
+
+    def spawn_pedestrians(self, pedestrians, model_path=None):
+        """Add pedestrians to the simulated world.
+
+        Args:
+            pedestrians: List of pedestrian objects.
+            model_path: Unused, kept for compatibility with ``Communicator``.
+
+        Returns:
+            dict: Empty, spawning cannot fail.
+        """
+        self.world.add_pedestrians([self.get_pedestrian_name(pedestrian.id) for pedestrian in pedestrians],
+                                   [pedestrian.position.x for pedestrian in pedestrians],
+                                   [pedestrian.position.y for pedestrian in pedestrians],
+                                   [_yaw_of(pedestrian.direction) for pedestrian in pedestrians],
+                                   [pedestrian.speed for pedestrian in pedestrians])
+        return {}
+
+    def spawn_traffic_signals(self, traffic_signals, traffic_light_model_path=None, pedestrian_light_model_path=None):
+        """Add traffic signals to the simulated world.
+
+        Args:
+            traffic_signals: List of traffic signal objects.
+            traffic_light_model_path: Unused, kept for compatibility with ``Communicator``.
+            pedestrian_light_model_path: Unused, kept for compatibility with ``Communicator``.
+
+        Returns:
+            dict: Empty, spawning cannot fail.
+        """
+        self.world.add_signals([self.get_traffic_signal_name(traffic_signal.id) for traffic_signal in traffic_signals])
+        return {}
+
+    ##############################################################
+    # Vehicle-related methods
+    ##############################################################
+
+    def update_vehicle(self, vehicle_id, throttle, brake, steering):
+        """Update vehicle controls.
+
+        Args:
+            vehicle_id: Vehicle ID.
+            throttle: Throttle value.
+            brake: Brake value.
+            steering: Steering value.
+        """
+        self.world.set_vehicle_controls(self.world.vehicle_rows[self.get_vehicle_name(vehicle_id)],
+                                        (throttle, brake, steering))
+
+    def vehicle_make_u_turn(self, vehicle_id):
+        """Make vehicle perform a U-turn.
+
+        Args:
+            vehicle_id: Vehicle ID.
+        """
+        self.world.make_u_turn(self.world.vehicle_rows[self.get_vehicle_name(vehicle_id)])
+
+    def update_vehicles(self, states):
+        """Batch update multiple vehicle controls.
+
+        Args:
+            states: Dictionary mapping vehicle IDs to (throttle, brake, steering) tuples.
+        """
+        if not states:
+            return
+        rows = self.world.vehicle_rows
+        self.world.set_vehicle_controls([rows[self.get_vehicle_name(vehicle_id)] for vehicle_id in states],
+                                        list(states.values()))
+
+    ##############################################################
+    # Pedestrian-related methods
+    ##############################################################
+
+    def pedestrian_move_forward(self, pedestrian_id):
+        """Move pedestrian forward.
+
+        Args:
+            pedestrian_id: Pedestrian ID.
+        """
+        self.world.move_pedestrian(self.world.pedestrian_rows[self.get_pedestrian_name(pedestrian_id)], True)
+
+    def pedestrian_rotate(self, pedestrian_id, angle, direction):
+        """Rotate pedestrian.
+
+        Args:
+            pedestrian_id: Pedestrian ID.
+            angle: Rotation angle.
+            direction: Rotation direction, 'left' or 'right'.
+        """
+        self.world.rotate_pedestrian(self.world.pedestrian_rows[self.get_pedestrian_name(pedestrian_id)], angle, direction)
+
+    def pedestrian_stop(self, pedestrian_id):
+        """Stop pedestrian movement.
+
+        Args:
+            pedestrian_id: Pedestrian ID.
+        """
+        self.world.move_pedestrian(self.world.pedestrian_rows[self.get_pedestrian_name(pedestrian_id)], False)
+
+    def set_pedestrian_speed(self, pedestrian_id, speed):
+        """Set pedestrian speed.
+
+        Args:
+            pedestrian_id: Pedestrian ID.
+            speed: Pedestrian speed.
+        """
+        self.world.pspeed[self.world.pedestrian_rows[self.get_pedestrian_name(pedestrian_id)]] = speed
+
+    ##############################################################
+    # Traffic signal related methods
+    ##############################################################
+
+    def traffic_signal_switch_to(self, traffic_signal_id, state='green'):
+        """Switch traffic signal state.
+
+        Args:
+            traffic_signal_id: Traffic signal ID.
+            state: Target state, possible values: 'green' or 'pedestrian walk'.
+        """
+        row = self.world.signal_rows[self.get_traffic_signal_name(traffic_signal_id)]
+        if state == 'green':
+            self.world.switch_signal(row, _GREEN)
+        elif state == 'pedestrian walk':
+            self.world.switch_signal(row, _WALK)
+
+    def traffic_signal_set_duration(self, traffic_signal_id, green_duration, yellow_duration, pedestrian_green_duration):
+        """Set traffic signal duration.
+
+        Args:
+            traffic_signal_id: Traffic signal ID.
+            green_duration: Green duration.
+            yellow_duration: Yellow duration.
+            pedestrian_green_duration: Pedestrian green duration.
+        """
+        row = self.world.signal_rows[self.get_traffic_signal_name(traffic_signal_id)]
+        self.world.durations[row] = (green_duration, yellow_duration, pedestrian_green_duration)
@@ -0,0 +1,522 @@
+"""Mock UnrealCV server module.
+
+This module provides a local stand-in for the UnrealCV plugin of a SimWorld UE
+binary. It speaks the UnrealCV wire protocol and implements the ``vset``, ``vget``,
+``vbp`` and ``vrun`` commands used by the UnrealCV client, keeping a simple world
+state (objects, cameras, UE manager) in memory, so that the Python stack can be
+run, benchmarked and load-tested without Unreal Engine.
+
+Example:
+    Start a server from the command line::
+
+        python -m simworld.communicator.mock_server --port 9000 --latency 0.002
+
+    or from Python::
+
+        with MockUnrealCVServer(port=9000) as server:
+            communicator = Communicator(UnrealCV(port=server.port, ip='127.0.0.1'))
+"""
+import argparse
+import json
+import re
+import socketserver
+import struct
+import threading
+import time
+from io import BytesIO
+
+import cv2
+import numpy as np
+
+from simworld.utils.logger import Logger
+
+# Message framing used by UnrealCV: uint32 magic, uint32 payload size, payload
+MAGIC = 0x9E2B83C1
+HEADER = struct.Struct('<II')
+
+# Command templates reported by 'vget /unrealcv/commands'
+COMMANDS = [
+    'vget /unrealcv/commands',
+    'vget /unrealcv/status',
+    'vget /objects',
+    'vget /cameras',
+    'vget /object/[str]/location',
+    'vget /object/[str]/rotation',
+    'vget /camera/[uint]/location',
+    'vget /camera/[uint]/rotation',
+    'vget /camera/[uint]/fov',
+    'vget /camera/[uint]/size',
+    'vget /camera/[uint]/[str] [str]',
+    'vset /objects/spawn [str] [str]',
+    'vset /objects/spawn_bp_asset [str] [str]',
+    'vset /object/[str]/location [float] [float] [float]',
+    'vset /object/[str]/rotation [float] [float] [float]',
+    'vset /object/[str]/scale [float] [float] [float]',
+    'vset /object/[str]/color [uint] [uint] [uint]',
+    'vset /object/[str]/collision [str]',
+    'vset /object/[str]/physics [str]',
+    'vset /object/[str]/object_mobility [str]',
+    'vset /object/[str]/name [str]',
+    'vset /object/[str]/destroy',
+    'vset /object/[str]/hide',
+    'vset /object/[str]/show',
+    'vset /camera/[uint]/location [float] [float] [float]',
+    'vset /camera/[uint]/rotation [float] [float] [float]',
+    'vset /camera/[uint]/fov [float]',
+    'vset /camera/[uint]/size [uint] [uint]',
+    'vset /action/[str]',
+    'vset /action/tick_intervel [float]',
+    'vset /action/set_fixed_frame_rate [uint]',
+    # Blueprint functions take up to three arguments
+    'vbp [str] [str]',
+    'vbp [str] [str] [str]',
+    'vbp [str] [str] [str] [str]',
+    'vbp [str] [str] [str] [str] [str]',
+    'vrun setres [str]',
+    'vrun Editor.AsyncSkinnedAssetCompilation [uint]',
+]
+
+# Name prefix of each actor kind -> key prefix in the GetInformation payload
+INFORMATION_PREFIXES = {
+    'GEN_BP_Vehicle_': 'V',
+    'GEN_BP_Pedestrian_': 'P',
+    'GEN_BP_Humanoid_': 'A',
+    'GEN_BP_Scooter_': 'S',
+}
+TRAFFIC_SIGNAL_PREFIX = 'GEN_BP_TrafficSignal_'
+
+_OBJECT_PATTERN = re.compile(r'^/object/([^/\s]+)/(\w+)$')
+_CAMERA_PATTERN = re.compile(r'^/camera/(\d+)/(\w+)$')
+
+
+class MockUnrealCVServer:
+    """In-memory UnrealCV server speaking the UnrealCV wire protocol.
+
+    Commands of one connection are answered in order, like the game thread of the
+    real server. Every command waits ``latency`` seconds, and camera captures wait
+    ``image_latency`` seconds on top of that.
+    """
+
+    def __init__(self, port: int = 9000, host: str = '127.0.0.1', latency: float = 0.0, image_latency: float = 0.0,
+                 image_size: tuple = (480, 640), num_cameras: int = 1, info_padding: int = 0, seed: int = 0):
+        """Initialize the server. Call ``start`` or ``serve_forever`` to accept connections.
+
+        Args:
+            port: Port to listen on. 0 picks a free port, available as ``port`` afterwards.
+            host: Address to listen on, defaults to 127.0.0.1.
+            latency: Seconds added to every command.
+            image_latency: Seconds added to every camera capture.
+            image_size: (height, width) of the images returned by camera captures.
+            num_cameras: Number of cameras in the scene.
+            info_padding: Number of padding bytes appended to ``GetInformation`` payloads,
+                to load-test large state transfers.
+            seed: Seed of the generated image content.
+        """
+        self.latency = latency
+        self.image_latency = image_latency
+        self.image_size = tuple(image_size)
+        self.info_padding = info_padding
+        self.logger = Logger.get_logger('MockUnrealCVServer')
+
+        self.lock = threading.Lock()
+        self.objects = {}  # {name: {'path', 'location', 'rotation', 'scale', 'color', 'collision', 'mobility'}}
+        self.cameras = {cam_id: self._new_camera() for cam_id in range(num_cameras)}
+        self.actor_states = {}  # {name: last state set through VSetState / PSetState / SetState}
+        self.request_count = 0
+
+        self._images = self._make_images(self.image_size, seed)
+        self._thread = None
+        self._server = socketserver.ThreadingTCPServer((host, port), self._make_handler(), bind_and_activate=False)
+        self._server.daemon_threads = True
+        self._server.allow_reuse_address = True
+        self._server.server_bind()
+        self._server.server_activate()
+        self.host, self.port = self._server.server_address[:2]
+
+    def __enter__(self):
+        """Start serving in a background thread.
+
+        Returns:
+            MockUnrealCVServer: The started server.
+        """
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop serving and close the listening socket."""
+        self.stop()
+
+    ##############################################################
+    # Server lifecycle
+    ##############################################################
+    def start(self):
+        """Start serving in a background thread.
+
+        Returns:
+            MockUnrealCVServer: The started server.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name='MockUnrealCVServer', daemon=True)
+        self._thread.start()
+        self.logger.info(f'Mock UnrealCV server listening on {self.host}:{self.port}')
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until ``stop`` is called."""
+        self.logger.info(f'Mock UnrealCV server listening on {self.host}:{self.port}')
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def _make_handler(self):
+        """Build the request handler class bound to this server.
+
+        Returns:
+            type: StreamRequestHandler subclass serving one connection.
+        """
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                server._send(self.wfile, b'connected to SimWorld mock UnrealCV server')
+                while True:
+                    header = self.rfile.read(HEADER.size)
+                    if len(header) < HEADER.size:
+                        return
+                    magic, size = HEADER.unpack(header)
+                    if magic != MAGIC:
+                        server.logger.error(f'Closing connection, unexpected magic number {magic:#x}')
+                        return
+                    payload = self.rfile.read(size)
+                    message_id, _, cmd = payload.partition(b':')
+                    response = server.handle_command(cmd.decode('utf-8'))
+                    if isinstance(response, str):
+                        response = response.encode('utf-8')
+                    server._send(self.wfile, message_id + b':' + response)
+
+        return Handler
+
+    @staticmethod
+    def _send(wfile, payload):
+        """Write one framed payload.
+
+        Args:
+            wfile: Writable file of the connection.
+            payload: Payload bytes.
+        """
+        wfile.write(HEADER.pack(MAGIC, len(payload)) + payload)
+        wfile.flush()
+
+    ##############################################################
+    # Command dispatch
+    ##############################################################
+    def handle_command(self, cmd):
+        """Execute one command against the in-memory world.
+
+        Args:
+            cmd: Command string, e.g. ``'vget /object/GEN_BP_Vehicle_0/location'``.
+
+        Returns:
+            str or bytes: Response payload. Failed commands return a string starting with 'error'.
+        """
+        if self.latency > 0:
+            time.sleep(self.latency)
+        verb, _, rest = cmd.strip().partition(' ')
+        with self.lock:
+            self.request_count += 1
+        try:
+            if verb == 'vget':
+                return self._vget(rest)
+            if verb == 'vset':
+                return self._vset(rest)
+            if verb == 'vbp':
+                return self._vbp(rest)
+            if verb == 'vrun':
+                return 'ok'
+        except (IndexError, KeyError, ValueError) as e:
+            return f'error {type(e).__name__}: {e}'
+        return f'error Can not parse command {cmd}'
+
+    def _vget(self, rest):
+        """Handle a ``vget`` command."""
+        path, _, args = rest.partition(' ')
+        if path == '/unrealcv/commands':
+            return '\n'.join(COMMANDS)
+        if path == '/unrealcv/status':
+            return 'Is Listening\nClient Connected'
+        if path == '/objects':
+            with self.lock:
+                return ' '.join(self.objects)
+        if path == '/cameras':
+            with self.lock:
+                return ' '.join(f'Camera_{cam_id}' for cam_id in self.cameras)
+
+        match = _OBJECT_PATTERN.match(path)
+        if match:
+            name, attribute = match.groups()
+            with self.lock:
+                obj = self.objects.get(name)
+                if obj is None:
+                    return f'error Can not find object {name}'
+                if attribute in ('location', 'rotation', 'scale'):
+                    return self._format_vector(obj[attribute])
+                if attribute == 'color':
+                    return ' '.join(str(int(c)) for c in obj['color'])
+            return f'error Unknown object attribute {attribute}'
+
+        match = _CAMERA_PATTERN.match(path)
+        if match:
+            cam_id, attribute = int(match.group(1)), match.group(2)
+            with self.lock:
+                camera = self.cameras.get(cam_id)
+                if camera is None:
+                    return f'error Camera {cam_id} can not be found'
+                if attribute in ('location', 'rotation'):
+                    return self._format_vector(camera[attribute])
+                if attribute == 'fov':
+                    return f'{camera["fov"]:.3f}'
+                if attribute == 'size':
+                    return f'{camera["size"][0]} {camera["size"][1]}'
+            return self._capture(attribute, args)
+        return f'error Can not parse command vget {rest}'
+
+    def _vset(self, rest):
+        """Handle a ``vset`` command."""
+        path, _, args = rest.partition(' ')
+        args = args.split()
+        if path in ('/objects/spawn', '/objects/spawn_bp_asset'):
+            asset_path, name = args[0], args[1]
+            with self.lock:
+                self.objects[name] = {
+                    'path': asset_path,
+                    'location': [0.0, 0.0, 0.0],
+                    'rotation': [0.0, 0.0, 0.0],
+                    'scale': [1.0, 1.0, 1.0],
+                    'color': [0, 0, 0],
+                    'collision': True,
+                    'physics': False,
+                    'mobility': True,
+                    'hidden': False,
+                }
+            return name
+        if path.startswith('/action/'):
+            return 'ok'
+
+        match = _OBJECT_PATTERN.match(path)
+        if match:
+            name, attribute = match.groups()
+            with self.lock:
+                obj = self.objects.get(name)
+                if obj is None:
+                    return f'error Can not find object {name}'
+                if attribute in ('location', 'rotation', 'scale'):
+                    obj[attribute] = [float(v) for v in args[:3]]
+                elif attribute == 'color':
+                    obj['color'] = [int(v) for v in args[:3]]
+                elif attribute in ('collision', 'physics'):
+                    obj[attribute] = self._parse_bool(args[0])
+                elif attribute == 'object_mobility':
+                    obj['mobility'] = self._parse_bool(args[0])
+                elif attribute == 'name':
+                    self.objects[args[0]] = self.objects.pop(name)
+                elif attribute in ('hide', 'show'):
+                    obj['hidden'] = attribute == 'hide'
+                elif attribute == 'destroy':
+                    del self.objects[name]
+                    self.actor_states.pop(name, None)
+                else:
+                    return f'error Unknown object attribute {attribute}'
+            return 'ok'
+
+        match = _CAMERA_PATTERN.match(path)
+        if match:
+            cam_id, attribute = int(match.group(1)), match.group(2)
+            with self.lock:
+                camera = self.cameras.setdefault(cam_id, self._new_camera())
+                if attribute in ('location', 'rotation'):
+                    camera[attribute] = [float(v) for v in args[:3]]
+                elif attribute == 'fov':
+                    camera['fov'] = float(args[0])
+                elif attribute == 'size':
+                    camera['size'] = [int(args[0]), int(args[1])]
+                else:
+                    return f'error Unknown camera attribute {attribute}'
+            return 'ok'
+        return f'error Can not parse command vset {rest}'
+
+    def _vbp(self, rest):
+        """Handle a ``vbp`` blueprint function call."""
+        parts = rest.split(' ', 2)
+        name, function = parts[0], parts[1]
+        args = parts[2] if len(parts) > 2 else ''
+
+        if function == 'GetInformation':
+            return self.get_information()
+        if function in ('VSetState', 'PSetState'):
+            with self.lock:
+                for state in filter(None, args.split(';')):
+                    actor_name, *values = state.split(',')
+                    self.actor_states[actor_name] = values
+            return '{}'
+        if function == 'GetCollisionNum':
+            return json.dumps({'HumanCollision': 0, 'ObjectCollision': 0, 'BuildingCollision': 0, 'VehicleCollision': 0})
+        if function == 'GetSunDirection':
+            return json.dumps({'rotation': 'P=-45.000000 Y=0.000000 R=0.000000'})
+        if function == 'GetSunIntensity':
+            return json.dumps({'SunIntensity': 10.0})
+        if function == 'GetFog':
+            return json.dumps({'FogDensity': 0.0, 'FogDistance': 0.0, 'FogFalloff': 0.0})
+        if function == 'GetAtmosphere':
+            return json.dumps({'Rayleigh Scattering Scale': 1.0, 'Mie Scattering Scale': 1.0})
+
+        with self.lock:
+            if name not in self.objects:
+                return f'error Can not find object {name}'
+            if args:
+                self.actor_states[name] = args.split()
+        return '{}'
+
+    ##############################################################
+    # Responses
+    ##############################################################
+    def get_information(self):
+        """Build the ``GetInformation`` payload of the UE manager from the current world.
+
+        Returns:
+            str: JSON payload in the format of the SimWorld UE manager.
+        """
+        locations = {prefix: [] for prefix in INFORMATION_PREFIXES.values()}
+        rotations = {prefix: [] for prefix in INFORMATION_PREFIXES.values()}
+        light_states = []
+        with self.lock:
+            for name, obj in self.objects.items():
+                if name.startswith(TRAFFIC_SIGNAL_PREFIX):
+                    light_states.append(f'{name}truefalse10.000000')
+                    continue
+                for name_prefix, key_prefix in INFORMATION_PREFIXES.items():
+                    if name.startswith(name_prefix):
+                        x, y, z = obj['location']
+                        pitch, yaw, roll = obj['rotation']
+                        locations[key_prefix].append(f'{name}X={x:.3f} Y={y:.3f} Z={z:.3f}')
+                        rotations[key_prefix].append(f'{name}P={pitch:.6f} Y={yaw:.6f} R={roll:.6f}')
+                        break
+
+        info = {}
+        for key_prefix in INFORMATION_PREFIXES.values():
+            info[f'{key_prefix}Locations'] = ''.join(locations[key_prefix])
+            info[f'{key_prefix}Rotations'] = ''.join(rotations[key_prefix])
+        info['LStates'] = ''.join(light_states)
+        if self.info_padding > 0:
+            info['Padding'] = ' ' * self.info_padding
+        return json.dumps(info)
+
+    def _capture(self, viewmode, image_format):
+        """Return the image of a camera capture.
+
+        Args:
+            viewmode: View mode, e.g. 'lit', 'depth', 'object_mask'.
+            image_format: 'png', 'bmp', 'npy', or a file path to write a PNG to.
+
+        Returns:
+            bytes or str: Encoded image, or the file path for file captures.
+        """
+        if self.image_latency > 0:
+            time.sleep(self.image_latency)
+        if image_format in ('png', 'bmp', 'npy'):
+            return self._images[image_format]
+        if not image_format:
+            return 'error Missing image format'
+        # File capture: write the image and return the path
+        cv2.imwrite(image_format, self._images['rgb'])
+        return image_format
+
+    @staticmethod
+    def _make_images(image_size, seed):
+        """Encode the images returned by camera captures once.
+
+        Args:
+            image_size: (height, width) of the images.
+            seed: Seed of the generated image content.
+
+        Returns:
+            dict: Raw RGB image and its 'png', 'bmp' and 'npy' encodings.
+        """
+        height, width = image_size
+        rng = np.random.default_rng(seed)
+        rgb = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+        rgba = np.concatenate([rgb, np.full((height, width, 1), 255, dtype=np.uint8)], axis=2)
+        depth = rng.uniform(100.0, 10000.0, size=(height, width)).astype(np.float32)
+
+        npy = BytesIO()
+        np.save(npy, depth)
+        return {
+            'rgb': rgb,
+            # UnrealCV sends RGBA PNGs and BGR BMPs
+            'png': cv2.imencode('.png', cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGRA))[1].tobytes(),
+            'bmp': cv2.imencode('.bmp', cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))[1].tobytes(),
+            'npy': npy.getvalue(),
+        }
+
+    @staticmethod
+    def _new_camera():
+        """Create the state of a camera.
+
+        Returns:
+            dict: Camera location, rotation, fov and size.
+        """
+        return {'location': [0.0, 0.0, 0.0], 'rotation': [0.0, 0.0, 0.0], 'fov': 90.0, 'size': [640, 480]}
+
+    @staticmethod
+    def _format_vector(values):
+        """Format a vector the way UnrealCV does.
+
+        Args:
+            values: Sequence of numbers.
+
+        Returns:
+            str: Space separated values.
+        """
+        return ' '.join(f'{v:.3f}' for v in values)
+
+    @staticmethod
+    def _parse_bool(value):
+        """Parse a boolean command argument.
+
+        Args:
+            value: Argument string, e.g. 'True', 'false', '1'.
+
+        Returns:
+            bool: Parsed value.
+        """
+        return value.strip().lower() in ('true', '1')
+
+
+def main():
+    """Run the mock UnrealCV server from the command line."""
+    parser = argparse.ArgumentParser(description='Mock UnrealCV server for running SimWorld without Unreal Engine')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=9000, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every command')
+    parser.add_argument('--image-latency', type=float, default=0.0, help='Seconds added to every camera capture')
+    parser.add_argument('--image-size', type=int, nargs=2, default=(480, 640), metavar=('HEIGHT', 'WIDTH'),
+                        help='Size of the images returned by camera captures')
+    parser.add_argument('--num-cameras', type=int, default=1, help='Number of cameras in the scene')
+    parser.add_argument('--info-padding', type=int, default=0, help='Padding bytes appended to GetInformation payloads')
+    args = parser.parse_args()
+
+    server = MockUnrealCVServer(args.port, args.host, args.latency, args.image_latency, args.image_size,
+                                args.num_cameras, args.info_padding)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+"""UnrealCV request profiling module.
+
+This module collects per-command latency histograms, payload sizes and the split
+between time spent waiting for the client lock and time spent on the socket, so
+that the UE commands dominating wall time can be identified. Results can be
+printed as a summary table or dumped as a Chrome trace (``chrome://tracing`` or
+Perfetto).
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Upper edges of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float('inf'))
+
+# Per-message framing overhead of the UnrealCV protocol: magic, size and 'id:' prefix
+_FRAME_OVERHEAD = 8
+_CAMERA_ATTRIBUTES = ('location', 'rotation', 'fov', 'size')
+_NAME_SEGMENTS = ('object', 'camera')
+
+
+def command_verb(cmd: str):
+    """Reduce a command to its verb, dropping actor names, IDs and arguments.
+
+    Args:
+        cmd: Command string, e.g. ``'vget /camera/3/lit png'``.
+
+    Returns:
+        str: Command verb, e.g. ``'vget /camera/*/lit png'``, ``'vbp GetInformation'`` or
+        ``'vset /object/*/location'``.
+    """
+    parts = cmd.split()
+    if not parts:
+        return ''
+    if parts[0] == 'vbp':
+        return f'vbp {parts[2]}' if len(parts) > 2 else 'vbp'
+    if parts[0] == 'vrun':
+        return f'vrun {parts[1]}' if len(parts) > 1 else 'vrun'
+    if len(parts) < 2:
+        return parts[0]
+
+    segments = parts[1].split('/')
+    for i in range(len(segments) - 1):
+        if segments[i] in _NAME_SEGMENTS:
+            segments[i + 1] = '*'
+    verb = f'{parts[0]} {"/".join(segments)}'
+    # Camera captures: keep the image format, since png/bmp/npy differ in cost
+    if parts[0] == 'vget' and len(segments) == 4 and segments[1] == 'camera' and segments[3] not in _CAMERA_ATTRIBUTES:
+        image_format = parts[2] if len(parts) > 2 else ''
+        verb += f' {image_format if image_format in ("png", "bmp", "npy") else "file"}'
+    return verb
+
+
+def payload_size(payload):
+    """Get the size of a request or response payload in bytes.
+
+    Args:
+        payload: str, bytes or None.
+
+    Returns:
+        int: Size in bytes, including the message framing.
+    """
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return len(payload.encode('utf-8')) + _FRAME_OVERHEAD
+    return len(payload) + _FRAME_OVERHEAD
+
+
+class VerbStats:
+    """Accumulated statistics of one command verb."""
+
+    __slots__ = ('count', 'commands', 'total', 'min', 'max', 'lock_wait', 'socket', 'bytes_out', 'bytes_in',
+                 'histogram')
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.commands = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.lock_wait = 0.0
+        self.socket = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.histogram = [0] * len(LATENCY_BUCKETS_MS)
+
+    def add(self, lock_wait, socket_time, commands, bytes_out, bytes_in):
+        """Add one request.
+
+        Args:
+            lock_wait: Seconds spent waiting for the client lock.
+            socket_time: Seconds spent sending the request and receiving the response.
+            commands: Number of commands in the request.
+            bytes_out: Bytes sent.
+            bytes_in: Bytes received.
+        """
+        latency = lock_wait + socket_time
+        self.count += 1
+        self.commands += commands
+        self.total += latency
+        self.min = min(self.min, latency)
+        self.max = max(self.max, latency)
+        self.lock_wait += lock_wait
+        self.socket += socket_time
+        self.bytes_out += bytes_out
+        self.bytes_in += bytes_in
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency * 1000)] += 1
+
+    def percentile(self, q):
+        """Estimate a latency percentile from the histogram.
+
+        Args:
+            q: Percentile in [0, 100].
+
+        Returns:
+            float: Upper edge of the bucket containing the percentile, in seconds,
+            capped by the observed maximum.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for edge, n in zip(LATENCY_BUCKETS_MS, self.histogram):
+            seen += n
+            if seen >= rank:
+                return min(edge / 1000, self.max)
+        return self.max
+
+    def as_dict(self):
+        """Convert the statistics to a dictionary.
+
+        Returns:
+            dict: Counts, latencies in seconds, bytes and the histogram.
+        """
+        return {
+            'count': self.count,
+            'commands': self.commands,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'lock_wait': self.lock_wait,
+            'socket': self.socket,
+            'bytes_out': self.bytes_out,
+            'bytes_in': self.bytes_in,
+            'histogram': dict(zip([str(edge) for edge in LATENCY_BUCKETS_MS], self.histogram)),
+        }
+
+
+class RequestProfiler:
+    """Collector of UnrealCV request timings, grouped by command verb.
+
+    Example:
+        >>> profiler = unrealcv.enable_profiling()
+        >>> ...  # run the simulation
+        >>> print(profiler.format_summary())
+        >>> profiler.dump_chrome_trace('unrealcv_trace.json')
+    """
+
+    def __init__(self, max_events: int = 100000):
+        """Initialize the profiler.
+
+        Args:
+            max_events: Number of most recent requests kept for the Chrome trace.
+        """
+        self.lock = threading.Lock()
+        self.stats = {}  # {verb: VerbStats}
+        self.events = deque(maxlen=max_events)
+        self._start_time = time.perf_counter()
+
+    def reset(self):
+        """Clear all collected statistics and events."""
+        with self.lock:
+            self.stats.clear()
+            self.events.clear()
+            self._start_time = time.perf_counter()
+
+    def record(self, cmds, responses, start, acquired, end):
+        """Record one request.
+
+        Args:
+            cmds: List of commands sent in the request. Batches are grouped by their
+                first verb and the number of distinct verbs in them.
+            responses: List of responses, in the same order as ``cmds``.
+            start: ``time.perf_counter()`` before waiting for the client lock.
+            acquired: ``time.perf_counter()`` once the lock was acquired.
+            end: ``time.perf_counter()`` once the responses were received.
+        """
+        verbs = list(dict.fromkeys(command_verb(cmd) for cmd in cmds))
+        verb = verbs[0] if verbs else ''
+        if len(verbs) > 1:
+            verb += f' +{len(verbs) - 1} verbs'
+        if len(cmds) > 1:
+            verb = f'batch {verb}'
+        bytes_out = sum(payload_size(cmd) for cmd in cmds)
+        bytes_in = sum(payload_size(res) for res in responses) if responses is not None else 0
+        lock_wait, socket_time = acquired - start, end - acquired
+
+        with self.lock:
+            stats = self.stats.get(verb)
+            if stats is None:
+                stats = self.stats[verb] = VerbStats()
+            stats.add(lock_wait, socket_time, len(cmds), bytes_out, bytes_in)
+            self.events.append((verb, start, acquired, end, threading.get_ident(), len(cmds), bytes_out, bytes_in))
+
+    def summary(self):
+        """Get the statistics of every verb.
+
+        Returns:
+            dict: Mapping from verb to its statistics, sorted by total time, descending.
+        """
+        with self.lock:
+            items = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+            return {verb: stats.as_dict() for verb, stats in items}
+
+    def format_summary(self, top: int = None):
+        """Format the statistics as a table.
+
+        Args:
+            top: Number of verbs to show, by total time. Defaults to all.
+
+        Returns:
+            str: Summary table.
+        """
+        summary = list(self.summary().items())[:top]
+        grand_total = sum(stats['total'] for _, stats in summary) or 1.0
+        width = max([len(verb) for verb, _ in summary] + [4])
+        lines = [
+            f'{"verb":<{width}} {"count":>7} {"total s":>9} {"share":>6} {"mean ms":>8} {"p50 ms":>8} {"p95 ms":>8} '
+            f'{"max ms":>8} {"lock s":>8} {"socket s":>9} {"out KB":>9} {"in KB":>10}'
+        ]
+        for verb, stats in summary:
+            lines.append(
+                f'{verb:<{width}} {stats["count"]:>7} {stats["total"]:>9.3f} {stats["total"] / grand_total:>6.1%} '
+                f'{stats["mean"] * 1000:>8.2f} {stats["p50"] * 1000:>8.2f} {stats["p95"] * 1000:>8.2f} '
+                f'{stats["max"] * 1000:>8.2f} {stats["lock_wait"]:>8.3f} {stats["socket"]:>9.3f} '
+                f'{stats["bytes_out"] / 1024:>9.1f} {stats["bytes_in"] / 1024:>10.1f}'
+            )
+        return '\n'.join(lines)
+
+    def dump_summary(self, path: str):
+        """Write the statistics to a JSON file.
+
+        Args:
+            path: Output file path.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def dump_chrome_trace(self, path: str):
+        """Write the recorded requests as a Chrome trace.
+
+        Each request becomes a 'lock wait' slice followed by a slice named after its
+        verb, on the track of the thread that sent it.
+
+        Args:
+            path: Output file path, e.g. 'unrealcv_trace.json'.
+        """
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+            origin = self._start_time
+        trace = []
+        for verb, start, acquired, end, tid, commands, bytes_out, bytes_in in events:
+            if acquired > start:
+                trace.append({'name': 'lock wait', 'cat': 'lock', 'ph': 'X', 'pid': pid, 'tid': tid,
+                              'ts': (start - origin) * 1e6, 'dur': (acquired - start) * 1e6})
+            trace.append({'name': verb, 'cat': 'unrealcv', 'ph': 'X', 'pid': pid, 'tid': tid,
+                          'ts': (acquired - origin) * 1e6, 'dur': (end - acquired) * 1e6,
+                          'args': {'commands': commands, 'bytes_out': bytes_out, 'bytes_in': bytes_in}})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,391 @@
+"""UnrealCV session record and replay module.
+
+This module records the commands sent through an UnrealCV client together with
+the server responses and their latency, and serves them back later without Unreal
+Engine. A captured traffic or hide-and-seek session can then be re-run offline,
+either at full speed or with the recorded engine latency, to profile the Python side.
+
+Example:
+    Record a session::
+
+        unrealcv = UnrealCV(port=9000)
+        unrealcv.start_recording('session.ucvrec')
+        ...
+        unrealcv.stop_recording()
+
+    Replay it::
+
+        unrealcv = UnrealCV(client=ReplayClient('session.ucvrec', realtime=True))
+
+Session files hold data only, so that a shared recording is safe to open: a gzip
+stream of records, each a length-prefixed JSON object followed by the binary
+responses of the request as length-prefixed blobs.
+"""
+import gzip
+import json
+import struct
+import threading
+import time
+from collections import defaultdict, deque
+
+from simworld.utils.logger import Logger
+
+# Bumped when the record layout changes
+FORMAT_VERSION = 2
+SESSION_MAGIC = 'simworld-unrealcv-session'
+
+# Length prefix of the JSON object and of each binary response of a record
+LENGTH = struct.Struct('<I')
+
+
+def _write_record(f, record: dict, blobs=()):
+    """Write one record to a session stream.
+
+    Args:
+        f: Binary file object.
+        record: JSON-serializable record.
+        blobs: Binary payloads stored after the record.
+    """
+    data = json.dumps(record).encode('utf-8')
+    f.write(LENGTH.pack(len(data)) + data)
+    for blob in blobs:
+        f.write(LENGTH.pack(len(blob)) + blob)
+
+
+def _read_exactly(f, size: int):
+    """Read a number of bytes from a session stream.
+
+    Args:
+        f: Binary file object.
+        size: Number of bytes.
+
+    Returns:
+        bytes: The bytes read.
+
+    Raises:
+        EOFError: If the stream ends first.
+    """
+    data = f.read(size)
+    if len(data) < size:
+        raise EOFError('Session stream ended inside a record')
+    return data
+
+
+def _read_record(f):
+    """Read the JSON object of the next record from a session stream.
+
+    Args:
+        f: Binary file object.
+
+    Returns:
+        dict or None: The record, or None at the end of the stream.
+
+    Raises:
+        EOFError: If the stream ends inside the record.
+    """
+    prefix = f.read(LENGTH.size)
+    if not prefix:
+        return None
+    if len(prefix) < LENGTH.size:
+        raise EOFError('Session stream ended inside a record')
+    (size,) = LENGTH.unpack(prefix)
+    return json.loads(_read_exactly(f, size).decode('utf-8'))
+
+
+class SessionRecorder:
+    """Writer of a recorded UnrealCV session.
+
+    Records are appended to a gzip-compressed stream as they happen, so a session
+    interrupted by a crash is still readable up to that point. One recorder can be
+    shared by several wrapped clients.
+    """
+
+    def __init__(self, path: str):
+        """Open the session file.
+
+        Args:
+            path: Path of the session file to write.
+        """
+        self.path = path
+        self.logger = Logger.get_logger('SessionRecorder')
+        self.lock = threading.Lock()
+        self.record_count = 0
+        self._file = gzip.open(path, 'wb')
+        self._start_time = time.perf_counter()
+        _write_record(self._file, {'format': SESSION_MAGIC, 'version': FORMAT_VERSION, 'created': time.time()})
+
+    def wrap(self, client):
+        """Wrap an UnrealCV client so that its requests are recorded.
+
+        Args:
+            client: Client with ``request`` and ``request_batch`` methods, e.g. ``unrealcv.Client``.
+
+        Returns:
+            RecordingClient: Recording proxy of the client.
+        """
+        return RecordingClient(client, self)
+
+    def record(self, cmds, responses, start, duration):
+        """Append one request to the session.
+
+        Args:
+            cmds: Tuple of commands, one element for a single request.
+            responses: Tuple of responses, in the same order as ``cmds``. Empty for a
+                request sent without waiting for responses.
+            start: ``time.perf_counter()`` when the request was sent.
+            duration: Seconds until the responses were received, or until the request
+                was sent if it has no responses.
+        """
+        binary = [i for i, res in enumerate(responses) if isinstance(res, (bytes, bytearray))]
+        record = {
+            'start': start - self._start_time,
+            'duration': duration,
+            'cmds': list(cmds),
+            'responses': [None if i in binary else res for i, res in enumerate(responses)],
+            'binary': binary,
+        }
+        blobs = [bytes(responses[i]) for i in binary]
+        with self.lock:
+            if self._file is None:
+                return
+            _write_record(self._file, record, blobs)
+            self.record_count += 1
+
+    def close(self):
+        """Flush and close the session file."""
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self.logger.info(f'Recorded {self.record_count} requests to {self.path}')
+
+
+class RecordingClient:
+    """Proxy of an UnrealCV client that records every request to a SessionRecorder."""
+
+    def __init__(self, client, recorder: SessionRecorder):
+        """Initialize the proxy.
+
+        Args:
+            client: Wrapped client.
+            recorder: Recorder receiving the requests.
+        """
+        self.client = client
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        """Forward everything else (connect, disconnect, isconnected, ...) to the wrapped client."""
+        return getattr(self.client, name)
+
+    def request(self, cmd, timeout=5):
+        """Send a request and record it.
+
+        Args:
+            cmd: Command string.
+            timeout: Timeout in seconds. A negative timeout sends the command
+                asynchronously, which is recorded without a response.
+
+        Returns:
+            str or bytes: Server response.
+        """
+        start = time.perf_counter()
+        res = self.client.request(cmd, timeout)
+        self.recorder.record((cmd,), (res,) if timeout >= 0 else (), start, time.perf_counter() - start)
+        return res
+
+    def request_batch(self, cmds):
+        """Send a batch request and record it.
+
+        Args:
+            cmds: List of command strings.
+
+        Returns:
+            list: List of server responses.
+        """
+        start = time.perf_counter()
+        res = self.client.request_batch(cmds)
+        self.recorder.record(tuple(cmds), tuple(res), start, time.perf_counter() - start)
+        return res
+
+    def request_batch_async(self, cmds):
+        """Send a batch request without waiting and record it without responses.
+
+        Args:
+            cmds: List of command strings.
+        """
+        start = time.perf_counter()
+        res = self.client.request_batch_async(cmds)
+        self.recorder.record(tuple(cmds), (), start, time.perf_counter() - start)
+        return res
+
+
+def load_session(path: str):
+    """Read all records of a session file.
+
+    Args:
+        path: Path of the session file.
+
+    Returns:
+        list: (start_offset, duration, cmds, responses) tuples in recording order,
+        with empty responses for requests sent without waiting.
+
+    Raises:
+        ValueError: If the file is not a recorded UnrealCV session.
+    """
+    records = []
+    with gzip.open(path, 'rb') as f:
+        try:
+            header = _read_record(f)
+        except (EOFError, OSError, ValueError):
+            header = None
+        if not (isinstance(header, dict) and header.get('format') == SESSION_MAGIC):
+            raise ValueError(f'{path} is not a recorded UnrealCV session')
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f'Unsupported session format version {header.get("version")} in {path}')
+        while True:
+            try:
+                record = _read_record(f)
+                if record is None:
+                    break
+                responses = record['responses']
+                for i in record['binary']:
+                    (size,) = LENGTH.unpack(_read_exactly(f, LENGTH.size))
+                    responses[i] = _read_exactly(f, size)
+            except (EOFError, gzip.BadGzipFile, ValueError):
+                # Truncated tail of an interrupted recording
+                break
+            records.append((record['start'], record['duration'], tuple(record['cmds']), tuple(responses)))
+    return records
+
+
+class ReplayClient:
+    """Client serving the responses of a recorded session instead of Unreal Engine.
+
+    Responses are looked up per command and handed out in recording order, so
+    requests issued from several threads still receive the responses recorded for
+    them even if they interleave differently than during recording. Commands with no
+    recorded response left get the last response recorded for them, or an error.
+    Requests sent without waiting have no responses, but still take their recorded
+    time when replaying in real time.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        """Load a session.
+
+        Args:
+            path: Path of the session file.
+            realtime: Whether to wait the recorded latency of each request before
+                returning, instead of answering at full speed.
+        """
+        self.path = path
+        self.realtime = realtime
+        self.logger = Logger.get_logger('ReplayClient')
+        self.lock = threading.Lock()
+        self.miss_count = 0
+
+        self._responses = defaultdict(deque)  # {cmd: deque of responses}
+        self._durations = defaultdict(deque)  # {cmds tuple: deque of durations}
+        self._async_durations = defaultdict(deque)  # same, for requests sent without waiting
+        self._last_responses = {}
+        records = load_session(path)
+        for _, duration, cmds, responses in records:
+            if not responses:
+                self._async_durations[cmds].append(duration)
+                continue
+            self._durations[cmds].append(duration)
+            for cmd, res in zip(cmds, responses):
+                self._responses[cmd].append(res)
+        self._connected = False
+        self.logger.info(f'Loaded {len(records)} recorded requests from {path}')
+
+    def connect(self, timeout=1):
+        """Pretend to connect."""
+        self._connected = True
+
+    def disconnect(self):
+        """Pretend to disconnect."""
+        self._connected = False
+
+    def isconnected(self):
+        """Check whether the client is connected.
+
+        Returns:
+            bool: True if connected.
+        """
+        return self._connected
+
+    def request(self, cmd, timeout=5):
+        """Serve the recorded response of a command.
+
+        Args:
+            cmd: Command string.
+            timeout: Timeout in seconds. A negative timeout sends the command
+                asynchronously, which has no response, like ``unrealcv.Client``.
+
+        Returns:
+            str or bytes: Recorded response.
+        """
+        if timeout < 0:
+            return self._serve_async((cmd,))
+        return self._serve((cmd,))[0]
+
+    def request_batch(self, cmds):
+        """Serve the recorded responses of a batch request.
+
+        Args:
+            cmds: List of command strings.
+
+        Returns:
+            list: List of recorded responses.
+        """
+        return self._serve(tuple(cmds))
+
+    def request_batch_async(self, cmds):
+        """Accept a batch request sent without waiting, which has no responses.
+
+        Args:
+            cmds: List of command strings.
+        """
+        return self._serve_async(tuple(cmds))
+
+    def _serve_async(self, cmds):
+        """Optionally wait the recorded send time of a request without responses.
+
+        Args:
+            cmds: Tuple of commands.
+        """
+        with self.lock:
+            durations = self._async_durations.get(cmds)
+            duration = durations.popleft() if durations else 0.0
+        if self.realtime and duration > 0:
+            time.sleep(duration)
+        return None
+
+    def _serve(self, cmds):
+        """Look up the responses of a request and optionally wait the recorded latency.
+
+        Args:
+            cmds: Tuple of commands.
+
+        Returns:
+            list: Responses, in the same order as ``cmds``.
+        """
+        responses = []
+        with self.lock:
+            durations = self._durations.get(cmds)
+            duration = durations.popleft() if durations else 0.0
+            for cmd in cmds:
+                queue = self._responses.get(cmd)
+                if queue:
+                    res = queue.popleft()
+                    self._last_responses[cmd] = res
+                elif cmd in self._last_responses:
+                    res = self._last_responses[cmd]
+                else:
+                    self.miss_count += 1
+                    self.logger.warning(f'No recorded response for command: {cmd}')
+                    res = f'error No recorded response for command {cmd}'
+                responses.append(res)
+        if self.realtime and duration > 0:
+            time.sleep(duration)
+        return responses
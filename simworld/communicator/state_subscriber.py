@@ -0,0 +1,160 @@
+"""State subscriber module for polling the world state in the background.
+
+This module polls the UE manager and the humanoid agents at a fixed rate on a
+background thread and publishes each result as an immutable ``WorldSnapshot``.
+Readers such as the traffic controller, planners, environments and recorders take
+the latest snapshot without a round trip to UE and without locking.
+"""
+import threading
+import time
+
+from simworld.communicator.world_snapshot import PAYLOAD_KEYS, WorldSnapshot
+from simworld.utils.logger import Logger
+
+
+class StateSubscriber:
+    """Background poller publishing world snapshots.
+
+    Every poll sends ``GetInformation`` and the location and rotation queries of the
+    known humanoids in one batch request, decodes them into a new snapshot and then
+    swaps it in as the latest one. A published snapshot is never modified, so a reader
+    keeps a consistent view for as long as it holds on to it while the next one is
+    being built.
+    """
+
+    def __init__(self, communicator, rate: float = 20.0, stale_after: float = None):
+        """Initialize the subscriber.
+
+        Args:
+            communicator: Communicator whose UE manager and humanoids are polled.
+            rate: Number of polls per second.
+            stale_after: Age in seconds after which the latest snapshot is considered
+                stale, e.g. because polling failed. Defaults to three poll periods.
+        """
+        self.communicator = communicator
+        self.period = 1.0 / rate
+        self.stale_after = stale_after if stale_after is not None else 3 * self.period
+        self.logger = Logger.get_logger('StateSubscriber')
+
+        self.poll_count = 0
+        self.error_count = 0
+        self._snapshot = None
+        self._updated = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def snapshot(self):
+        """Get the latest published snapshot without locking.
+
+        Returns:
+            WorldSnapshot or None: The latest snapshot, or None before the first poll.
+        """
+        return self._snapshot
+
+    @property
+    def is_running(self):
+        """Check whether the polling thread is running.
+
+        Returns:
+            bool: True if the polling thread is alive.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_stale(self):
+        """Check whether the latest snapshot is missing or older than ``stale_after``.
+
+        Returns:
+            bool: True if the latest snapshot should not be used.
+        """
+        snapshot = self._snapshot
+        return snapshot is None or snapshot.age > self.stale_after
+
+    def start(self):
+        """Start polling in a background thread."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name='StateSubscriber', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        """Stop polling and wait for the polling thread to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait for the thread.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_for_snapshot(self, newer_than: WorldSnapshot = None, timeout: float = None):
+        """Wait until a snapshot newer than a given one is published.
+
+        Args:
+            newer_than: Snapshot the result has to be newer than. If None, any
+                published snapshot is returned.
+            timeout: Maximum number of seconds to wait.
+
+        Returns:
+            WorldSnapshot or None: The latest snapshot, or None on timeout.
+        """
+        with self._updated:
+            if not self._updated.wait_for(lambda: self._snapshot is not None and self._snapshot is not newer_than,
+                                          timeout):
+                return None
+            return self._snapshot
+
+    def poll(self):
+        """Query UE once and publish the result as the latest snapshot.
+
+        Returns:
+            WorldSnapshot: The published snapshot.
+        """
+        communicator = self.communicator
+        tick_id = communicator.tick_id
+        humanoid_names = list(communicator.humanoid_id_to_name.values())
+        cmds = [f'vbp {communicator.ue_manager_name} GetInformation']
+        cmds.extend(f'vget /object/{name}/location' for name in humanoid_names)
+        cmds.extend(f'vget /object/{name}/rotation' for name in humanoid_names)
+        timestamp = time.time()
+        responses = communicator.unrealcv.request_batch(cmds)
+
+        snapshot = WorldSnapshot.from_payload(responses[0], tick_id=tick_id, timestamp=timestamp)
+        if humanoid_names:
+            humanoids = dict(snapshot.transforms.get('humanoid', {}))
+            count = len(humanoid_names)
+            for name, location, rotation in zip(humanoid_names, responses[1:1 + count], responses[1 + count:]):
+                try:
+                    x, y, z = (float(value) for value in location.split()[:3])
+                    _, yaw, _ = (float(value) for value in rotation.split()[:3])
+                except ValueError:
+                    continue
+                humanoids[name] = (x, y, z, yaw)
+            transforms = {kind: snapshot.transforms.get(kind, {}) for kind in PAYLOAD_KEYS}
+            transforms['humanoid'] = humanoids
+            snapshot = WorldSnapshot(transforms, snapshot.light_states, tick_id, timestamp)
+
+        with self._updated:
+            self._snapshot = snapshot
+            self.poll_count += 1
+            self._updated.notify_all()
+        return snapshot
+
+    def _poll_loop(self):
+        """Poll at the configured rate until stopped."""
+        next_poll = time.perf_counter()
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.error_count += 1
+                self.logger.warning(f'State poll failed: {e}')
+            next_poll += self.period
+            delay = next_poll - time.perf_counter()
+            if delay < 0:
+                # Polling is slower than the rate, do not try to catch up
+                next_poll = time.perf_counter()
+                delay = 0
+            self._stop_event.wait(delay)
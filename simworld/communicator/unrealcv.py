@@ -18,6 +18,12 @@ import PIL.Image
 import unrealcv
 from IPython.display import display
 
+from simworld.communicator.connection import (ConnectionHealth,
+                                              ReconnectPolicy, RequestWatchdog,
+                                              is_idempotent)
+from simworld.communicator.profiler import RequestProfiler
+from simworld.communicator.session_record import (RecordingClient,
+                                                  SessionRecorder)
 from simworld.utils.logger import Logger
 
 
@@ -28,20 +34,37 @@ class UnrealCV(object):
     including basic operations and traffic system operations.
     """
 
-    def __init__(self, port=9000, ip="0.0.0.0", resolution=(1280, 720)):
+    def __init__(self, port=9000, ip="0.0.0.0", resolution=(1280, 720), client=None, reconnect_policy=None):
         """Initialize the UnrealCV client.
 
         Args:
             port: Connection port, defaults to 9000.
             ip: Connection IP address, defaults to 0.0.0.0.
             resolution: Resolution, defaults to (320, 240).
+            client: Client to use instead of connecting to ip:port, e.g. a
+                ``session_record.ReplayClient``. Such a client is never reconnected.
+            reconnect_policy: Reconnect backoff and request deadlines, defaults to
+                ``ReconnectPolicy()``.
         """
         self.ip = ip
+        self.port = port
+        self.reconnect_policy = reconnect_policy if reconnect_policy is not None else ReconnectPolicy()
         # Build a client to connect to the environment
-        self.client = unrealcv.Client((ip, port))
+        self._owns_client = client is None
+        self.client = client if client is not None else unrealcv.Client((ip, port))
         self.client.connect()
 
         self.resolution = resolution
+        self.recorder = None
+        self.profiler = None
+        self.command_buffer = None
+        self.paused = False  # whether set_mode paused the game
+
+        self.reconnect_count = 0
+        self.failure_count = 0
+        self.last_error = None
+        self._needs_reconnect = False
+        self._watchdog = RequestWatchdog()
 
         self.lock = Lock()
         self.logger = Logger.get_logger("UnrealCV")
@@ -50,33 +73,370 @@ class UnrealCV(object):
     def request(self, cmd, timeout=5):
         """Thread-safe request to UnrealCV server.
 
+        If the connection breaks or the request times out, the client reconnects. A
+        query is then replayed, any other command raises since it may have been applied.
+
         Args:
             cmd: Command string.
-            timeout: Timeout in seconds.
+            timeout: Timeout in seconds. -1 sends the command without waiting for the response.
 
         Returns:
-            str: Server response.
+            str: Server response, or None if not waiting.
+
+        Raises:
+            ConnectionError: If the request failed and could not be replayed.
         """
-        with self.lock:
-            return self.client.request(cmd, timeout)
+        return self._call([cmd], lambda client: client.request(cmd, timeout), wait=timeout >= 0)[0]
 
-    def request_batch(self, cmds):
+    def request_batch(self, cmds, timeout=None):
         """Thread-safe batch request to UnrealCV server.
 
+        If the connection breaks or the batch outlives its deadline, the client
+        reconnects. A batch of queries only is then replayed, any other batch raises
+        since some of its commands may have been applied.
+
         Args:
             cmds: List of command strings.
+            timeout: Seconds the batch may take, defaults to the ``request_deadline``
+                of the reconnect policy.
 
         Returns:
             list: List of server responses.
+
+        Raises:
+            ConnectionError: If the batch failed and could not be replayed.
+        """
+        if timeout is None:
+            timeout = self.reconnect_policy.request_deadline
+        return self._call(cmds, lambda client: client.request_batch(cmds), deadline=timeout)
+
+    def write(self, cmd):
+        """Send a write command, or buffer it if a command buffer is set.
+
+        Buffered commands are coalesced and sent when the buffer is flushed.
+
+        Args:
+            cmd: Command string.
+
+        Returns:
+            str: Server response, or None if the command was buffered.
+        """
+        if self.command_buffer is not None:
+            self.command_buffer.put(cmd)
+            return None
+        return self.request(cmd)
+
+    def request_batch_async(self, cmds):
+        """Thread-safe batch request that returns without waiting for the responses.
+
+        The responses are still read and discarded in order by the client, so later
+        requests get their own responses.
+
+        Args:
+            cmds: List of command strings.
+        """
+        self._call(cmds, lambda client: client.request_batch_async(cmds), wait=False)
+
+    def request_chunked(self, cmds, chunk_size=100):
+        """Send a long command list as consecutive batch requests.
+
+        Args:
+            cmds: List of command strings.
+            chunk_size: Maximum number of commands per batch.
+
+        Returns:
+            list: List of server responses, in the same order as ``cmds``.
+        """
+        responses = []
+        for start in range(0, len(cmds), chunk_size):
+            responses.extend(self.request_batch(cmds[start:start + chunk_size]))
+        return responses
+
+    def _call(self, cmds, send, wait=True, deadline=None):
+        """Send a request under the client lock, recovering from broken connections.
+
+        Args:
+            cmds: Commands of the request, used to decide whether it can be replayed.
+            send: Function sending the request through a client and returning its response(s).
+            wait: Whether the request waits for responses, in which case a missing
+                response means the connection was lost.
+            deadline: Seconds after which the watchdog aborts the request, or None.
+
+        Returns:
+            list: Server responses, one per command, or [None] if not waiting.
+
+        Raises:
+            ConnectionError: If the request failed and could not be replayed.
+        """
+        replays = self.reconnect_policy.max_replays if wait and all(is_idempotent(cmd) for cmd in cmds) else 0
+        while True:
+            start = time.perf_counter()
+            with self.lock:
+                acquired = time.perf_counter()
+                try:
+                    if self._needs_reconnect:
+                        self.reconnect()
+                    token = self._watchdog.arm(self.client, deadline) if deadline is not None else None
+                    try:
+                        res = send(self.client)
+                    finally:
+                        if self._watchdog.disarm(token):
+                            # A timeout is queued or was raised: the responses are out of sync
+                            self._needs_reconnect = True
+                    responses = res if isinstance(res, list) else [res]
+                    if wait and (res is None or any(r is None for r in responses)):
+                        raise ConnectionError("Connection lost while waiting for the response")
+                    error = None
+                except (ConnectionError, TimeoutError, OSError) as e:
+                    error = e
+                    self._handle_failure(e)
+            if error is None:
+                if self.profiler is not None:
+                    self.profiler.record(cmds, responses, start, acquired, time.perf_counter())
+                return responses
+            if replays <= 0:
+                raise ConnectionError(f"Request to UnrealCV server at {self.ip}:{self.port} failed: {error}") from error
+            replays -= 1
+            self.logger.warning(f"Replaying {len(cmds)} queries after failure: {error}")
+
+    def _handle_failure(self, error):
+        """Record a failed request and reconnect. The caller holds the lock.
+
+        Args:
+            error: Exception raised by the request.
+        """
+        self.failure_count += 1
+        self.last_error = repr(error)
+        self.logger.error(f"Request to UnrealCV server at {self.ip}:{self.port} failed: {error}")
+        self._needs_reconnect = True
+        try:
+            self.reconnect()
+        except ConnectionError as e:
+            self.last_error = repr(e)
+            self.logger.error(str(e))
+
+    def reconnect(self):
+        """Drop the current connection and connect again with exponential backoff.
+
+        The caller holds the lock, or no request is in flight.
+
+        Raises:
+            ConnectionError: If the client was passed in, or the server cannot be
+                reached within the attempts and deadline of the reconnect policy.
+        """
+        if not self._owns_client:
+            raise ConnectionError("Cannot reconnect a client that was passed in")
+        policy = self.reconnect_policy
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+        started = time.monotonic()
+        delays = policy.delays()
+        attempts = 0
+        while True:
+            attempts += 1
+            client = unrealcv.Client((self.ip, self.port))
+            if client.connect():
+                break
+            delay = next(delays, None)
+            if delay is None or time.monotonic() - started + delay > policy.connect_deadline:
+                raise ConnectionError(
+                    f"Could not reconnect to UnrealCV server at {self.ip}:{self.port} after {attempts} attempts"
+                )
+            time.sleep(delay)
+        self.client = self.recorder.wrap(client) if self.recorder is not None else client
+        self._needs_reconnect = False
+        self.reconnect_count += 1
+        self.logger.info(f"Reconnected to UnrealCV server at {self.ip}:{self.port} after {attempts} attempts")
+        w, h = self.resolution
+        self.client.request(f"vrun setres {w}x{h}w", -1)
+
+    def health_check(self, timeout=2.0):
+        """Check whether the server answers a status query in time.
+
+        The check never waits for a reconnect, so that orchestration can recycle a
+        dead instance quickly. A failed check makes the next request reconnect first.
+
+        Args:
+            timeout: Seconds the check may take, including waiting for a request in flight.
+
+        Returns:
+            ConnectionHealth: The health report.
         """
+        start = time.perf_counter()
+        error = None
+        if not self.lock.acquire(timeout=timeout):
+            error = TimeoutError(f"Client busy for more than {timeout} seconds")
+        else:
+            try:
+                if self._needs_reconnect or not self.client.isconnected():
+                    raise ConnectionError("Not connected")
+                if self.client.request("vget /unrealcv/status", timeout) is None:
+                    raise ConnectionError("Connection lost while waiting for the response")
+            except (ConnectionError, TimeoutError, OSError) as e:
+                error = e
+                self._needs_reconnect = True
+            finally:
+                self.lock.release()
+        if error is not None:
+            self.last_error = repr(error)
+        return ConnectionHealth(error is None, time.perf_counter() - start, self.reconnect_count, self.failure_count,
+                                self.last_error)
+
+    def enable_profiling(self, max_events=100000):
+        """Start collecting per-command latency and payload statistics.
+
+        Args:
+            max_events: Number of most recent requests kept for the Chrome trace.
+
+        Returns:
+            RequestProfiler: The profiler collecting the statistics.
+        """
+        if self.profiler is None:
+            self.profiler = RequestProfiler(max_events)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stop collecting statistics.
+
+        Returns:
+            RequestProfiler: The profiler with the statistics collected so far, or None.
+        """
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def start_recording(self, path):
+        """Record all requests and responses of this client to a session file.
+
+        The session can be served back with ``session_record.ReplayClient``.
+
+        Args:
+            path: Path of the session file to write.
+
+        Returns:
+            SessionRecorder: The recorder, which can also wrap other clients.
+        """
+        self.stop_recording()
+        self.recorder = SessionRecorder(path)
+        with self.lock:
+            self.client = self.recorder.wrap(self.client)
+        return self.recorder
+
+    def stop_recording(self):
+        """Stop recording and close the session file."""
+        if self.recorder is None:
+            return
         with self.lock:
-            return self.client.request_batch(cmds)
+            if isinstance(self.client, RecordingClient):
+                self.client = self.client.client
+        self.recorder.close()
+        self.recorder = None
+
+    @staticmethod
+    def is_error_response(res):
+        """Check whether a server response reports a failed command.
+
+        Args:
+            res: Server response.
+
+        Returns:
+            bool: True if the response is missing or an error message.
+        """
+        if res is None:
+            return True
+        if isinstance(res, (bytes, bytearray)):
+            return False
+        return res.lstrip().lower().startswith("error")
+
+    @staticmethod
+    def spawn_cmds(
+        prefab_path,
+        name,
+        loc,
+        orientation,
+        scale=(1, 1, 1),
+        hasCollision=True,
+        isMovable=True,
+        color=None,
+    ):
+        """Build the command sequence that spawns and places one blueprint asset.
+
+        The commands match ``spawn_bp_asset``, ``set_color``, ``set_location``,
+        ``set_orientation``, ``set_scale``, ``set_collision`` and ``set_movable``
+        so that they can be sent together through ``request_batch``.
+
+        Args:
+            prefab_path: Prefab path.
+            name: Object name.
+            loc: Location coordinates in the form [x, y, z].
+            orientation: Orientation in the form [pitch, yaw, roll].
+            scale: Scale in the form [x, y, z].
+            hasCollision: Whether to enable collision.
+            isMovable: Whether the object is movable.
+            color: Optional color in the form [R, G, B].
+
+        Returns:
+            list: List of command strings.
+        """
+        [x, y, z] = loc
+        [pitch, yaw, roll] = orientation
+        [sx, sy, sz] = scale
+        cmds = [f"vset /objects/spawn_bp_asset {prefab_path} {name}"]
+        if color is not None:
+            [R, G, B] = color
+            cmds.append(f"vset /object/{name}/color {R} {G} {B}")
+        cmds.extend([
+            f"vset /object/{name}/location {x} {y} {z}",
+            f"vset /object/{name}/rotation {pitch} {yaw} {roll}",
+            f"vset /object/{name}/scale {sx} {sy} {sz}",
+            f"vset /object/{name}/collision {hasCollision}",
+            f"vset /object/{name}/object_mobility {isMovable}",
+        ])
+        return cmds
+
+    @staticmethod
+    def transform_cmds(name, loc, orientation, scale=(1, 1, 1), isMovable=True, color=None):
+        """Build the command sequence that moves an existing object.
+
+        Static objects are made movable while they are moved.
+
+        Args:
+            name: Object name.
+            loc: Location coordinates in the form [x, y, z].
+            orientation: Orientation in the form [pitch, yaw, roll].
+            scale: Scale in the form [x, y, z].
+            isMovable: Whether the object is movable.
+            color: Optional color in the form [R, G, B].
+
+        Returns:
+            list: List of command strings.
+        """
+        [x, y, z] = loc
+        [pitch, yaw, roll] = orientation
+        [sx, sy, sz] = scale
+        cmds = []
+        if color is not None:
+            [R, G, B] = color
+            cmds.append(f"vset /object/{name}/color {R} {G} {B}")
+        if not isMovable:
+            cmds.append(f"vset /object/{name}/object_mobility True")
+        cmds.extend([
+            f"vset /object/{name}/location {x} {y} {z}",
+            f"vset /object/{name}/rotation {pitch} {yaw} {roll}",
+            f"vset /object/{name}/scale {sx} {sy} {sz}",
+        ])
+        if not isMovable:
+            cmds.append(f"vset /object/{name}/object_mobility False")
+        return cmds
 
     ###################################################
     # Basic Operations
     ###################################################
     def disconnect(self):
         """Disconnect from Unreal Engine."""
+        self.stop_recording()
+        self._watchdog.close()
         self.client.disconnect()
 
     def ini_unrealcv(self, resolution=(320, 240)):
@@ -95,11 +455,15 @@ class UnrealCV(object):
         time.sleep(1)
 
     def check_connection(self):
-        """Check connection status, attempt to reconnect if not connected."""
-        while self.client.isconnected() is False:
-            self.logger.error("UnrealCV server is not running. Please try again")
-            time.sleep(1)
-            self.client.connect()
+        """Check connection status, attempt to reconnect with backoff if not connected.
+
+        Raises:
+            ConnectionError: If the server cannot be reached within the reconnect policy.
+        """
+        if self.client.isconnected() is False:
+            self.logger.error("UnrealCV server is not running, reconnecting")
+            with self.lock:
+                self.reconnect()
 
     # Deprecated
     def spawn(self, prefab, name):
@@ -122,9 +486,13 @@ class UnrealCV(object):
         cmd = f"vset /objects/spawn_bp_asset {prefab_path} {name}"
         return self.request(cmd)
 
-    def clean_garbage(self):
-        """Clean garbage objects."""
-        return self.request("vset /action/clean_garbage")
+    def clean_garbage(self, wait=True):
+        """Clean garbage objects.
+
+        Args:
+            wait: Whether to wait for UE to finish garbage collection.
+        """
+        return self.request("vset /action/clean_garbage", 5 if wait else -1)
 
     def set_location(self, loc, name):
         """Set object location.
@@ -222,15 +590,21 @@ class UnrealCV(object):
     def set_mode(self, mode="async", tick_interval=0.05):
         """Set asynchronous or synchronous mode.
 
+        Synchronous mode pauses the game, which is tracked in ``paused``.
+
         Args:
             mode: Mode.
             tick_interval: Tick interval if synchronous mode.
         """
         if mode == "sync":
             self.set_tick_interval(tick_interval)
-            return self.request("vset /action/game/pause")
+            res = self.request("vset /action/game/pause")
+            self.paused = True
+            return res
         elif mode == "async":
-            return self.request("vset /action/game/resume")
+            res = self.request("vset /action/game/resume")
+            self.paused = False
+            return res
         else:
             raise ValueError(
                 f'Invalid mode: {mode}. Please choose from "sync" or "async".'
@@ -255,6 +629,25 @@ class UnrealCV(object):
         cmd = f"vset /object/{actor_name}/destroy"
         return self.request(cmd)
 
+    def destroy_batch(self, actor_names, chunk_size=100, wait=True):
+        """Destroy several objects with chunked batch requests.
+
+        Args:
+            actor_names: List of actor names.
+            chunk_size: Maximum number of destroy commands per batch.
+            wait: Whether to wait for the responses. If False, the commands are
+                queued and the method returns immediately.
+
+        Returns:
+            list: Responses in the same order as ``actor_names``, or None if not waiting.
+        """
+        cmds = [f"vset /object/{actor_name}/destroy" for actor_name in actor_names]
+        if not cmds:
+            return [] if wait else None
+        if not wait:
+            return self.request_batch_async(cmds)
+        return self.request_chunked(cmds, chunk_size)
+
     def get_objects(self):
         """Get all objects.
 
@@ -359,7 +752,7 @@ class UnrealCV(object):
             steering: Steering value.
         """
         cmd = f"vbp {object_name} SetState {throttle} {brake} {steering}"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def v_make_u_turn(self, object_name):
         """Make vehicle U-turn.
@@ -378,7 +771,7 @@ class UnrealCV(object):
             states: States string.
         """
         cmd = f"vbp {manager_object_name} VSetState {states}"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def p_set_states(self, manager_object_name, states: str):
         """Batch set pedestrian states.
@@ -388,7 +781,7 @@ class UnrealCV(object):
             states: States string.
         """
         cmd = f"vbp {manager_object_name} PSetState {states}"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def p_stop(self, object_name):
         """Stop pedestrian movement.
@@ -397,7 +790,7 @@ class UnrealCV(object):
             object_name: Object name.
         """
         cmd = f"vbp {object_name} StopPedestrian"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def p_move_forward(self, object_name):
         """Move pedestrian forward.
@@ -406,7 +799,7 @@ class UnrealCV(object):
             object_name: Object name.
         """
         cmd = f"vbp {object_name} MoveForward"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def p_rotate(self, object_name, angle, direction="left"):
         """Rotate pedestrian.
@@ -422,7 +815,7 @@ class UnrealCV(object):
             angle = -angle
             clockwise = -1
         cmd = f"vbp {object_name} Rotate_Angle {1} {angle} {clockwise}"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def p_set_speed(self, object_name, speed):
         """Set pedestrian speed.
@@ -432,7 +825,7 @@ class UnrealCV(object):
             speed: Speed.
         """
         cmd = f"vbp {object_name} SetMaxSpeed {speed}"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def p_movement_simulation(self, object_name):
         """Start pedestrian movement simulation.
@@ -460,7 +853,7 @@ class UnrealCV(object):
             object_name: Object name.
         """
         cmd = f"vbp {object_name} SwitchVehicleFrontGreen"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def tl_set_pedestrian_walk(self, object_name: str):
         """Set pedestrian traffic light to walk.
@@ -469,7 +862,7 @@ class UnrealCV(object):
             object_name: Object name.
         """
         cmd = f"vbp {object_name} SetPedestrianWalk"
-        return self.request(cmd)
+        return self.write(cmd)
 
     def tl_set_duration(
         self,
@@ -888,11 +1281,17 @@ class UnrealCV(object):
         return self.request(cmd)
 
     def get_camera_location_multicam(self, camera_ids: list):
-        """Get camera location batch."""
-        locations = []
-        for camera_id in camera_ids:
-            locations.append(self.get_camera_location(camera_id))
-        return locations
+        """Get camera location batch.
+
+        Args:
+            camera_ids: List of camera IDs.
+
+        Returns:
+            list: Location responses, in the same order as ``camera_ids``.
+        """
+        return self.request_batch(
+            [f"vget /camera/{camera_id}/location" for camera_id in camera_ids]
+        )
 
     def get_camera_location(self, camera_id: int):
         """Get camera location.
@@ -1037,63 +1436,22 @@ class UnrealCV(object):
             cv2.waitKey(3)
         cap.release()
 
-    def get_image(self, cam_id, viewmode, mode="direct", img_path=None):
+    def get_image(self, cam_id, viewmode, mode="direct", img_path=None, out=None):
         """Get image.
 
         Args:
             cam_id: Camera ID.
             viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
-            mode: Mode.
+            mode: Mode. 'raw' returns metric float32 depth for 'depth' and RGB decoded
+                with OpenCV otherwise, see ``decode_image``.
             img_path: Image path.
+            out: Optional preallocated (H, W, 3) uint8 array that 'raw' RGB images are
+                decoded into.
         """
-        image = None
         try:
-            if mode == "direct":  # get image from unrealcv in png format
-                if viewmode == "depth":
-                    cmd = f"vget /camera/{cam_id}/{viewmode} npy"
-                    res = self.request(cmd)
-                    # Validate response type
-                    if isinstance(res, str):
-                        raise ValueError(
-                            f"UnrealCV error for camera {cam_id} ({viewmode}): {res}"
-                        )
-                    image = self._decode_npy(res)
-                else:
-                    cmd = f"vget /camera/{cam_id}/{viewmode} png"
-                    res = self.request(cmd)
-                    # Validate response type
-                    if isinstance(res, str):
-                        raise ValueError(
-                            f"UnrealCV error for camera {cam_id} ({viewmode}): {res}"
-                        )
-                    image = self._decode_png(res)
-            elif mode == "file":  # save image to file and read it
-                img_path = os.path.join(os.getcwd(), f"{cam_id}-{viewmode}.png")
-                cmd = f"vget /camera/{cam_id}/{viewmode} {img_path}"
-                img_dirs = self.request(cmd)
-                image = cv2.imread(img_dirs)
-
-            elif mode == "fast":  # get image from unrealcv in bmp format
-                cmd = f"vget /camera/{cam_id}/{viewmode} bmp"
-                res = self.request(cmd)
-                # Validate response type
-                if isinstance(res, str):
-                    raise ValueError(
-                        f"UnrealCV error for camera {cam_id} ({viewmode}): {res}"
-                    )
-                # print(type(res), len(res) if hasattr(res, '__len__') else res)
-                image = self._decode_bmp(res)
-
-            elif mode == "file_path":  # save image to file and read it
-                cmd = f"vget /camera/{cam_id}/{viewmode} {img_path}"
-                img_dirs = self.request(cmd)
-                image = cv2.imread(img_dirs)
-
-            if image is None:
-                raise ValueError(
-                    f"Failed to read image with mode={mode}, viewmode={viewmode}"
-                )
-            return image
+            cmd = self.image_cmd(cam_id, viewmode, mode, img_path)
+            res = self.request(cmd)
+            return self.decode_image(res, cam_id, viewmode, mode, out)
 
         except Exception as e:
             self.logger.error(
@@ -1102,7 +1460,117 @@ class UnrealCV(object):
             # Return black image as fallback
             return np.zeros((480, 640, 3), dtype=np.uint8)
 
-    def _decode_npy(self, res):
+    @classmethod
+    def decode_images(cls, responses, cam_id, viewmodes, mode="direct", executor=None):
+        """Decode the responses of several image capture commands.
+
+        Images that fail to decode are logged and replaced by a black image, like
+        in ``get_image``.
+
+        Args:
+            responses: Server responses, in the same order as ``viewmodes``.
+            cam_id: Camera ID.
+            viewmodes: View modes of the responses.
+            mode: Mode, possible values are 'direct', 'raw', 'fast'.
+            executor: Optional ``concurrent.futures.Executor`` decoding the images in parallel.
+
+        Returns:
+            dict: Mapping from view mode to decoded image.
+        """
+
+        def _decode(viewmode, res):
+            try:
+                return cls.decode_image(res, cam_id, viewmode, mode)
+            except Exception as e:
+                Logger.get_logger("UnrealCV").error(
+                    f"Failed to get image from camera {cam_id} (viewmode={viewmode}, mode={mode}): {str(e)}"
+                )
+                return np.zeros((480, 640, 3), dtype=np.uint8)
+
+        if executor is None:
+            images = map(_decode, viewmodes, responses)
+        else:
+            images = executor.map(_decode, viewmodes, responses)
+        return dict(zip(viewmodes, images))
+
+    @staticmethod
+    def image_cmd(cam_id, viewmode, mode="direct", img_path=None):
+        """Build the command that captures an image.
+
+        Args:
+            cam_id: Camera ID.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'raw', 'file', 'fast', 'file_path'.
+            img_path: Image path, used by 'file_path' mode.
+
+        Returns:
+            str: Command string.
+        """
+        if mode in ("direct", "raw"):  # get image from unrealcv in png format
+            if viewmode == "depth":
+                return f"vget /camera/{cam_id}/{viewmode} npy"
+            return f"vget /camera/{cam_id}/{viewmode} png"
+        elif mode == "file":  # save image to file and read it
+            img_path = os.path.join(os.getcwd(), f"{cam_id}-{viewmode}.png")
+            return f"vget /camera/{cam_id}/{viewmode} {img_path}"
+        elif mode == "fast":  # get image from unrealcv in bmp format
+            return f"vget /camera/{cam_id}/{viewmode} bmp"
+        elif mode == "file_path":  # save image to file and read it
+            return f"vget /camera/{cam_id}/{viewmode} {img_path}"
+        raise ValueError(f"Failed to read image with mode={mode}, viewmode={viewmode}")
+
+    @classmethod
+    def decode_image(cls, res, cam_id, viewmode, mode="direct", out=None):
+        """Decode the response of an image capture command.
+
+        In 'direct' mode depth is returned as a color-mapped visualization. In 'raw'
+        mode depth is returned as metric float32 values read in place from the
+        response buffer (read-only, use ``visualize_depth`` to color-map it), and
+        other view modes are decoded with OpenCV, into ``out`` if given.
+
+        Args:
+            res: Server response to the command built by ``image_cmd``.
+            cam_id: Camera ID.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'raw', 'file', 'fast', 'file_path'.
+            out: Optional preallocated (H, W, 3) uint8 array that 'raw' RGB images are
+                decoded into. It is overwritten and returned.
+
+        Returns:
+            Decoded image.
+
+        Raises:
+            ValueError: If the server returned an error or the image cannot be read.
+        """
+        image = None
+        if mode in ("file", "file_path"):
+            image = cv2.imread(res)
+        else:
+            # Validate response type
+            if isinstance(res, str):
+                raise ValueError(
+                    f"UnrealCV error for camera {cam_id} ({viewmode}): {res}"
+                )
+            if mode == "fast":
+                image = cls._decode_bmp(res)
+            elif mode == "raw":
+                if viewmode == "depth":
+                    image = cls._decode_npy_raw(res)
+                else:
+                    image = cls._decode_png_raw(res, out)
+            elif viewmode == "depth":
+                image = cls._decode_npy(res)
+            else:
+                image = cls._decode_png(res)
+
+        if image is None:
+            raise ValueError(
+                f"Failed to read image with mode={mode}, viewmode={viewmode}"
+            )
+        return image
+
+    @staticmethod
+    def _decode_npy(res):
         """Decode NPY image.
 
         Args:
@@ -1111,13 +1579,47 @@ class UnrealCV(object):
         Returns:
             Decoded image.
         """
+        return UnrealCV.visualize_depth(UnrealCV._decode_npy_raw(res))
+
+    @staticmethod
+    def _decode_npy_raw(res):
+        """Decode NPY depth without copying the pixel data.
+
+        Args:
+            res: NPY image (bytes).
+
+        Returns:
+            Read-only float32 depth array viewing the response buffer.
+        """
         if not isinstance(res, (bytes, bytearray)):
             raise TypeError(
                 f"Expected bytes for NPY decoding, got {type(res).__name__}"
             )
-        image = np.load(BytesIO(res))
+        stream = BytesIO(res)
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+        count = int(np.prod(shape))
+        image = np.frombuffer(res, dtype=dtype, count=count, offset=stream.tell())
+        image = image.reshape(shape, order="F" if fortran_order else "C")
+        if image.dtype != np.float32:
+            image = image.astype(np.float32)
+        return image
+
+    @staticmethod
+    def visualize_depth(depth):
+        """Color-map a depth image for display.
+
+        Args:
+            depth: Metric depth array.
+
+        Returns:
+            (H, W, 3) uint8 image with log-scaled depth mapped to the JET colormap.
+        """
         eps = 1e-6
-        depth_log = np.log(image + eps)
+        depth_log = np.log(depth + eps)
 
         depth_min = np.min(depth_log)
         depth_max = np.max(depth_log)
@@ -1131,7 +1633,8 @@ class UnrealCV(object):
         image = cv2.applyColorMap(image, cv2.COLORMAP_JET)
         return image
 
-    def _decode_png(self, res):
+    @staticmethod
+    def _decode_png(res):
         """Decode PNG image.
 
         Args:
@@ -1148,7 +1651,44 @@ class UnrealCV(object):
         img = img[:, :, :-1]  # delete alpha channel
         return img
 
-    def _decode_bmp(self, res: bytes):
+    @staticmethod
+    def _decode_png_raw(res, out=None):
+        """Decode PNG image with OpenCV, optionally into a preallocated array.
+
+        Args:
+            res: PNG image (bytes).
+            out: Optional (H, W, 3) uint8 array to decode into.
+
+        Returns:
+            (H, W, 3) uint8 RGB image, ``out`` if given.
+
+        Raises:
+            ValueError: If the image cannot be decoded or does not match ``out``.
+        """
+        if not isinstance(res, (bytes, bytearray)):
+            raise TypeError(
+                f"Expected bytes for PNG decoding, got {type(res).__name__}"
+            )
+        img = cv2.imdecode(np.frombuffer(res, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise ValueError("Failed to decode PNG image")
+        if img.ndim == 2:
+            code = cv2.COLOR_GRAY2RGB
+        elif img.shape[2] == 4:
+            code = cv2.COLOR_BGRA2RGB
+        else:
+            code = cv2.COLOR_BGR2RGB
+        if out is None:
+            return cv2.cvtColor(img, code)
+        if out.shape != (img.shape[0], img.shape[1], 3) or out.dtype != np.uint8:
+            raise ValueError(
+                f"Output buffer {out.shape} {out.dtype} does not match image {img.shape[:2]}"
+            )
+        cv2.cvtColor(img, code, dst=out)
+        return out
+
+    @staticmethod
+    def _decode_bmp(res: bytes):
         """Robust BMP decoder.
 
         Parses header, handles row padding and top-down/bottom-up storage.
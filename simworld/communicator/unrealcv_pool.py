@@ -0,0 +1,171 @@
+"""UnrealCV connection pool module.
+
+This module provides a pool of UnrealCV connections to the same server, used to
+capture images from several cameras in parallel and to keep image traffic off the
+connection that carries vehicle, pedestrian and humanoid commands.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import unrealcv
+
+from simworld.communicator.profiler import RequestProfiler
+from simworld.communicator.unrealcv import UnrealCV
+from simworld.utils.logger import Logger
+
+
+class UnrealCVPool:
+    """Pool of UnrealCV connections for parallel camera capture.
+
+    Each connection serves one request at a time. Requests check out an idle
+    connection, so up to ``size`` captures are in flight at once.
+
+    The stock UnrealCV server accepts a single client and rejects the others, so a
+    pool only helps with servers that accept several clients. Connections rejected
+    by the server are dropped, and opening the pool fails if the server rejects all
+    of them.
+    """
+
+    def __init__(self, size: int = 4, port: int = 9000, ip: str = '127.0.0.1', profiler: RequestProfiler = None):
+        """Open the pool connections.
+
+        Args:
+            size: Maximum number of connections in the pool. ``self.size`` is the number
+                of connections the server accepted.
+            port: Connection port, defaults to 9000.
+            ip: Connection IP address, defaults to 127.0.0.1.
+            profiler: Optional profiler recording the pool requests. Time spent waiting
+                for an idle connection is reported as lock wait.
+
+        Raises:
+            ValueError: If size is not positive.
+            ConnectionError: If the server accepts none of the connections.
+        """
+        if size < 1:
+            raise ValueError(f'Pool size must be positive, got {size}')
+        self.ip = ip
+        self.port = port
+        self.profiler = profiler
+        self.logger = Logger.get_logger('UnrealCVPool')
+
+        self.clients = []
+        self._idle = queue.Queue()
+        for _ in range(size):
+            client = unrealcv.Client((ip, port))
+            if not client.connect() or not client.isconnected():
+                # Rejected: the server does not accept more clients
+                client.disconnect()
+                break
+            self.clients.append(client)
+            self._idle.put(client)
+        if not self.clients:
+            raise ConnectionError(f'UnrealCV server at {ip}:{port} rejected all pool connections; '
+                                  'it probably accepts a single client')
+        if len(self.clients) < size:
+            self.logger.warning(f'UnrealCV server at {ip}:{port} accepted only {len(self.clients)} of {size} '
+                                'pool connections')
+        self.size = len(self.clients)
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='UnrealCVPool')
+        self.logger.info(f'Opened {self.size} pool connections to UnrealCV server at {ip}:{port}')
+
+    @classmethod
+    def from_client(cls, unrealcv_client: UnrealCV, size: int = 4):
+        """Create a pool connected to the same server as an UnrealCV client, sharing its profiler.
+
+        Args:
+            unrealcv_client: Connected UnrealCV client.
+            size: Number of connections in the pool.
+
+        Returns:
+            UnrealCVPool: The new pool.
+        """
+        return cls(size, unrealcv_client.port, unrealcv_client.ip, unrealcv_client.profiler)
+
+    def request(self, cmd, timeout=5):
+        """Send a request over an idle pool connection.
+
+        Args:
+            cmd: Command string.
+            timeout: Timeout in seconds.
+
+        Returns:
+            str or bytes: Server response.
+        """
+        start = time.perf_counter()
+        client = self._idle.get()
+        acquired = time.perf_counter()
+        try:
+            if not client.isconnected():
+                client.connect()
+            res = client.request(cmd, timeout)
+        finally:
+            self._idle.put(client)
+        if self.profiler is not None:
+            self.profiler.record([cmd], [res], start, acquired, time.perf_counter())
+        return res
+
+    def request_batch(self, cmds):
+        """Send a batch request over one idle pool connection.
+
+        Args:
+            cmds: List of command strings.
+
+        Returns:
+            list: List of server responses, in the same order as ``cmds``.
+        """
+        start = time.perf_counter()
+        client = self._idle.get()
+        acquired = time.perf_counter()
+        try:
+            if not client.isconnected():
+                client.connect()
+            res = client.request_batch(cmds)
+        finally:
+            self._idle.put(client)
+        if self.profiler is not None:
+            self.profiler.record(cmds, res, start, acquired, time.perf_counter())
+        return res
+
+    def get_image(self, cam_id, viewmode, mode='direct', img_path=None, out=None):
+        """Get image over an idle pool connection.
+
+        Args:
+            cam_id: Camera ID.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'raw', 'file', 'fast', 'file_path'.
+            img_path: Image path, used by 'file_path' mode.
+            out: Optional preallocated array that 'raw' RGB images are decoded into.
+
+        Returns:
+            Decoded image, or a black image if the capture failed.
+        """
+        try:
+            res = self.request(UnrealCV.image_cmd(cam_id, viewmode, mode, img_path))
+            return UnrealCV.decode_image(res, cam_id, viewmode, mode, out)
+        except Exception as e:
+            self.logger.error(f'Failed to get image from camera {cam_id} (viewmode={viewmode}, mode={mode}): {str(e)}')
+            # Return black image as fallback
+            return np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def get_images(self, cam_ids, viewmode, mode='direct'):
+        """Get images of several cameras, spread across the pool connections.
+
+        Args:
+            cam_ids: List of camera IDs.
+            viewmode: View mode. Possible values are 'lit', 'depth', 'object_mask'.
+            mode: Mode, possible values are 'direct', 'raw', 'file', 'fast'.
+
+        Returns:
+            list: Images, in the same order as ``cam_ids``.
+        """
+        return list(self._executor.map(lambda cam_id: self.get_image(cam_id, viewmode, mode), cam_ids))
+
+    def disconnect(self):
+        """Close all pool connections."""
+        if hasattr(self, '_executor'):
+            self._executor.shutdown(wait=True)
+        for client in self.clients:
+            client.disconnect()
+        self.clients = []
@@ -0,0 +1,89 @@
+"""World diff module for incremental world generation.
+
+This module compares the nodes of a world JSON with the world applied last, so that
+loading a modified layout only spawns added nodes, destroys removed ones and moves
+the ones whose transform changed, instead of clearing and regenerating the city.
+"""
+import math
+import re
+from typing import NamedTuple
+
+# Actors spawned at run time by the traffic system and agents, never world nodes
+RUNTIME_ACTOR_PATTERN = re.compile(
+    r'GEN_BP_(Vehicle|Pedestrian|TrafficSignal|Humanoid|Scooter|WaypointMark)_\d+$|GEN_BP_UEManager$')
+WORLD_NODE_PREFIXES = ('GEN_BP_', 'GEN_Road_')
+
+
+class WorldDiff(NamedTuple):
+    """Difference between the applied world and a new one.
+
+    Attributes:
+        added: Spawn descriptions of the nodes to spawn.
+        removed: Names of the nodes to destroy.
+        moved: Spawn descriptions of the nodes whose transform or color changed.
+        unchanged: Names of the nodes left as they are.
+    """
+    added: list
+    removed: list
+    moved: list
+    unchanged: list
+
+
+def is_world_node(name: str):
+    """Check whether a UE object name belongs to a generated world node.
+
+    Args:
+        name: Object name.
+
+    Returns:
+        bool: True for roads, buildings and street elements, False for traffic
+        actors, agents and everything not generated.
+    """
+    return name.startswith(WORLD_NODE_PREFIXES) and RUNTIME_ACTOR_PATTERN.match(name) is None
+
+
+def _same_values(a, b, tolerance):
+    """Compare two sequences of numbers, or None, within a tolerance."""
+    if a is None or b is None:
+        return a is None and b is None
+    return len(a) == len(b) and all(math.isclose(x, y, rel_tol=0.0, abs_tol=tolerance) for x, y in zip(a, b))
+
+
+def diff_world(previous: dict, actors, tolerance: float = 1e-3):
+    """Compare the applied world with the nodes of a new world.
+
+    Args:
+        previous: Mapping from node name to the spawn description it was applied
+            with, or to None if the node exists in UE but its description is unknown.
+            Nodes with an unknown description are always moved to the new transform.
+        actors: Spawn descriptions of the new world, see ``Communicator.spawn_actors``.
+        tolerance: Largest difference of a location, orientation or scale component
+            that is not considered a change.
+
+    Returns:
+        WorldDiff: Nodes to add, remove and move. A node whose model changed is both
+        removed and added.
+    """
+    added, removed, moved, unchanged = [], [], [], []
+    names = set()
+    for actor in actors:
+        name = actor['name']
+        names.add(name)
+        if name not in previous:
+            added.append(actor)
+            continue
+        old = previous[name]
+        if old is None:
+            moved.append(actor)
+        elif old['model_path'] != actor['model_path']:
+            removed.append(name)
+            added.append(actor)
+        elif (_same_values(old['location'], actor['location'], tolerance)
+              and _same_values(old['orientation'], actor['orientation'], tolerance)
+              and _same_values(old.get('scale', (1, 1, 1)), actor.get('scale', (1, 1, 1)), tolerance)
+              and _same_values(old.get('color'), actor.get('color'), 0)):
+            unchanged.append(name)
+        else:
+            moved.append(actor)
+    removed.extend(name for name in previous if name not in names)
+    return WorldDiff(added, removed, moved, unchanged)
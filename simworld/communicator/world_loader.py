@@ -0,0 +1,200 @@
+"""World loader module for streaming world generation.
+
+This module reads the nodes of a world JSON one at a time instead of loading and
+normalizing the whole file, and turns them into spawn descriptions using an asset
+table resolved once per asset, so that huge worlds can be fed to the bulk spawn
+path in chunks, with progress reporting and resuming from a given node.
+"""
+import importlib.resources as pkg_resources
+import json
+import os
+import re
+from typing import NamedTuple
+
+from simworld.utils.logger import Logger
+
+_NODES_PATTERN = re.compile(r'"nodes"\s*:\s*\[')
+_COLOR_PATTERN = re.compile(r'R=(\d+),G=(\d+),B=(\d+)')
+_WHITESPACE = ' \t\n\r,'
+
+
+class WorldLoadProgress(NamedTuple):
+    """Progress of a streaming world generation.
+
+    Attributes:
+        nodes_done: Number of nodes processed so far, including skipped ones. Passing it
+            as ``start_node`` resumes the generation after them.
+        spawned: Number of nodes spawned so far in this run.
+        failed: Number of nodes that could not be resolved or spawned in this run.
+        bytes_read: Bytes of the world JSON parsed so far, counting characters as bytes.
+        total_bytes: Size of the world JSON in bytes, or None if unknown.
+    """
+    nodes_done: int
+    spawned: int
+    failed: int
+    bytes_read: int
+    total_bytes: int
+
+    @property
+    def fraction(self):
+        """Fraction of the world JSON read so far, or None if the size is unknown."""
+        if not self.total_bytes:
+            return None
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+
+def _open_world_json(path):
+    """Open a world JSON, falling back to the default data package like ``load_json``.
+
+    Args:
+        path: Path of the world JSON.
+
+    Returns:
+        tuple: (file object, size in bytes or None).
+    """
+    try:
+        return open(path, 'r', encoding='utf-8'), os.path.getsize(path)
+    except (FileNotFoundError, IOError):
+        Logger.get_logger('WorldLoader').warning(f"File not found at '{path}', falling back to default location")
+        try:
+            resource = pkg_resources.files('simworld.data').joinpath(os.path.basename(path))
+            return resource.open('r', encoding='utf-8'), None
+        except Exception as e:
+            raise FileNotFoundError(f"Could not load JSON file from '{path}' or default location") from e
+
+
+def iter_world_nodes(path: str, read_size: int = 1 << 20):
+    """Parse the nodes of a world JSON one at a time.
+
+    Only the ``nodes`` array is parsed, so memory use is bounded by the largest node
+    rather than by the whole world.
+
+    Args:
+        path: Path of the world JSON.
+        read_size: Number of characters read from the file at a time.
+
+    Yields:
+        tuple: (node, bytes_read, total_bytes), with node the decoded node dict and
+        bytes_read the position after it, counting characters as bytes.
+
+    Raises:
+        ValueError: If the file has no ``nodes`` array or is truncated.
+    """
+    decoder = json.JSONDecoder()
+    f, total_bytes = _open_world_json(path)
+    with f:
+        buffer = ''
+        offset = 0  # Characters dropped from the front of the buffer
+        eof = False
+
+        def _read():
+            nonlocal buffer, eof
+            data = f.read(read_size)
+            if not data:
+                eof = True
+            buffer += data
+
+        def _drop(pos):
+            nonlocal buffer, offset
+            buffer = buffer[pos:]
+            offset += pos
+
+        # Find the start of the nodes array
+        match = None
+        while match is None:
+            _read()
+            match = _NODES_PATTERN.search(buffer)
+            if match is None and eof:
+                raise ValueError(f'No "nodes" array in {path}')
+        pos = match.end()
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f'Unterminated "nodes" array in {path}')
+                _drop(pos)
+                pos = 0
+                _read()
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                node, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError(f'Truncated node in {path} at character {pos}')
+                _drop(pos)
+                pos = 0
+                _read()
+                continue
+            pos = end
+            yield node, offset + pos, total_bytes
+
+
+def parse_rgb(color_str: str):
+    """Parse RGB values from a color string like '(R=255,G=255,B=0)'.
+
+    Args:
+        color_str: Color string.
+
+    Returns:
+        list: [R, G, B], black if the string cannot be parsed.
+    """
+    match = _COLOR_PATTERN.search(color_str)
+    if match:
+        return [int(match.group(1)), int(match.group(2)), int(match.group(3))]
+    return [0, 0, 0]  # Default to black if parsing fails
+
+
+def build_asset_table(asset_library: dict):
+    """Resolve the asset path and color of every asset once.
+
+    Args:
+        asset_library: Asset library, mapping instance names to their ``asset_path``
+            and ``color`` category, and ``colors`` to the color of each category.
+
+    Returns:
+        dict: Mapping from instance name to (asset_path, [R, G, B]). Assets whose path
+        or color cannot be resolved are left out.
+    """
+    colors = {category: parse_rgb(color) for category, color in asset_library.get('colors', {}).items()}
+    table = {}
+    for instance_name, asset in asset_library.items():
+        if instance_name == 'colors' or not isinstance(asset, dict):
+            continue
+        try:
+            table[instance_name] = (asset['asset_path'], colors[asset['color']])
+        except KeyError:
+            continue
+    return table
+
+
+def node_to_actor(node: dict, asset_table: dict, run_time: bool = True):
+    """Turn a world node into a spawn description.
+
+    Args:
+        node: World node with ``id``, ``instance_name`` and ``properties``.
+        asset_table: Table built by ``build_asset_table``.
+        run_time: Whether the world is generated at run time, in which case the
+            segmentation color is set.
+
+    Returns:
+        dict: Spawn description, see ``Communicator.spawn_actors``.
+
+    Raises:
+        KeyError: If the asset of the node is unknown or the node misses a property.
+    """
+    asset_path, rgb_values = asset_table[node['instance_name']]
+    properties = node['properties']
+    location, orientation, scale = properties['location'], properties['orientation'], properties['scale']
+    return {
+        'name': node['id'],
+        'model_path': asset_path,
+        'color': rgb_values if run_time else None,
+        'location': [location['x'], location['y'], location['z']],
+        'orientation': [orientation['pitch'], orientation['yaw'], orientation['roll']],
+        'scale': [scale['x'], scale['y'], scale['z']],
+        'movable': False,
+    }
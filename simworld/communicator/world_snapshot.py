@@ -0,0 +1,195 @@
+"""World snapshot module for decoding UE manager state payloads.
+
+This module turns the ``GetInformation`` payload of the UE manager into indexed
+name -> transform tables in a single pass over each string, instead of searching
+the whole payload once per entity.
+"""
+import json
+import re
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+# '<name>X=<x> Y=<y> Z=<z>' and '<name>P=<pitch> Y=<yaw> R=<roll>', entries back to back
+_NUMBER = r'(-?\d+(?:\.\d+)?)'
+_LOCATION_PATTERN = re.compile(rf'([^\s,;=]+?)X={_NUMBER} Y={_NUMBER} Z={_NUMBER}')
+_ROTATION_PATTERN = re.compile(rf'([^\s,;=]+?)P={_NUMBER} Y={_NUMBER} R={_NUMBER}')
+# '<name><is_vehicle_green><is_pedestrian_walk><left_time>'
+_LIGHT_STATE_PATTERN = re.compile(r'([^\s,;=]+?)(true|false)(true|false)(\d+\.\d+)')
+
+# Payload keys of each actor kind: kind -> (locations key, rotations key)
+PAYLOAD_KEYS = {
+    'vehicle': ('VLocations', 'VRotations'),
+    'pedestrian': ('PLocations', 'PRotations'),
+    'humanoid': ('ALocations', 'ARotations'),
+    'scooter': ('SLocations', 'SRotations'),
+}
+
+
+class TransformArrays(NamedTuple):
+    """Struct-of-arrays view of the transforms of one actor kind.
+
+    Attributes:
+        names: Actor names, one per row.
+        x: X coordinates.
+        y: Y coordinates.
+        z: Z coordinates.
+        yaw: Yaw angles in degrees.
+        valid: Whether the row was present in the snapshot.
+    """
+    names: list
+    x: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+    yaw: np.ndarray
+    valid: np.ndarray
+
+
+def parse_transforms(locations: str, rotations: str):
+    """Parse location and rotation strings into a name -> (x, y, z, yaw) table.
+
+    Args:
+        locations: Location string, e.g. ``'GEN_BP_Vehicle_0X=1.0 Y=2.0 Z=0.0...'``.
+        rotations: Rotation string, e.g. ``'GEN_BP_Vehicle_0P=0.0 Y=90.0 R=0.0...'``.
+
+    Returns:
+        dict: Mapping from actor name to an (x, y, z, yaw) tuple. Actors missing
+        from either string are left out.
+    """
+    yaws = {match.group(1): float(match.group(3)) for match in _ROTATION_PATTERN.finditer(rotations or '')}
+    table = {}
+    for match in _LOCATION_PATTERN.finditer(locations or ''):
+        name = match.group(1)
+        if name in yaws:
+            table[name] = (float(match.group(2)), float(match.group(3)), float(match.group(4)), yaws[name])
+    return table
+
+
+def parse_light_states(light_states: str):
+    """Parse a traffic light state string into a name -> state table.
+
+    Args:
+        light_states: Light state string, e.g. ``'GEN_BP_TrafficSignal_0truefalse12.5...'``.
+
+    Returns:
+        dict: Mapping from signal name to an (is_vehicle_green, is_pedestrian_walk, left_time) tuple.
+    """
+    return {
+        match.group(1): (match.group(2) == 'true', match.group(3) == 'true', float(match.group(4)))
+        for match in _LIGHT_STATE_PATTERN.finditer(light_states or '')
+    }
+
+
+class WorldSnapshot:
+    """Decoded state of all actors reported by the UE manager at one point in time.
+
+    A snapshot is never modified after creation, so it can be shared between the
+    traffic controller, planners and recorders without locking.
+    """
+    __slots__ = ('tick_id', 'timestamp', 'transforms', 'light_states', '_arrays')
+
+    def __init__(self, transforms: dict, light_states: dict, tick_id: int = 0, timestamp: float = None):
+        """Initialize the snapshot.
+
+        Args:
+            transforms: Mapping from actor kind to its name -> (x, y, z, yaw) table.
+            light_states: Mapping from signal name to its state tuple.
+            tick_id: Identifier of the simulation tick the snapshot belongs to.
+            timestamp: Time the snapshot was taken. Defaults to now.
+        """
+        self.tick_id = tick_id
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.transforms = transforms
+        self.light_states = light_states
+        self._arrays = {}
+
+    @classmethod
+    def from_payload(cls, payload, tick_id: int = 0, timestamp: float = None):
+        """Decode a ``GetInformation`` payload.
+
+        Args:
+            payload: JSON string or already decoded dict returned by the UE manager.
+            tick_id: Identifier of the simulation tick the snapshot belongs to.
+            timestamp: Time the snapshot was taken. Defaults to now.
+
+        Returns:
+            WorldSnapshot: The decoded snapshot.
+        """
+        info = json.loads(payload) if isinstance(payload, (str, bytes, bytearray)) else payload
+        transforms = {
+            kind: parse_transforms(info.get(locations_key, ''), info.get(rotations_key, ''))
+            for kind, (locations_key, rotations_key) in PAYLOAD_KEYS.items()
+        }
+        return cls(transforms, parse_light_states(info.get('LStates', '')), tick_id, timestamp)
+
+    @property
+    def age(self):
+        """Get the number of seconds since the snapshot was taken.
+
+        Returns:
+            float: Age of the snapshot in seconds.
+        """
+        return time.time() - self.timestamp
+
+    def get_transform(self, kind: str, name: str):
+        """Get the transform of one actor.
+
+        Args:
+            kind: Actor kind, one of 'vehicle', 'pedestrian', 'humanoid', 'scooter'.
+            name: Actor name in UE.
+
+        Returns:
+            tuple: (x, y, z, yaw), or None if the actor is not in the snapshot.
+        """
+        return self.transforms.get(kind, {}).get(name)
+
+    def get_light_state(self, name: str):
+        """Get the state of one traffic signal.
+
+        Args:
+            name: Traffic signal name in UE.
+
+        Returns:
+            tuple: (is_vehicle_green, is_pedestrian_walk, left_time), or None if not found.
+        """
+        return self.light_states.get(name)
+
+    def as_arrays(self, kind: str, names: list = None):
+        """Get the transforms of one actor kind as a struct of NumPy arrays.
+
+        Args:
+            kind: Actor kind, one of 'vehicle', 'pedestrian', 'humanoid', 'scooter'.
+            names: Optional list of actor names defining the row order. Rows of names
+                missing from the snapshot are NaN and marked invalid. Defaults to all
+                actors of that kind.
+
+        Returns:
+            TransformArrays: Names, x, y, z, yaw and valid arrays.
+        """
+        table = self.transforms.get(kind, {})
+        if names is None:
+            if kind not in self._arrays:
+                self._arrays[kind] = self._build_arrays(list(table), table)
+            return self._arrays[kind]
+        return self._build_arrays(list(names), table)
+
+    @staticmethod
+    def _build_arrays(names, table):
+        """Build a TransformArrays from a list of names and a transform table.
+
+        Args:
+            names: Actor names defining the row order.
+            table: Mapping from actor name to (x, y, z, yaw).
+
+        Returns:
+            TransformArrays: The struct-of-arrays view.
+        """
+        values = np.full((len(names), 4), np.nan)
+        valid = np.zeros(len(names), dtype=bool)
+        for row, name in enumerate(names):
+            transform = table.get(name)
+            if transform is not None:
+                values[row] = transform
+                valid[row] = True
+        return TransformArrays(names, values[:, 0], values[:, 1], values[:, 2], values[:, 3], valid)
@@ -1,7 +1,6 @@
 """Local Planner module: translates high-level plans into simulator actions."""
 
 import math
-import time
 from threading import Event
 from typing import Optional
 
@@ -19,6 +18,7 @@ from simworld.local_planner.prompt.prompt import (NAVIGATION_SYSTEM_PROMPT,
 from simworld.map.map import Map
 from simworld.traffic.base.traffic_signal import TrafficSignalState
 from simworld.utils.logger import Logger
+from simworld.utils.sim_clock import SimClock
 from simworld.utils.vector import Vector
 
 
@@ -33,7 +33,8 @@ class LocalPlanner:
         dt: float = 0.1,
         observation_viewmode: str = 'lit',
         rule_based: bool = True,
-        exit_event: Event = None
+        exit_event: Event = None,
+        clock: SimClock = None
     ):
         """Initialize the Local Planner.
 
@@ -46,6 +47,8 @@ class LocalPlanner:
             observation_viewmode: Rendering mode for observations.
             rule_based: Whether to use rule-based navigation.
             exit_event: Event to signal when the agent should stop.
+            clock: Clock the planner waits on, usually the one driving the traffic simulation.
+                If None, a real-time clock with step ``dt`` is used.
         """
         self.model = model
         self.agent = agent
@@ -70,6 +73,7 @@ class LocalPlanner:
         self.rule_based = rule_based
         self.dt = dt
         self.exit_event = exit_event
+        self.clock = clock if clock is not None else SimClock(dt)
         self.logger = Logger.get_logger('LocalPlanner')
 
         self.action_history = []
@@ -152,43 +156,35 @@ class LocalPlanner:
                         left_time = traffic_light.get_left_time()
                         if state[1] == TrafficSignalState.PEDESTRIAN_GREEN and left_time > min(15, self.agent.config['traffic.traffic_signal.pedestrian_green_light_duration']):
                             break
-                        time.sleep(self.dt)
+                        self.clock.sleep(self.dt, self.exit_event)
 
-        time.sleep(2)
+        self.clock.sleep(2, self.exit_event)
         self.communicator.humanoid_move_forward(self.agent.id)
         while not self._walk_arrive_at_waypoint(point) and (self.exit_event is None or not self.exit_event.is_set()):
             while not self._align_direction(point) and (self.exit_event is None or not self.exit_event.is_set()):
                 self.communicator.humanoid_stop(self.agent.id)
                 angle, turn = self._get_angle_and_direction(point)
                 self.communicator.humanoid_rotate(self.agent.id, angle, turn)
-                time.sleep(self.dt)
+                self.clock.sleep(self.dt, self.exit_event)
             self.communicator.humanoid_move_forward(self.agent.id)
-            time.sleep(self.dt)
+            self.clock.sleep(self.dt, self.exit_event)
         self.communicator.humanoid_stop(self.agent.id)
 
     def navigate_vision_based(self, point: Vector) -> None:
         """Placeholder for vision-based navigation logic."""
         self.logger.info(f'Agent {self.agent.id} is navigating to {point}, current position: {self.agent.position}, vision based mode')
         while not self._walk_arrive_at_waypoint(point) and (self.exit_event is None or not self.exit_event.is_set()):
-            time.sleep(self.dt)
+            self.clock.sleep(self.dt, self.exit_event)
 
-            # validate camera binding before requesting image — rebind if camera is far from actor
+            # validate camera binding before requesting image — the binding is cached by the
+            # communicator and only re-resolved after spawn, respawn or scooter events
             if self.communicator is not None:
                 try:
                     actor_name = self.communicator.get_humanoid_name(self.agent.id)
-                    actor_loc = self.communicator.unrealcv.get_location(actor_name)
-                    try:
-                        cam_loc = self.communicator.unrealcv.get_camera_location(self.camera_id)
-                        dist = float(((cam_loc - actor_loc) ** 2).sum()) ** 0.5
-                    except Exception:
-                        dist = float('inf')
-                    # threshold (Unreal units). Config key optional; default 50.0
-                    threshold = self.agent.config.get('camera.rebind_distance_threshold', 50.0)
-                    if dist > threshold:
-                        found_cam = self.communicator.find_camera_id_for_actor(actor_name)
-                        if found_cam is not None:
-                            self.camera_id = found_cam
-                            self.agent.camera_id = found_cam
+                    found_cam = self.communicator.find_camera_id_for_actor(actor_name)
+                    if found_cam is not None:
+                        self.camera_id = found_cam
+                        self.agent.camera_id = found_cam
                 except Exception:
                     pass
 
@@ -3,6 +3,8 @@
 This module defines the traffic lane class used to represent road lanes
 where vehicles can travel in the simulation.
 """
+import bisect
+
 from simworld.utils.vector import Vector
 
 
@@ -10,7 +12,9 @@ class TrafficLane:
     """Represents a traffic lane in the simulation.
 
     A traffic lane is a part of a road where vehicles can travel in one direction.
-    It maintains its start and end points, direction, and a list of vehicles on it.
+    It maintains its start and end points, direction, and a list of vehicles on it,
+    ordered by their arc position from the start to the end of the lane, so that the
+    vehicle ahead of any vehicle is found without scanning the other vehicles.
     """
     _id_counter = 0
 
@@ -27,9 +31,13 @@ class TrafficLane:
         self.road_id = road_id
         self.start = start
         self.end = end
-        self.vehicles = []
+        self.vehicles = []  # ordered by arc position, from the start to the end of the lane
         self.direction = self.get_direction()
 
+        # Arc position of each vehicle in self.vehicles, and index of each vehicle in it
+        self._arcs = []
+        self._ranks = {}
+
     @classmethod
     def reset_id_counter(cls):
         """Reset the ID counter for traffic lanes.
@@ -54,13 +62,28 @@ class TrafficLane:
         """
         return f'Lane(id={self.id}, road_id={self.road_id}, start={self.start}, end={self.end}, direction={self.direction})'
 
+    def arc_position(self, position: Vector) -> float:
+        """Get the distance along the lane from its start to the projection of a position.
+
+        Args:
+            position: The position to project onto the lane axis.
+
+        Returns:
+            Arc position, negative before the start of the lane.
+        """
+        return (position.x - self.start.x) * self.direction.x + (position.y - self.start.y) * self.direction.y
+
     def add_vehicle(self, vehicle):
-        """Add a vehicle to this lane.
+        """Add a vehicle to this lane, at the place of its current arc position.
 
         Args:
             vehicle: The vehicle object to add to the lane.
         """
-        self.vehicles.append(vehicle)
+        arc = self.arc_position(vehicle.position)
+        index = bisect.bisect_right(self._arcs, arc)
+        self.vehicles.insert(index, vehicle)
+        self._arcs.insert(index, arc)
+        self._update_ranks(index)
 
     def remove_vehicle(self, vehicle):
         """Remove a vehicle from this lane.
@@ -68,4 +91,58 @@ class TrafficLane:
         Args:
             vehicle: The vehicle object to remove from the lane.
         """
-        self.vehicles.remove(vehicle)
+        index = self._ranks.pop(vehicle)
+        del self.vehicles[index]
+        del self._arcs[index]
+        self._update_ranks(index)
+
+    def update_order(self):
+        """Refresh the arc positions of the vehicles after they moved, and reorder them.
+
+        Vehicles rarely overtake each other within a lane, so the list is usually still
+        sorted and the refresh costs one pass over the vehicles of the lane.
+        """
+        arcs = [self.arc_position(vehicle.position) for vehicle in self.vehicles]
+        if all(a <= b for a, b in zip(arcs, arcs[1:])):
+            self._arcs = arcs
+            return
+        order = sorted(range(len(arcs)), key=arcs.__getitem__)
+        self.vehicles[:] = [self.vehicles[i] for i in order]
+        self._arcs = [arcs[i] for i in order]
+        self._update_ranks(0)
+
+    def get_leader(self, vehicle):
+        """Get the vehicle directly ahead of a vehicle on this lane, and the gap to it.
+
+        Arc positions are those of the last ``update_order``, or of when the vehicles
+        were added to the lane.
+
+        Args:
+            vehicle: A vehicle on this lane.
+
+        Returns:
+            Tuple of the leading vehicle and the bumper-to-bumper distance to it along
+            the lane, or (None, inf) if the vehicle is the first one on the lane.
+        """
+        index = self._ranks[vehicle] + 1
+        if index == len(self.vehicles):
+            return None, float('inf')
+        leader = self.vehicles[index]
+        return leader, self._arcs[index] - self._arcs[index - 1] - (leader.length + vehicle.length) / 2
+
+    def get_follower(self, vehicle):
+        """Get the vehicle directly behind a vehicle on this lane.
+
+        Args:
+            vehicle: A vehicle on this lane.
+
+        Returns:
+            The following vehicle, or None if the vehicle is the last one on the lane.
+        """
+        index = self._ranks[vehicle]
+        return self.vehicles[index - 1] if index > 0 else None
+
+    def _update_ranks(self, start):
+        """Re-index the vehicles from a position of the list on."""
+        for index in range(start, len(self.vehicles)):
+            self._ranks[self.vehicles[index]] = index
@@ -0,0 +1,542 @@
+"""Partitioned traffic controller module for simulating large road networks in parallel.
+
+This module splits the intersections of the road network into regions and runs the
+vehicle, pedestrian and intersection managers of each region in a worker process.
+The controller in the main process acts as the coordinator of a tick:
+
+1. it reads the physical state of all agents and traffic signals, as ``TrafficController`` does,
+   and publishes it to the workers through a shared-memory array;
+2. every worker updates the agents and intersections it owns, recording the commands it
+   would send to the simulator;
+3. agents that moved to a lane or sidewalk of another region are handed off to the
+   worker of that region, which owns them from the next tick on;
+4. the coordinator merges the command batches of all workers and sends them at once.
+
+Every worker builds the same road network and agents as the coordinator from the map
+file and the seed, so that only the state that changes has to cross process boundaries.
+"""
+import random
+import traceback
+from multiprocessing import get_context, shared_memory
+from queue import Empty
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from simworld.agent.pedestrian import PedestrianState
+from simworld.agent.vehicle import VehicleState
+from simworld.config import Config
+from simworld.traffic.base.intersection import Intersection
+from simworld.traffic.base.traffic_signal import TrafficSignalState
+from simworld.traffic.controller.traffic_controller import TrafficController
+from simworld.utils.logger import Logger
+from simworld.utils.vector import Vector
+
+# Shared state array: one (x, y, yaw) row per vehicle and pedestrian, then one
+# (vehicle green, pedestrian green, left time) row per traffic signal
+_NUM_COLUMNS = 3
+
+
+def _state_rows(vehicles, pedestrians, traffic_signals) -> np.ndarray:
+    """Get the rows of the shared state array.
+
+    Returns:
+        np.ndarray: One row per vehicle, pedestrian and traffic signal, in this order.
+    """
+    rows = [(agent.position.x, agent.position.y, agent.yaw) for agent in vehicles]
+    rows.extend((agent.position.x, agent.position.y, agent.yaw) for agent in pedestrians)
+    for signal in traffic_signals:
+        vehicle_state, pedestrian_state = signal.get_state()
+        rows.append((vehicle_state == TrafficSignalState.VEHICLE_GREEN,
+                     pedestrian_state == TrafficSignalState.PEDESTRIAN_GREEN, signal.get_left_time()))
+    return np.array(rows, dtype=np.float64).reshape(-1, _NUM_COLUMNS)
+
+
+def partition_intersections(intersections: List[Intersection], num_regions: int) -> Dict[int, int]:
+    """Split intersections into regions of about the same number of intersections.
+
+    The regions are strips across the longer side of the map, so that most roads
+    connect intersections of the same region.
+
+    Args:
+        intersections: List of intersections.
+        num_regions: Number of regions.
+
+    Returns:
+        dict: Region of each intersection, by intersection ID.
+
+    Raises:
+        ValueError: If the number of regions is not positive.
+    """
+    if num_regions < 1:
+        raise ValueError(f'Number of regions must be positive, got: {num_regions}')
+    if not intersections:
+        return {}
+    centers = np.array([(intersection.center.x, intersection.center.y) for intersection in intersections])
+    axis = int(np.ptp(centers[:, 1]) > np.ptp(centers[:, 0]))
+    order = np.lexsort((centers[:, 1 - axis], centers[:, axis]))
+    regions = {}
+    for region, rows in enumerate(np.array_split(order, min(num_regions, len(intersections)))):
+        for row in rows:
+            regions[intersections[row].id] = region
+    return regions
+
+
+def merge_command_batches(batches: List[list]) -> list:
+    """Merge the command batches of the region workers into one batch.
+
+    The vehicle state updates of all regions are combined into a single
+    ``update_vehicles`` command, sent after the other commands so that e.g. a U-turn
+    still precedes the controls of the vehicle making it.
+
+    Args:
+        batches: Lists of (command name, arguments) pairs, in region order.
+
+    Returns:
+        list: Merged (command name, arguments) pairs.
+    """
+    merged = []
+    vehicle_states = {}
+    for batch in batches:
+        for name, args in batch:
+            if name == 'update_vehicles':
+                vehicle_states.update(args[0])
+            else:
+                merged.append((name, args))
+    if vehicle_states:
+        merged.append(('update_vehicles', (vehicle_states,)))
+    return merged
+
+
+class CommandBatch:
+    """Stand-in for the communicator of a region worker, recording the commands of one tick."""
+
+    COMMANDS = ('update_vehicle', 'update_vehicles', 'vehicle_make_u_turn', 'pedestrian_move_forward',
+                'pedestrian_rotate', 'pedestrian_stop', 'set_pedestrian_speed', 'traffic_signal_switch_to',
+                'traffic_signal_set_duration')
+
+    def __init__(self):
+        """Initialize an empty batch."""
+        self.commands = []
+
+    def __getattr__(self, name):
+        """Get a function recording a call to a communicator command.
+
+        Raises:
+            AttributeError: If the command is not one the traffic managers send.
+        """
+        if name not in CommandBatch.COMMANDS:
+            raise AttributeError(f'{type(self).__name__} does not record {name}')
+        return lambda *args: self.commands.append((name, args))
+
+
+class RegionWorker:
+    """Simulates the agents and intersections of one region on a full copy of the traffic.
+
+    All agents stay in the copy, so that the agents of the region see the ones of the
+    other regions near the border, but only the owned ones are updated. Vehicles are
+    owned by the region of the intersection their lane leads to, and pedestrians by
+    the region of their sidewalk.
+    """
+
+    def __init__(self, region: int, controller: TrafficController, intersection_regions: Dict[int, int]):
+        """Initialize the worker.
+
+        Args:
+            region: Region index.
+            controller: Traffic controller holding a full copy of the road network and agents.
+            intersection_regions: Region of each intersection, by intersection ID.
+        """
+        self.region = region
+        self.controller = controller
+        self.logger = Logger.get_logger('RegionWorker')
+
+        self.vehicles = list(controller.vehicles)
+        self.pedestrians = list(controller.pedestrians)
+        self.traffic_signals = controller.traffic_signals
+        self.lanes = {lane.id: lane for lane in controller.lanes}
+        self.sidewalks = {sidewalk.id: sidewalk for sidewalk in controller.sidewalks}
+        self.intersections = [intersection for intersection in controller.intersections
+                              if intersection_regions[intersection.id] == region]
+
+        self.lane_regions = {}
+        self.sidewalk_regions = {}
+        for intersection in controller.intersections:
+            intersection_region = intersection_regions[intersection.id]
+            for lane in intersection.lanes:
+                self.lane_regions[lane.id] = intersection_region
+            for sidewalk in intersection.sidewalks:
+                self.sidewalk_regions[sidewalk.id] = min(intersection_region,
+                                                         self.sidewalk_regions.get(sidewalk.id, intersection_region))
+
+        if controller.vehicle_manager.vectorized:
+            # The batched proximity checks only see the vehicles of the region, not the ones across the border
+            self.logger.warning('Vectorized vehicle updates are not supported by region workers, using the scalar path')
+            controller.vehicle_manager.vectorized = False
+
+        # Same initial state as the coordinator, which only publishes what changed since
+        self._last_states = _state_rows(self.vehicles, self.pedestrians, self.traffic_signals)
+        self._num_agents = len(self.vehicles) + len(self.pedestrians)
+        self._owned_rows = np.zeros(self._num_agents, dtype=bool)
+        self._bounds = self._region_bounds(controller)
+        signal_xy = np.array([(signal.position.x, signal.position.y) for signal in self.traffic_signals]).reshape(-1, 2)
+        self._signal_rows = self._in_bounds(signal_xy[:, 0], signal_xy[:, 1])
+
+        self.owned_vehicles = {vehicle.id for vehicle in self.vehicles if self._vehicle_region(vehicle) == region}
+        self.owned_pedestrians = {pedestrian.id for pedestrian in self.pedestrians
+                                  if self._pedestrian_region(pedestrian) == region}
+        self._update_ownership()
+
+    def tick(self, states: np.ndarray, handoffs: list):
+        """Update the owned agents and intersections for one tick.
+
+        Args:
+            states: Shared state array of the vehicles, pedestrians and traffic signals.
+            handoffs: Agents handed off to this region since the last tick.
+
+        Returns:
+            tuple: (commands, handoffs), the recorded commands and the agents leaving the region.
+        """
+        for handoff in handoffs:
+            self._receive(handoff)
+        if handoffs:
+            self._update_ownership()
+        self._apply_states(states)
+
+        controller = self.controller
+        controller.vehicle_hash.update(self.vehicles)
+        controller.pedestrian_hash.update(self.pedestrians)
+
+        batch = CommandBatch()
+        controller.vehicle_manager.update_vehicles(batch, controller.intersection_manager, self.pedestrians,
+                                                   controller.vehicle_hash, controller.pedestrian_hash)
+        controller.pedestrian_manager.update_pedestrians(batch, controller.intersection_manager)
+        controller.intersection_manager.update_intersections(batch, self.intersections)
+        return batch.commands, self._hand_off()
+
+    def _vehicle_region(self, vehicle):
+        """Get the region owning a vehicle."""
+        return self.lane_regions.get(vehicle.current_lane.id, self.region)
+
+    def _pedestrian_region(self, pedestrian):
+        """Get the region owning a pedestrian."""
+        return self.sidewalk_regions.get(pedestrian.current_sidewalk.id, self.region)
+
+    def _update_ownership(self):
+        """Make the managers update the owned agents only, in ID order."""
+        vehicle_manager = self.controller.vehicle_manager
+        vehicle_manager.vehicles = [vehicle for vehicle in self.vehicles if vehicle.id in self.owned_vehicles]
+        vehicle_manager.arrays = None
+        self.controller.pedestrian_manager.pedestrians = [pedestrian for pedestrian in self.pedestrians
+                                                          if pedestrian.id in self.owned_pedestrians]
+        self._owned_rows[:] = False
+        self._owned_rows[list(self.owned_vehicles)] = True
+        self._owned_rows[[len(self.vehicles) + pedestrian_id for pedestrian_id in self.owned_pedestrians]] = True
+
+    def _region_bounds(self, controller):
+        """Get the box around the lanes and sidewalks of the region, widened by the detection range.
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y).
+        """
+        points = [(point.x, point.y) for lane in self.lanes.values() if self.lane_regions.get(lane.id) == self.region
+                  for point in (lane.start, lane.end)]
+        points.extend((point.x, point.y) for sidewalk in self.sidewalks.values()
+                      if self.sidewalk_regions.get(sidewalk.id) == self.region for point in (sidewalk.start, sidewalk.end))
+        if not points:
+            return (0.0, 0.0, 0.0, 0.0)
+        config = controller.config
+        margin = (config['traffic.intersection_offset'] + 1.5 * config['traffic.distance_between_objects']
+                  + 2 * controller.vehicle_manager.max_vehicle_length)
+        points = np.array(points)
+        return (*(points.min(axis=0) - margin), *(points.max(axis=0) + margin))
+
+    def _in_bounds(self, x, y):
+        """Check which positions lie in the box of the region.
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        min_x, min_y, max_x, max_y = self._bounds
+        return (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+
+    def _apply_states(self, states: np.ndarray):
+        """Copy the positions, directions and signal states that changed since the last tick.
+
+        Only the owned agents and the agents and signals around the region are kept up to
+        date, the others cannot affect the agents of the region.
+        """
+        num_vehicles, num_agents = len(self.vehicles), self._num_agents
+        relevant = np.concatenate([self._owned_rows | self._in_bounds(states[:num_agents, 0], states[:num_agents, 1]),
+                                   self._signal_rows])
+        rows = np.flatnonzero(relevant & (states != self._last_states).any(axis=1))
+        self._last_states[rows] = states[rows]
+
+        for row, (x, y, value) in zip(rows.tolist(), self._last_states[rows].tolist()):
+            if row < num_agents:
+                agent = self.vehicles[row] if row < num_vehicles else self.pedestrians[row - num_vehicles]
+                agent.position = Vector(x, y)
+                agent.direction = value
+            else:
+                signal = self.traffic_signals[row - num_agents]
+                if x:
+                    signal.set_state((TrafficSignalState.VEHICLE_GREEN, TrafficSignalState.PEDESTRIAN_RED))
+                elif y:
+                    signal.set_state((TrafficSignalState.VEHICLE_RED, TrafficSignalState.PEDESTRIAN_GREEN))
+                else:
+                    signal.set_state((TrafficSignalState.VEHICLE_RED, TrafficSignalState.PEDESTRIAN_RED))
+                signal.set_left_time(value)
+
+    def _hand_off(self):
+        """Release the owned agents that moved to another region.
+
+        Returns:
+            list: One handoff record per released agent, with the state needed to resume it.
+        """
+        handoffs = []
+        last_states = self.controller.vehicle_manager.last_states
+        for vehicle in self.controller.vehicle_manager.vehicles:
+            region = self._vehicle_region(vehicle)
+            if region != self.region:
+                self.owned_vehicles.discard(vehicle.id)
+                handoffs.append({
+                    'region': region, 'type': 'vehicle', 'id': vehicle.id, 'lane': vehicle.current_lane.id,
+                    'state': vehicle.state.name, 'waypoints': [(point.x, point.y) for point in vehicle.waypoints],
+                    'controls': vehicle.get_attributes(), 'last_controls': last_states.pop(vehicle.id, None),
+                    'pid': (vehicle.steering_pid.p_error, vehicle.steering_pid.i_error),
+                })
+        for pedestrian in self.controller.pedestrian_manager.pedestrians:
+            region = self._pedestrian_region(pedestrian)
+            if region != self.region:
+                self.owned_pedestrians.discard(pedestrian.id)
+                handoffs.append({
+                    'region': region, 'type': 'pedestrian', 'id': pedestrian.id, 'sidewalk': pedestrian.current_sidewalk.id,
+                    'state': pedestrian.state.name, 'waypoints': [(point.x, point.y) for point in pedestrian.waypoints],
+                })
+        if handoffs:
+            self._update_ownership()
+        return handoffs
+
+    def _receive(self, handoff: dict):
+        """Take over an agent handed off by another region."""
+        waypoints = [Vector(x, y) for x, y in handoff['waypoints']]
+        if handoff['type'] == 'vehicle':
+            vehicle = self.vehicles[handoff['id']]
+            lane = self.lanes[handoff['lane']]
+            if vehicle.current_lane is not lane:
+                vehicle.current_lane.remove_vehicle(vehicle)
+                vehicle.current_lane = lane
+                lane.add_vehicle(vehicle)
+            vehicle.state = VehicleState[handoff['state']]
+            vehicle.waypoints = waypoints
+            vehicle.set_attributes(*handoff['controls'])
+            vehicle.steering_pid.p_error, vehicle.steering_pid.i_error = handoff['pid']
+            if handoff['last_controls'] is not None:
+                self.controller.vehicle_manager.last_states[vehicle.id] = handoff['last_controls']
+            self.owned_vehicles.add(vehicle.id)
+        else:
+            pedestrian = self.pedestrians[handoff['id']]
+            sidewalk = self.sidewalks[handoff['sidewalk']]
+            if pedestrian.current_sidewalk is not sidewalk:
+                if pedestrian in pedestrian.current_sidewalk.pedestrians:
+                    pedestrian.current_sidewalk.pedestrians.remove(pedestrian)
+                pedestrian.current_sidewalk = sidewalk
+                sidewalk.pedestrians.append(pedestrian)
+            pedestrian.state = PedestrianState[handoff['state']]
+            pedestrian.waypoints = waypoints
+            self.owned_pedestrians.add(pedestrian.id)
+
+
+def _run_region_worker(region, intersection_regions, controller_args, shared_name, shape, inbox, outbox):
+    """Entry point of a region worker process.
+
+    Args:
+        region: Region index.
+        intersection_regions: Region of each intersection, by intersection ID.
+        controller_args: (config, num_vehicles, num_pedestrians, map, seed, dt) of the coordinator.
+        shared_name: Name of the shared memory block of the state array.
+        shape: Shape of the state array.
+        inbox: Queue of the tick messages for this worker.
+        outbox: Queue of the replies of all workers.
+    """
+    shared = None
+    try:
+        controller = TrafficController(*controller_args)
+        random.seed(f'{controller.seed}-{region}')
+        worker = RegionWorker(region, controller, intersection_regions)
+        shared = shared_memory.SharedMemory(name=shared_name)
+        states = np.ndarray(shape, dtype=np.float64, buffer=shared.buf)
+        outbox.put((region, 'ready', None))
+        while True:
+            message, handoffs = inbox.get()
+            if message == 'stop':
+                break
+            outbox.put((region, 'tick', worker.tick(states, handoffs)))
+    except Exception:
+        outbox.put((region, 'error', traceback.format_exc()))
+    finally:
+        if shared is not None:
+            shared.close()
+
+
+class PartitionedTrafficController(TrafficController):
+    """Traffic controller running the traffic managers of each map region in a worker process.
+
+    It is used like ``TrafficController``. The workers are started on the first
+    ``step`` and stopped by ``stop_workers``, which ``stop_simulation`` calls. The agents
+    of the controller itself keep their physical state up to date, while their routes
+    and manager state live in the workers.
+    """
+
+    def __init__(self, config: Config, num_regions: int = None, num_vehicles: int = None, num_pedestrians: int = None,
+                 map: str = None, seed: int = None, dt: float = None, clock=None):
+        """Initialize the controller and partition the road network.
+
+        Args:
+            config: Configuration object containing all simulation parameters.
+            num_regions: Number of regions and worker processes.
+            num_vehicles: Number of vehicles to spawn.
+            num_pedestrians: Number of pedestrians to spawn.
+            map: Path to the map file.
+            seed: Seed for the random number generator.
+            dt: Time step for the simulation.
+            clock: Clock pacing the simulation.
+        """
+        # The workers rebuild the traffic in fresh processes, where the IDs start from 0
+        self.reset_id_counters()
+        super().__init__(config, num_vehicles, num_pedestrians, map, seed, dt, clock)
+        self.num_regions = num_regions if num_regions is not None else config['traffic.partition.num_regions']
+        self.worker_timeout = config['traffic.partition.worker_timeout']
+        self.intersection_regions = partition_intersections(self.intersections, self.num_regions)
+
+        self._workers = []
+        self._shared = None
+        self._states = None
+        self._outbox = None
+        self._handoffs = {}
+
+    def start_workers(self):
+        """Start one worker process per region and wait until they are ready.
+
+        Raises:
+            RuntimeError: If a worker fails to start.
+        """
+        if self._workers:
+            return
+        num_rows = len(self.vehicles) + len(self.pedestrians) + len(self.traffic_signals)
+        shape = (num_rows, _NUM_COLUMNS)
+        self._shared = shared_memory.SharedMemory(create=True, size=max(num_rows, 1) * _NUM_COLUMNS * 8)
+        self._states = np.ndarray(shape, dtype=np.float64, buffer=self._shared.buf)
+        self._publish_states()
+
+        context = get_context('spawn')
+        self._outbox = context.Queue()
+        controller_args = (self.config, self.num_vehicles, self.num_pedestrians, self.map, self.seed, self.dt)
+        regions = sorted(set(self.intersection_regions.values()))
+        for region in regions:
+            inbox = context.Queue()
+            process = context.Process(target=_run_region_worker, daemon=True,
+                                      args=(region, self.intersection_regions, controller_args, self._shared.name,
+                                            shape, inbox, self._outbox))
+            process.start()
+            self._workers.append((process, inbox))
+        self._handoffs = {region: [] for region in regions}
+
+        try:
+            self._gather('ready')
+        except RuntimeError:
+            self.stop_workers()
+            raise
+        self.logger.info(f'Started {len(self._workers)} region workers')
+
+    def stop_workers(self):
+        """Stop the worker processes and release the shared memory."""
+        for process, inbox in self._workers:
+            if process.is_alive():
+                inbox.put(('stop', None))
+        for process, _ in self._workers:
+            process.join(timeout=self.worker_timeout)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+        if self._shared is not None:
+            self._states = None
+            self._shared.close()
+            self._shared.unlink()
+            self._shared = None
+
+    def step(self, physical_update_function: Callable = None):
+        """Advance the traffic simulation by one tick, with the regions updated in parallel.
+
+        Args:
+            physical_update_function: Function to update the physical state of the simulation,
+                e.g. ``update_states``. Skipped if None.
+        """
+        if not self._workers:
+            self.start_workers()
+
+        self.communicator.next_tick()
+        if physical_update_function is not None:
+            physical_update_function()
+        self.update_spatial_hashes()
+        self._publish_states()
+
+        for region, (_, inbox) in enumerate(self._workers):
+            inbox.put(('tick', self._handoffs[region]))
+            self._handoffs[region] = []
+        results = self._gather('tick')
+
+        batches = []
+        for region in sorted(results):
+            commands, handoffs = results[region]
+            batches.append(commands)
+            for handoff in handoffs:
+                self._handoffs[handoff['region']].append(handoff)
+        for name, args in merge_command_batches(batches):
+            getattr(self.communicator, name)(*args)
+        self.communicator.flush()
+
+    def stop_simulation(self):
+        """Stop the traffic simulation and the worker processes."""
+        super().stop_simulation()
+        self.stop_workers()
+
+    def reset(self, num_vehicles: int, num_pedestrians: int, map: str):
+        """Reset the simulation with new parameters, restarting the workers on the next step.
+
+        Args:
+            num_vehicles: New number of vehicles to spawn.
+            num_pedestrians: New number of pedestrians to spawn.
+            map: Path to the new map file to use.
+        """
+        self.stop_workers()
+        super().reset(num_vehicles, num_pedestrians, map)
+        self.intersection_regions = partition_intersections(self.intersections, self.num_regions)
+
+    def _publish_states(self):
+        """Write the physical state of all agents and traffic signals to the shared array."""
+        self._states[:] = _state_rows(self.vehicles, self.pedestrians, self.traffic_signals)
+
+    def _gather(self, expected: str):
+        """Wait for one reply of every worker.
+
+        Args:
+            expected: Kind of reply to wait for.
+
+        Returns:
+            dict: Payload of each reply, by region.
+
+        Raises:
+            RuntimeError: If a worker fails or does not reply in time.
+        """
+        results = {}
+        while len(results) < len(self._workers):
+            try:
+                region, kind, payload = self._outbox.get(timeout=self.worker_timeout)
+            except Empty:
+                raise RuntimeError(f'Region workers did not reply within {self.worker_timeout} s')
+            if kind == 'error':
+                raise RuntimeError(f'Region worker {region} failed:\n{payload}')
+            if kind == expected:
+                results[region] = payload
+        return results
@@ -27,6 +27,8 @@ from simworld.traffic.manager.pedestrian_manager import PedestrianManager
 from simworld.traffic.manager.vehicle_manager import VehicleManager
 from simworld.utils.load_json import load_json
 from simworld.utils.logger import Logger
+from simworld.utils.sim_clock import SimClock
+from simworld.utils.spatial_hash import SpatialHash
 from simworld.utils.vector import Vector
 
 
@@ -36,7 +38,8 @@ class TrafficController:
     Coordinates all aspects of the traffic simulation including road network, vehicles,
     pedestrians, and traffic signals.
     """
-    def __init__(self, config: Config, num_vehicles: int = None, num_pedestrians: int = None, map: str = None, seed: int = None, dt: float = None):
+    def __init__(self, config: Config, num_vehicles: int = None, num_pedestrians: int = None, map: str = None, seed: int = None, dt: float = None,
+                 clock: SimClock = None):
         """Initialize the traffic controller with configuration.
 
         Args:
@@ -46,6 +49,8 @@ class TrafficController:
             map: Path to the map file.
             seed: Seed for the random number generator.
             dt: Time step for the simulation.
+            clock: Clock pacing the simulation. If None, one is created with the communicator,
+                in the mode given by ``simworld.clock_mode``.
         """
         self.config = config
         self.num_vehicles = num_vehicles if num_vehicles is not None else config['traffic.num_vehicles']
@@ -54,6 +59,7 @@ class TrafficController:
         self.seed = seed if seed is not None else config['simworld.seed']
         self.dt = dt if dt is not None else config['simworld.dt']
         self.communicator = None
+        self.clock = clock
 
         # logger
         self.logger = Logger.get_logger('TrafficController')
@@ -69,6 +75,7 @@ class TrafficController:
         self.intersection_manager = IntersectionManager(self.intersections, self.config)
         self.vehicle_manager = VehicleManager(self.roads, self.num_vehicles, self.config)
         self.pedestrian_manager = PedestrianManager(self.roads, self.num_pedestrians, self.config)
+        self.init_spatial_hashes()
 
     # Initialization
     def init_communicator(self, communicator=None):
@@ -81,9 +88,13 @@ class TrafficController:
             self.communicator = Communicator(UnrealCV(port=9000, ip='127.0.0.1', resolution=(720, 600)))
         else:
             self.communicator = communicator
+        if self.clock is None:
+            self.clock = SimClock(self.dt, self.config['simworld.clock_mode'], self.communicator.unrealcv)
 
     def disconnect_communicator(self):
         """Disconnect the communication interface from the simulation environment."""
+        if self.clock is not None:
+            self.clock.close()
         self.communicator.disconnect()
 
     def init_roadnet_from_file(self, file_path):
@@ -155,6 +166,17 @@ class TrafficController:
 
         self.logger.info('Road network initialization completed')
 
+    def init_spatial_hashes(self):
+        """Initialize the spatial hashes used for neighbor queries between agents.
+
+        The cells are about as large as the vehicle detection distance, so a vehicle
+        only has to look at the objects in its own and the adjacent cells.
+        """
+        cell_size = 1.5 * self.config['traffic.distance_between_objects'] + self.vehicle_manager.max_vehicle_length
+        self.vehicle_hash = SpatialHash(cell_size)
+        self.pedestrian_hash = SpatialHash(cell_size)
+        self.update_spatial_hashes()
+
     def spawn_objects_in_unreal_engine(self):
         """Spawn all traffic-related objects in the Unreal Engine simulation."""
         try:
@@ -198,14 +220,7 @@ class TrafficController:
 
         self.communicator.clean_traffic_only(self.vehicles, self.pedestrians, self.traffic_signals)
 
-        Vehicle.reset_id_counter()
-        Pedestrian.reset_id_counter()
-        TrafficSignal.reset_id_counter()
-        Road.reset_id_counter()
-        Intersection.reset_id_counter()
-        TrafficLane.reset_id_counter()
-        Sidewalk.reset_id_counter()
-        Crosswalk.reset_id_counter()
+        self.reset_id_counters()
 
         # set seed
         random.seed(self.seed)
@@ -217,18 +232,33 @@ class TrafficController:
         self.intersection_manager = IntersectionManager(self.intersections, self.config)
         self.vehicle_manager = VehicleManager(self.roads, self.num_vehicles, self.config)
         self.pedestrian_manager = PedestrianManager(self.roads, self.num_pedestrians, self.config)
+        self.init_spatial_hashes()
+
+    @staticmethod
+    def reset_id_counters():
+        """Reset the ID counters of all traffic objects, so that IDs start from 0 again."""
+        Vehicle.reset_id_counter()
+        Pedestrian.reset_id_counter()
+        TrafficSignal.reset_id_counter()
+        Road.reset_id_counter()
+        Intersection.reset_id_counter()
+        TrafficLane.reset_id_counter()
+        Sidewalk.reset_id_counter()
+        Crosswalk.reset_id_counter()
 
     def stop_simulation(self):
         """Stop the traffic simulation."""
         self.logger.info('Stopping simulation')
         self.vehicle_manager.stop_vehicles(self.communicator)
         self.pedestrian_manager.stop_pedestrians(self.communicator)
+        self.communicator.flush()
 
     # Simulation
     def simulation(self, physical_update_function: Callable, exit_event: Event = None, signal_event: Event = None):
         """Run the traffic simulation continuously.
 
-        Continuously updates the state of all simulation components at fixed time intervals.
+        Continuously updates the state of all simulation components at fixed time intervals,
+        driving ``self.clock`` with one tick per update.
 
         Args:
             physical_update_function: Function to update the physical state of the simulation.
@@ -240,18 +270,17 @@ class TrafficController:
             self.pedestrian_manager.set_pedestrians_max_speed(self.communicator)
             self.intersection_manager.set_traffic_signal_duration(self.communicator)
 
-            while not (exit_event and exit_event.is_set()):
-                physical_update_function()
-                self.vehicle_manager.update_vehicles(self.communicator, self.intersection_manager, self.pedestrians)
-                self.pedestrian_manager.update_pedestrians(self.communicator, self.intersection_manager)
-                self.intersection_manager.update_intersections(self.communicator)
+            with self.clock.driving():
+                while not (exit_event and exit_event.is_set()):
+                    self.step(physical_update_function)
 
-                if signal_event is not None:
-                    while not signal_event.is_set():
-                        time.sleep(self.dt)
-                        signal_event.clear()  # Reset the event for next iteration
-                else:
-                    time.sleep(self.dt)
+                    if signal_event is not None:
+                        while not signal_event.is_set():
+                            time.sleep(self.dt)
+                            signal_event.clear()  # Reset the event for next iteration
+                        self.clock.tick(pace=False)
+                    else:
+                        self.clock.tick()
 
             self.stop_simulation()
             self.logger.info('Simulation ended')
@@ -266,12 +295,63 @@ class TrafficController:
             traceback.print_exc()
             self.stop_simulation()
 
+    def step(self, physical_update_function: Callable = None):
+        """Advance the traffic simulation by one tick, without waiting.
+
+        ``simulation`` calls this once per time step. It can also be called in a loop
+        directly, e.g. with a ``KinematicCommunicator`` to run as fast as possible.
+
+        Args:
+            physical_update_function: Function to update the physical state of the simulation,
+                e.g. ``update_states``. Skipped if None.
+        """
+        self.communicator.next_tick()
+        if physical_update_function is not None:
+            physical_update_function()
+        self.update_spatial_hashes()
+        self.vehicle_manager.update_vehicles(self.communicator, self.intersection_manager, self.pedestrians,
+                                             self.vehicle_hash, self.pedestrian_hash)
+        self.pedestrian_manager.update_pedestrians(self.communicator, self.intersection_manager)
+        self.intersection_manager.update_intersections(self.communicator)
+        self.communicator.flush()
+
+    def update_spatial_hashes(self):
+        """Move the vehicles and pedestrians that changed cell since the last update."""
+        self.vehicle_hash.update(self.vehicles)
+        self.pedestrian_hash.update(self.pedestrians)
+
+    def get_nearby_vehicles(self, position: Vector, radius: float):
+        """Get the vehicles within a radius of a position.
+
+        Args:
+            position: Center of the search.
+            radius: Search radius.
+
+        Returns:
+            List of vehicles, as of the last spatial hash update.
+        """
+        return [vehicle for vehicle in self.vehicle_hash.query(position, radius) if vehicle.position.distance(position) <= radius]
+
+    def get_nearby_pedestrians(self, position: Vector, radius: float):
+        """Get the pedestrians within a radius of a position, e.g. for crowd avoidance.
+
+        Args:
+            position: Center of the search.
+            radius: Search radius.
+
+        Returns:
+            List of pedestrians, as of the last spatial hash update.
+        """
+        return [pedestrian for pedestrian in self.pedestrian_hash.query(position, radius)
+                if pedestrian.position.distance(position) <= radius]
+
     def update_states(self):
         """Update the states of all traffic components from the simulation."""
         vehicle_ids = [vehicle.id for vehicle in self.vehicles]
         pedestrian_ids = [pedestrian.id for pedestrian in self.pedestrians]
         traffic_signal_ids = [signal.id for signal in self.traffic_signals]
         result = self.communicator.get_position_and_direction(vehicle_ids, pedestrian_ids, traffic_signal_ids)
+        signals_by_id = {signal.id: signal for signal in self.traffic_signals}
         for (type, object_id), values in result.items():
             if type == 'vehicle':
                 position, direction = values
@@ -283,16 +363,15 @@ class TrafficController:
                 self.pedestrians[object_id].direction = direction
             elif type == 'traffic_signal':
                 is_vehicle_green, is_pedestrian_walk, left_time = values
-                for signal in self.traffic_signals:
-                    if signal.id == object_id:
-                        if is_vehicle_green:
-                            signal.set_state((TrafficSignalState.VEHICLE_GREEN, TrafficSignalState.PEDESTRIAN_RED))
-                        elif is_pedestrian_walk:
-                            signal.set_state((TrafficSignalState.VEHICLE_RED, TrafficSignalState.PEDESTRIAN_GREEN))
-                        else:
-                            signal.set_state((TrafficSignalState.VEHICLE_RED, TrafficSignalState.PEDESTRIAN_RED))
-                        signal.set_left_time(left_time)
-                        break
+                signal = signals_by_id.get(object_id)
+                if signal is not None:
+                    if is_vehicle_green:
+                        signal.set_state((TrafficSignalState.VEHICLE_GREEN, TrafficSignalState.PEDESTRIAN_RED))
+                    elif is_pedestrian_walk:
+                        signal.set_state((TrafficSignalState.VEHICLE_RED, TrafficSignalState.PEDESTRIAN_GREEN))
+                    else:
+                        signal.set_state((TrafficSignalState.VEHICLE_RED, TrafficSignalState.PEDESTRIAN_RED))
+                    signal.set_left_time(left_time)
 
     @property
     def vehicles(self):
@@ -206,15 +206,16 @@ class IntersectionManager:
 
         return next_sidewalk, crosswalk, next_waypoints, current_intersection
 
-    def update_intersections(self, communicator: Communicator):
+    def update_intersections(self, communicator: Communicator, intersections: List[Intersection] = None):
         """Control the traffic lights at intersections.
 
         Manages the cycle of traffic signals, switching between vehicle and pedestrian phases.
 
         Args:
             communicator: Interface for communicating with the simulation environment.
+            intersections: Intersections to control, e.g. those of one map region. Defaults to all.
         """
-        for intersection in self.intersections:
+        for intersection in (intersections if intersections is not None else self.intersections):
             if len(intersection.traffic_lights) == 0:
                 continue
 
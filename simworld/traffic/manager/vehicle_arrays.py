@@ -0,0 +1,238 @@
+"""Struct-of-arrays vehicle state module for traffic simulation.
+
+This module mirrors the per-vehicle state used by ``VehicleManager.update_vehicles``
+in NumPy arrays, so that waypoint advancement, the proximity cone checks and the PID
+steering of all vehicles are computed as batched array operations instead of one
+Python call per vehicle and one scan of the whole fleet per vehicle.
+"""
+import numpy as np
+
+from simworld.agent.vehicle import VehicleState
+from simworld.utils.spatial_hash import grid_pairs
+from simworld.utils.vector import Vector
+
+_NO_WAYPOINT = Vector(float('nan'), float('nan'))
+
+# Columns of the per-vehicle table refreshed by VehicleArrays.pull
+_COLUMNS = ('x', 'y', 'yaw', 'dir_x', 'dir_y', 'waypoint_x', 'waypoint_y', 'lane_start_x', 'lane_start_y',
+            'lane_end_x', 'lane_end_y', 'lane_dir_x', 'lane_dir_y', 'throttle', 'brake', 'steering',
+            'p_error', 'i_error', 'state', 'lane')
+_STATE_CODES = {state: state.value for state in VehicleState}
+
+
+def _round(values):
+    """Round to the 4 decimals that ``Vector`` keeps."""
+    return np.round(values, 4)
+
+
+def _normalize(dx, dy):
+    """Normalize 2D vectors like ``Vector.normalize``, mapping zero vectors to zero.
+
+    Returns:
+        tuple: (x, y) arrays of the unit vectors.
+    """
+    magnitude = np.sqrt(dx * dx + dy * dy)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ux = np.where(magnitude > 0, _round(dx / magnitude), 0.0)
+        uy = np.where(magnitude > 0, _round(dy / magnitude), 0.0)
+    return ux, uy
+
+
+class VehicleArrays:
+    """Struct-of-arrays view of a list of vehicles.
+
+    The vehicle objects stay the source of truth: ``pull`` copies their position,
+    heading, head waypoint, lane, control and steering PID state into the arrays,
+    and the manager writes the computed controls back to the objects.
+    """
+
+    def __init__(self, vehicles, config):
+        """Initialize the arrays.
+
+        Args:
+            vehicles: List of vehicles, indexed by vehicle ID.
+            config: Configuration dictionary with simulation parameters.
+        """
+        self.vehicles = vehicles
+        self.length = np.array([vehicle.length for vehicle in vehicles], dtype=float)
+
+        self.distance_between_objects = config['traffic.distance_between_objects']
+        self.detection_angle = config['traffic.detection_angle']
+        self.distance_to_end = config['traffic.vehicle.distance_to_end']
+        self.lane_deviation = config['traffic.vehicle.lane_deviation']
+        self.max_steering = config['traffic.vehicle.max_steering']
+        self.k_p = config['traffic.vehicle.steering_pid.kp']
+        self.k_i = config['traffic.vehicle.steering_pid.ki']
+        self.k_d = config['traffic.vehicle.steering_pid.kd']
+
+        # One row per vehicle, exposed as one array per column (self.x, self.lane_dir_y, ...)
+        self._table = np.zeros((len(vehicles), len(_COLUMNS)))
+        for column, name in enumerate(_COLUMNS):
+            setattr(self, name, self._table[:, column])
+
+    def __len__(self):
+        """Get the number of vehicles.
+
+        Returns:
+            int: Number of vehicles.
+        """
+        return len(self.vehicles)
+
+    def pull(self, rows=None):
+        """Copy the state of vehicles into the arrays.
+
+        Args:
+            rows: Indices of the vehicles to refresh. Defaults to all vehicles.
+        """
+        vehicles = self.vehicles if rows is None else [self.vehicles[row] for row in rows]
+        values = []
+        for vehicle in vehicles:
+            position, direction, lane, pid = vehicle.position, vehicle.direction, vehicle.current_lane, vehicle.steering_pid
+            waypoint = vehicle.waypoints[0] if vehicle.waypoints else _NO_WAYPOINT
+            values.append((position.x, position.y, vehicle.yaw, direction.x, direction.y, waypoint.x, waypoint.y,
+                           lane.start.x, lane.start.y, lane.end.x, lane.end.y, lane.direction.x, lane.direction.y,
+                           vehicle.throttle, vehicle.brake, vehicle.steering, pid.p_error, pid.i_error,
+                           _STATE_CODES[vehicle.state], lane.id))
+        if not values:
+            return
+        if rows is None:
+            self._table[:] = values
+        else:
+            self._table[rows] = values
+
+    @property
+    def has_waypoint(self):
+        """Whether each vehicle has a waypoint left."""
+        return ~np.isnan(self.waypoint_x)
+
+    def in_state(self, *states):
+        """Get which vehicles are in one of the given states.
+
+        Args:
+            *states: VehicleState values.
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        return np.isin(self.state, [_STATE_CODES[state] for state in states])
+
+    def passed_waypoints(self):
+        """Get the vehicles whose head waypoint is behind them.
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        ux, uy = _normalize(self.waypoint_x - self.x, self.waypoint_y - self.y)
+        with np.errstate(invalid='ignore'):
+            return _round(self.dir_x * ux + self.dir_y * uy) < 0
+
+    def close_to_end(self):
+        """Get the vehicles that are close to the end of their lane.
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        dx = self.x - self.lane_end_x
+        dy = self.y - self.lane_end_y
+        return np.sqrt(dx * dx + dy * dy) < self.distance_to_end + self.length / 2
+
+    def close_to_objects(self, pedestrians, leader_gaps):
+        """Detect, for every vehicle, a leader too close or an object in the cone in front of it.
+
+        Equivalent to ``VehicleManager._is_close_to_object`` called for every vehicle:
+        same-lane traffic is checked with the gaps to the leading vehicles, and the
+        detection cone with the vehicles of other lanes and the pedestrians, taking the
+        candidate pairs from the same and adjacent cells of a uniform grid.
+
+        Args:
+            pedestrians: List of pedestrians.
+            leader_gaps: Gap of every vehicle to the vehicle ahead on its lane, inf if none.
+
+        Returns:
+            np.ndarray: Boolean mask, True for the vehicles that have to stop.
+        """
+        close = np.zeros(len(self), dtype=bool)
+        if not len(self):
+            return close
+        half_length = self.length / 2
+        close[leader_gaps <= 1.5 * self.distance_between_objects] = True
+
+        # Cells as large as the largest detection distance, so adjacent cells cover every hit
+        cell_size = 1.5 * self.distance_between_objects + 2 * half_length.max()
+        positions = np.stack([self.x, self.y], axis=1)
+
+        # Vehicles of other lanes: same direction of travel, within the detection distance of both lengths
+        i, j = grid_pairs(positions, positions, cell_size)
+        keep = self.lane[i] != self.lane[j]
+        i, j = i[keep], j[keep]
+        distance_limit = 1.5 * self.distance_between_objects + half_length[i] + half_length[j]
+        same_direction = _round(self.dir_x[j] * self.dir_x[i] + self.dir_y[j] * self.dir_y[i]) > 0
+        hits = self._in_cone(i, self.x[j], self.y[j], distance_limit, same_direction)
+        close[i[hits]] = True
+
+        # Pedestrians
+        if pedestrians:
+            pedestrian_xy = np.array([(pedestrian.position.x, pedestrian.position.y) for pedestrian in pedestrians])
+            distance_limit = self.distance_between_objects + half_length
+            i, j = grid_pairs(positions, pedestrian_xy, cell_size)
+            hits = self._in_cone(i, pedestrian_xy[j, 0], pedestrian_xy[j, 1], distance_limit[i], True)
+            close[i[hits]] = True
+        return close
+
+    def _in_cone(self, i, other_x, other_y, distance_limit, mask):
+        """Check which candidate objects lie in the detection cone of vehicle ``i``.
+
+        Args:
+            i: Vehicle index of each candidate pair.
+            other_x: X coordinate of the candidate object of each pair.
+            other_y: Y coordinate of the candidate object of each pair.
+            distance_limit: Detection distance of each pair.
+            mask: Pairs that are eligible at all.
+
+        Returns:
+            np.ndarray: Boolean mask of the pairs in the cone.
+        """
+        dx = other_x - self.x[i]
+        dy = other_y - self.y[i]
+        within = mask & (np.sqrt(dx * dx + dy * dy) <= distance_limit)
+        ux, uy = _normalize(dx, dy)
+        cosine = np.clip(_round(ux * self.dir_x[i] + uy * self.dir_y[i]), -1, 1)
+        return within & (np.abs(np.degrees(np.arccos(cosine))) <= self.detection_angle)
+
+    def compute_controls(self, rows):
+        """Compute throttle, brake and steering of vehicles following their head waypoint.
+
+        Batched equivalent of ``Vehicle.compute_control``, including the update of the
+        steering PID state in the arrays.
+
+        Args:
+            rows: Indices of the vehicles, all with a waypoint left.
+
+        Returns:
+            tuple: (throttle, brake, steering) arrays, one entry per row.
+        """
+        x, y, yaw = self.x[rows], self.y[rows], self.yaw[rows]
+        target_yaw = np.degrees(np.arctan2(self.waypoint_y[rows] - y, self.waypoint_x[rows] - x))
+        yaw_error = target_yaw - yaw
+        yaw_error = np.where(yaw_error > 180, yaw_error - 360, np.where(yaw_error < -180, yaw_error + 360, yaw_error))
+
+        # Distance to the lane axis and angle to the lane direction
+        lane_dir_x, lane_dir_y = self.lane_dir_x[rows], self.lane_dir_y[rows]
+        to_lane_x, to_lane_y = _round(x - self.lane_start_x[rows]), _round(y - self.lane_start_y[rows])
+        normal_distance = np.abs(_round(to_lane_x * lane_dir_y - to_lane_y * lane_dir_x))
+        with np.errstate(invalid='ignore'):
+            angle_diff = np.abs(np.degrees(np.arccos(_round(lane_dir_x * self.dir_x[rows] + lane_dir_y * self.dir_y[rows]))))
+            aligned = (angle_diff < 3) & (normal_distance < self.lane_deviation)
+
+        # Steering PID on the yaw error, reset when the vehicle is aligned with its lane
+        yaw_error = np.where(np.abs(yaw_error) < 1, 0.0, yaw_error)
+        previous_error = self.p_error[rows]
+        integral = np.clip(self.i_error[rows] + yaw_error, -0.1, 0.1)
+        output = self.k_p * yaw_error + self.k_i * integral + self.k_d * (yaw_error - previous_error)
+        steering = np.where(aligned, 0.0, np.clip(output, -self.max_steering, self.max_steering))
+        self.p_error[rows] = np.where(aligned, 0.0, yaw_error)
+        self.i_error[rows] = np.where(aligned, 0.0, integral)
+
+        throttle = np.where(steering != 0, 0.4, 1.0)
+        brake = np.zeros(len(rows))
+        return throttle, brake, steering
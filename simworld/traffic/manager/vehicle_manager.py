@@ -3,10 +3,14 @@
 This module handles the creation, spawning, and updating of vehicles in the simulation.
 It manages vehicle lifecycle, movement logic, and interaction with traffic signals.
 """
+import heapq
 import random
 
+import numpy as np
+
 from simworld.agent.vehicle import Vehicle, VehicleState
 from simworld.traffic.base.traffic_signal import TrafficSignalState
+from simworld.traffic.manager.vehicle_arrays import VehicleArrays
 from simworld.utils.load_json import load_json
 from simworld.utils.logger import Logger
 from simworld.utils.traffic_utils import cal_waypoints
@@ -28,6 +32,7 @@ class VehicleManager:
         """
         self.config = config
         self.vehicles = []
+        self.max_vehicle_length = 0
         self.roads = roads
         self.num_vehicles = num_vehicles
 
@@ -39,6 +44,12 @@ class VehicleManager:
 
         self.last_states = {}   # {vehicle_id: (throttle, brake, steering)}
 
+        # Struct-of-arrays backend of update_vehicles, for large fleets
+        self.vectorized = self.config.get('traffic.vehicle.vectorized', False)
+        self.arrays = None
+        self._rows = {}  # {vehicle: row of the arrays}
+        self._sent_states = None  # (throttle, brake, steering) last sent, one row per vehicle
+
         self.init_vehicles()
 
     def init_vehicles(self):
@@ -77,6 +88,8 @@ class VehicleManager:
 
                 self.logger.info(f"Spawned Vehicle: {new_vehicle.id} of type {vehicle_type['name']} on Lane {target_lane.id} at {target_position}")
 
+        self.max_vehicle_length = max((vehicle.length for vehicle in self.vehicles), default=0)
+
     def spawn_vehicles(self, communicator):
         """Spawn vehicles in the simulation environment.
 
@@ -85,7 +98,7 @@ class VehicleManager:
         """
         communicator.spawn_vehicles(self.vehicles)
 
-    def update_vehicles(self, communicator, intersection_controller, pedestrians):
+    def update_vehicles(self, communicator, intersection_controller, pedestrians, vehicle_hash=None, pedestrian_hash=None):
         """Update vehicle states and movements based on environment conditions.
 
         This method handles vehicle movement logic, including waypoint following,
@@ -95,7 +108,18 @@ class VehicleManager:
             communicator: Interface for sending updates to the simulation.
             intersection_controller: Controller for managing intersection logic.
             pedestrians: List of pedestrians to check for collision avoidance.
+            vehicle_hash: Optional spatial hash of the vehicles, up to date with their
+                positions. If given, obstacle avoidance only checks the nearby vehicles.
+            pedestrian_hash: Optional spatial hash of the pedestrians, used the same way.
         """
+        # Reorder the occupied lanes by the new positions, for the leader and gap queries
+        for lane in dict.fromkeys(vehicle.current_lane for vehicle in self.vehicles):
+            lane.update_order()
+
+        if self.vectorized:
+            self.update_vehicles_vectorized(communicator, intersection_controller, pedestrians, vehicle_hash, pedestrian_hash)
+            return
+
         for vehicle in self.vehicles:
             # update vehicle waypoints
             if vehicle.waypoints and len(vehicle.waypoints) > 0:
@@ -107,51 +131,11 @@ class VehicleManager:
                 if dot_product < 0:
                     vehicle.waypoints.pop(0)
 
-            if vehicle.state == VehicleState.WAITING:
-                communicator.vehicle_make_u_turn(vehicle.id)
-                vehicle.set_attributes(0.05, 0, -1)  # throttle = 0, brake = 0, steering = -1
-                vehicle.state = VehicleState.MAKING_U_TURN
-
-            if vehicle.state == VehicleState.MAKING_U_TURN:
-                if vehicle.completed_u_turn():
-                    vehicle.state = VehicleState.MOVING
-                    vehicle.steering_pid.reset()
-                else:
-                    continue
-
-            if vehicle.is_close_to_object(self.vehicles, pedestrians):
-                self.logger.debug(f'Vehicle {vehicle.id} is close to another vehicle, stop it')
-                if not vehicle.state == VehicleState.STOPPED:
-                    vehicle.set_attributes(0, 1, 0)  # throttle = 0, brake = 1, steering = 0
-                    vehicle.state = VehicleState.STOPPED
+            if not self._handle_vehicle_events(vehicle, communicator, intersection_controller,
+                                               lambda: self._is_close_to_object(vehicle, pedestrians,
+                                                                                vehicle_hash, pedestrian_hash)):
                 continue
 
-            # Check if vehicle has reached current waypoint
-            if vehicle.is_close_to_end():
-                self.logger.debug(f'Vehicle {vehicle.id} has reached current waypoint, get next waypoints')
-                next_lane, waypoints, current_intersection, is_u_turn = intersection_controller.get_waypoints_for_vehicle(vehicle.current_lane)
-
-                if is_u_turn:
-                    vehicle.state = VehicleState.WAITING
-                    vehicle.add_waypoint(waypoints)
-                    vehicle.change_to_next_lane(next_lane)
-                    # communicator.set_state(vehicle.vehicle_id, 0, 1, 0)
-                    vehicle.set_attributes(0, 1, 0)  # throttle = 0, brake = 1, steering = 0
-                    continue
-                else:
-                    vehicle_light_state, _ = current_intersection.get_traffic_light_state(vehicle.current_lane)
-                    if vehicle_light_state == TrafficSignalState.VEHICLE_GREEN:
-                        self.logger.debug(f'Vehicle {vehicle.id} has green light on lane {vehicle.current_lane.id}, add waypoints')
-                        vehicle.add_waypoint(waypoints)
-                        vehicle.change_to_next_lane(next_lane)
-                    else:
-                        if not vehicle.state == VehicleState.STOPPED:
-                            self.logger.debug(f'Vehicle {vehicle.id} has red light on lane {vehicle.current_lane.id}, stop it')
-                            # communicator.set_state(vehicle.vehicle_id, 0, 1, 0)
-                            vehicle.set_attributes(0, 1, 0)  # throttle = 0, brake = 1, steering = 0
-                            vehicle.state = VehicleState.STOPPED
-                        continue
-
             if vehicle.waypoints and len(vehicle.waypoints) > 0:
                 throttle, brake, steering, changed = vehicle.compute_control(vehicle.waypoints[0], 0.1)
                 if not vehicle.state == VehicleState.MOVING:
@@ -169,6 +153,185 @@ class VehicleManager:
         if changed_states:
             communicator.update_vehicles(changed_states)
 
+    def update_vehicles_vectorized(self, communicator, intersection_controller, pedestrians, vehicle_hash=None,
+                                   pedestrian_hash=None):
+        """Update vehicle states like ``update_vehicles``, with the per-vehicle math batched.
+
+        Waypoint advancement, the proximity cones and the steering PID of all vehicles
+        are computed as array operations on a struct-of-arrays copy of the fleet. Only
+        the vehicles with an event this tick (U-turn, obstacle, end of lane) go through
+        the per-vehicle logic, in ID order, so the decisions match ``update_vehicles``.
+        A vehicle changing lanes in that logic changes the leaders and the cone candidates
+        of the vehicles on its old and new lane, so those of them not handled yet are
+        checked again, one by one, when their turn comes.
+
+        Args:
+            communicator: Interface for sending updates to the simulation.
+            intersection_controller: Controller for managing intersection logic.
+            pedestrians: List of pedestrians to check for collision avoidance.
+            vehicle_hash: Optional spatial hash of the vehicles, used for the checks done again.
+            pedestrian_hash: Optional spatial hash of the pedestrians, used the same way.
+        """
+        if self.arrays is None or len(self.arrays) != len(self.vehicles):
+            self.arrays = VehicleArrays(self.vehicles, self.config)
+            self._rows = {vehicle: row for row, vehicle in enumerate(self.vehicles)}
+            self._sent_states = np.array([self.last_states.get(vehicle.id, (np.nan,) * 3) for vehicle in self.vehicles],
+                                         dtype=float).reshape(-1, 3)
+        arrays = self.arrays
+        arrays.pull()
+
+        # update vehicle waypoints
+        passed = np.flatnonzero(arrays.has_waypoint & arrays.passed_waypoints())
+        for row in passed:
+            self.vehicles[row].waypoints.pop(0)
+        arrays.pull(passed)
+
+        # Per-vehicle logic only for the vehicles with an event
+        leader_gaps = np.array([vehicle.current_lane.get_leader(vehicle)[1] for vehicle in self.vehicles], dtype=float)
+        close = arrays.close_to_objects(pedestrians, leader_gaps)
+        events = np.flatnonzero(arrays.in_state(VehicleState.WAITING, VehicleState.MAKING_U_TURN)
+                                | close | arrays.close_to_end())
+        follow = np.ones(len(arrays), dtype=bool)
+        queue = events.tolist()  # sorted, hence a heap
+        queued = set(queue)
+        recheck = set()
+        handled = []
+        while queue:
+            row = heapq.heappop(queue)
+            vehicle = self.vehicles[row]
+            lane = vehicle.current_lane
+            follow[row] = self._handle_vehicle_events(
+                vehicle, communicator, intersection_controller,
+                lambda: (self._is_close_to_object(vehicle, pedestrians, vehicle_hash, pedestrian_hash)
+                         if row in recheck else close[row]))
+            handled.append(row)
+
+            if vehicle.current_lane is not lane:
+                for other in lane.vehicles + vehicle.current_lane.vehicles:
+                    other_row = self._rows[other]
+                    if other_row > row:
+                        recheck.add(other_row)
+                        if other_row not in queued:
+                            queued.add(other_row)
+                            heapq.heappush(queue, other_row)
+        arrays.pull(handled)
+
+        # Follow the head waypoint, writing back only the vehicles whose controls or PID state changed
+        rows = np.flatnonzero(follow & arrays.has_waypoint)
+        previous = np.stack([arrays.throttle[rows], arrays.brake[rows], arrays.steering[rows],
+                             arrays.p_error[rows], arrays.i_error[rows]], axis=1)
+        throttle, brake, steering = arrays.compute_controls(rows)
+        arrays.throttle[rows] = throttle
+        arrays.brake[rows] = brake
+        arrays.steering[rows] = steering
+        current = np.stack([throttle, brake, steering, arrays.p_error[rows], arrays.i_error[rows]], axis=1)
+        modified = (current != previous).any(axis=1) | ~arrays.in_state(VehicleState.MOVING)[rows]
+        for row, values in zip(rows[modified], current[modified].tolist()):
+            vehicle = self.vehicles[row]
+            vehicle.set_attributes(values[0], values[1], values[2])
+            vehicle.steering_pid.p_error = values[3]
+            vehicle.steering_pid.i_error = values[4]
+            if not vehicle.state == VehicleState.MOVING:
+                vehicle.state = VehicleState.MOVING
+
+        controls = np.stack([arrays.throttle, arrays.brake, arrays.steering], axis=1)
+        changed_rows = np.flatnonzero((controls != self._sent_states).any(axis=1))
+        self._sent_states[changed_rows] = controls[changed_rows]
+        changed_states = {}
+        for row in changed_rows:
+            vehicle = self.vehicles[row]
+            current_state = vehicle.get_attributes()
+            changed_states[vehicle.id] = current_state
+            self.last_states[vehicle.id] = current_state
+
+        if changed_states:
+            communicator.update_vehicles(changed_states)
+
+    def _is_close_to_object(self, vehicle, pedestrians, vehicle_hash, pedestrian_hash):
+        """Check for objects in front of a vehicle, among the nearby ones only if hashes are given.
+
+        Traffic on the same lane is checked with the gap to the leading vehicle, and the
+        detection cone only with the vehicles of other lanes, e.g. at intersections.
+
+        Args:
+            vehicle: The vehicle.
+            pedestrians: List of all pedestrians.
+            vehicle_hash: Spatial hash of the vehicles, or None to check all vehicles.
+            pedestrian_hash: Spatial hash of the pedestrians, or None to check all pedestrians.
+
+        Returns:
+            bool: True if the vehicle is close to any object.
+        """
+        if vehicle.is_close_to_leader():
+            return True
+
+        distance = self.config['traffic.distance_between_objects']
+        vehicles = self.vehicles
+        if vehicle_hash is not None:
+            vehicles = vehicle_hash.query(vehicle.position, 1.5 * distance + (vehicle.length + self.max_vehicle_length) / 2)
+        if pedestrian_hash is not None:
+            pedestrians = pedestrian_hash.query(vehicle.position, distance + vehicle.length / 2)
+        lane = vehicle.current_lane
+        return vehicle.is_close_to_object([other for other in vehicles if other.current_lane is not lane], pedestrians)
+
+    def _handle_vehicle_events(self, vehicle, communicator, intersection_controller, is_close_to_object):
+        """Handle U-turns, obstacles and the end of the lane for one vehicle.
+
+        Args:
+            vehicle: The vehicle.
+            communicator: Interface for sending updates to the simulation.
+            intersection_controller: Controller for managing intersection logic.
+            is_close_to_object: Function returning whether an object is in front of the vehicle.
+
+        Returns:
+            bool: True if the vehicle follows its waypoints this tick, False if it waits.
+        """
+        if vehicle.state == VehicleState.WAITING:
+            communicator.vehicle_make_u_turn(vehicle.id)
+            vehicle.set_attributes(0.05, 0, -1)  # throttle = 0, brake = 0, steering = -1
+            vehicle.state = VehicleState.MAKING_U_TURN
+
+        if vehicle.state == VehicleState.MAKING_U_TURN:
+            if vehicle.completed_u_turn():
+                vehicle.state = VehicleState.MOVING
+                vehicle.steering_pid.reset()
+            else:
+                return False
+
+        if is_close_to_object():
+            self.logger.debug(f'Vehicle {vehicle.id} is close to another vehicle, stop it')
+            if not vehicle.state == VehicleState.STOPPED:
+                vehicle.set_attributes(0, 1, 0)  # throttle = 0, brake = 1, steering = 0
+                vehicle.state = VehicleState.STOPPED
+            return False
+
+        # Check if vehicle has reached current waypoint
+        if vehicle.is_close_to_end():
+            self.logger.debug(f'Vehicle {vehicle.id} has reached current waypoint, get next waypoints')
+            next_lane, waypoints, current_intersection, is_u_turn = intersection_controller.get_waypoints_for_vehicle(vehicle.current_lane)
+
+            if is_u_turn:
+                vehicle.state = VehicleState.WAITING
+                vehicle.add_waypoint(waypoints)
+                vehicle.change_to_next_lane(next_lane)
+                # communicator.set_state(vehicle.vehicle_id, 0, 1, 0)
+                vehicle.set_attributes(0, 1, 0)  # throttle = 0, brake = 1, steering = 0
+                return False
+            else:
+                vehicle_light_state, _ = current_intersection.get_traffic_light_state(vehicle.current_lane)
+                if vehicle_light_state == TrafficSignalState.VEHICLE_GREEN:
+                    self.logger.debug(f'Vehicle {vehicle.id} has green light on lane {vehicle.current_lane.id}, add waypoints')
+                    vehicle.add_waypoint(waypoints)
+                    vehicle.change_to_next_lane(next_lane)
+                else:
+                    if not vehicle.state == VehicleState.STOPPED:
+                        self.logger.debug(f'Vehicle {vehicle.id} has red light on lane {vehicle.current_lane.id}, stop it')
+                        # communicator.set_state(vehicle.vehicle_id, 0, 1, 0)
+                        vehicle.set_attributes(0, 1, 0)  # throttle = 0, brake = 1, steering = 0
+                        vehicle.state = VehicleState.STOPPED
+                    return False
+        return True
+
     def stop_vehicles(self, communicator):
         """Stop all vehicles in the simulation."""
         for vehicle in self.vehicles:
@@ -0,0 +1,187 @@
+"""Fixed-step simulation clock module.
+
+This module provides the clock that paces the traffic loop, the local planners and
+the video recorders. Simulated time advances in fixed steps of ``dt`` seconds, and
+the mode of the clock only decides how a step is paced against the wall clock:
+
+- ``realtime``: a step takes ``dt`` wall-clock seconds, as with a plain sleep.
+- ``fast``: steps are not paced at all, for headless runs as fast as possible.
+- ``sync``: Unreal Engine is paused and advanced by one tick per step.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from simworld.utils.logger import Logger
+
+CLOCK_MODES = ('realtime', 'fast', 'sync')
+
+
+class SimClock:
+    """Deterministic fixed-step clock shared by the components of a simulation.
+
+    One loop, usually ``TrafficController.simulation``, drives the clock by calling
+    ``tick`` once per step inside ``driving``. While the clock is driven, ``sleep``
+    blocks until the driver has advanced simulated time by the requested duration,
+    so that agents and recorders wait in simulated time rather than in wall-clock
+    time. Without a driver, ``sleep`` ticks the clock from the calling thread.
+    Observers such as recorders pass ``tick=False`` instead, so that they never
+    advance the time shared with the other users of the clock.
+
+    Attributes:
+        dt: Duration of one step in simulated seconds.
+        mode: One of ``CLOCK_MODES``.
+        step_count: Number of steps taken so far.
+    """
+
+    def __init__(self, dt: float = 0.1, mode: str = 'realtime', unrealcv=None):
+        """Initialize the clock.
+
+        In ``sync`` mode the game is paused and its tick interval set to ``dt``.
+
+        Args:
+            dt: Duration of one step in simulated seconds.
+            mode: One of ``CLOCK_MODES``.
+            unrealcv: UnrealCV client ticked by the clock, required in ``sync`` mode.
+
+        Raises:
+            ValueError: If the time step or the mode is invalid, or if ``sync`` mode has no UnrealCV client.
+        """
+        if dt <= 0:
+            raise ValueError(f'Time step must be positive, got: {dt}')
+        if mode not in CLOCK_MODES:
+            raise ValueError(f'Invalid clock mode: {mode}. Please choose from {CLOCK_MODES}.')
+        if mode == 'sync' and unrealcv is None:
+            raise ValueError('Clock mode "sync" requires an UnrealCV client')
+
+        self.dt = dt
+        self.mode = mode
+        self.unrealcv = unrealcv
+        self.step_count = 0
+
+        self.logger = Logger.get_logger('SimClock')
+        self._condition = threading.Condition()
+        self._driven = False
+        self._deadline = None  # wall-clock time at which the next realtime step ends
+
+        if mode == 'sync':
+            self.unrealcv.set_mode('sync', dt)
+        self.logger.info(f'SimClock initialized in {mode} mode with dt={dt}')
+
+    @property
+    def time(self) -> float:
+        """Simulated time in seconds since the clock started."""
+        return self.step_count * self.dt
+
+    @property
+    def is_driven(self) -> bool:
+        """Whether a loop is currently driving the clock."""
+        return self._driven
+
+    @contextmanager
+    def driving(self):
+        """Mark the calling loop as the driver of the clock for the duration of the block.
+
+        Threads sleeping on the clock wake up when the block is left and tick the
+        clock themselves from then on.
+        """
+        with self._condition:
+            self._driven = True
+            self._deadline = None
+        try:
+            yield self
+        finally:
+            with self._condition:
+                self._driven = False
+                self._condition.notify_all()
+
+    def tick(self, pace: bool = True) -> int:
+        """Advance simulated time by one step.
+
+        Args:
+            pace: Whether to wait for the end of the step in ``realtime`` mode. Loops
+                that are already paced by someone else, e.g. by an external signal,
+                pass False.
+
+        Returns:
+            int: Number of steps taken so far.
+        """
+        if self.mode == 'realtime' and pace:
+            self._wait_for_deadline()
+        elif self.mode == 'sync':
+            self.unrealcv.tick()
+
+        with self._condition:
+            self.step_count += 1
+            self._condition.notify_all()
+            return self.step_count
+
+    def sleep(self, duration: float, exit_event: threading.Event = None, tick: bool = True):
+        """Wait for a duration of simulated time.
+
+        The duration is rounded up to whole steps. While the clock is driven, this
+        waits for the driver to take the steps; otherwise the caller takes them
+        itself with ``tick``, unless ``tick`` is False.
+
+        Args:
+            duration: Duration in simulated seconds.
+            exit_event: Optional event that ends the wait early when set.
+            tick: Whether to take the steps when nobody drives the clock. If False,
+                the caller waits for other users of the clock to take them.
+        """
+        with self._condition:
+            target = self.step_count + max(math.ceil(duration / self.dt - 1e-9), 0)
+        self._wait_for_step(target, exit_event, tick)
+
+    def wait_until(self, sim_time: float, exit_event: threading.Event = None, tick: bool = True):
+        """Wait until simulated time reaches a point, like ``sleep`` but without drift.
+
+        Args:
+            sim_time: Simulated time in seconds, rounded up to a whole step.
+            exit_event: Optional event that ends the wait early when set.
+            tick: Whether to take the steps when nobody drives the clock, see ``sleep``.
+        """
+        self._wait_for_step(math.ceil(sim_time / self.dt - 1e-9), exit_event, tick)
+
+    def close(self):
+        """Release the engine from ``sync`` mode, resuming the game."""
+        if self.mode == 'sync':
+            self.unrealcv.set_mode('async')
+
+    def _wait_for_deadline(self):
+        """Sleep until the wall-clock end of the current step.
+
+        Deadlines are spaced by ``dt`` so that time spent in the step itself is not
+        added to the wait. A loop that falls more than one step behind starts over
+        from the current time instead of catching up with a burst of steps. Threads
+        ticking the clock at once take successive deadlines.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if self._deadline is None or now - self._deadline > self.dt:
+                self._deadline = now
+            self._deadline += self.dt
+            deadline = self._deadline
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _wait_for_step(self, target: int, exit_event: threading.Event = None, tick: bool = True):
+        """Wait until the clock has taken a number of steps.
+
+        Args:
+            target: Step count to reach.
+            exit_event: Optional event that ends the wait early when set.
+            tick: Whether to take the steps when nobody drives the clock.
+        """
+        with self._condition:
+            while (self._driven or not tick) and self.step_count < target:
+                if exit_event is not None and exit_event.is_set():
+                    return
+                self._condition.wait(self.dt)
+            remaining = target - self.step_count
+        for _ in range(remaining):
+            if exit_event is not None and exit_event.is_set():
+                return
+            self.tick()
@@ -0,0 +1,199 @@
+"""Uniform-grid spatial hash for neighbor queries between moving objects.
+
+This module buckets objects such as vehicles and pedestrians into square cells, so
+that a proximity check only looks at the objects in the cells around a position
+instead of at every object in the simulation.
+"""
+import math
+from collections import defaultdict
+
+import numpy as np
+
+# Cell offsets covering a cell and its eight neighbors
+_NEIGHBOR_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+class SpatialHash:
+    """Uniform grid of cells mapping to the objects whose position lies in them.
+
+    Objects need a ``position`` attribute with ``x`` and ``y`` coordinates. They are
+    kept in the cell of their position at the time of the last ``insert``, ``update``
+    or ``rebuild``, so the hash has to be updated after the objects move.
+
+    Attributes:
+        cell_size: Side length of the cells.
+    """
+
+    def __init__(self, cell_size: float):
+        """Initialize an empty spatial hash.
+
+        Args:
+            cell_size: Side length of the cells, ideally about the largest query radius.
+
+        Raises:
+            ValueError: If the cell size is not positive.
+        """
+        if cell_size <= 0:
+            raise ValueError(f'Cell size must be positive, got: {cell_size}')
+        self.cell_size = cell_size
+        self._cells = defaultdict(dict)  # {cell: {object: None}}, ordered by insertion
+        self._cell_of = {}  # {object: cell}
+
+    def __len__(self):
+        """Get the number of objects in the hash.
+
+        Returns:
+            int: Number of objects.
+        """
+        return len(self._cell_of)
+
+    def __contains__(self, item):
+        """Check whether an object is in the hash.
+
+        Args:
+            item: The object.
+
+        Returns:
+            bool: True if the object is in the hash.
+        """
+        return item in self._cell_of
+
+    def cell(self, position):
+        """Get the cell of a position.
+
+        Args:
+            position: Position with ``x`` and ``y`` coordinates.
+
+        Returns:
+            tuple: (column, row) of the cell.
+        """
+        return (math.floor(position.x / self.cell_size), math.floor(position.y / self.cell_size))
+
+    def insert(self, item):
+        """Add an object, or move it to the cell of its current position.
+
+        Args:
+            item: The object.
+        """
+        cell = self.cell(item.position)
+        previous = self._cell_of.get(item)
+        if previous == cell:
+            return
+        if previous is not None:
+            self._discard(item, previous)
+        self._cells[cell][item] = None
+        self._cell_of[item] = cell
+
+    def remove(self, item):
+        """Remove an object.
+
+        Args:
+            item: The object.
+        """
+        cell = self._cell_of.pop(item, None)
+        if cell is not None:
+            self._discard(item, cell)
+
+    def update(self, items):
+        """Incrementally synchronize the hash with a collection of objects.
+
+        Only the objects that moved to another cell are touched. Objects of the hash
+        that are not in ``items`` any more are removed.
+
+        Args:
+            items: All objects that should be in the hash.
+        """
+        for item in items:
+            self.insert(item)
+        if len(self._cell_of) != len(items):
+            for item in self._cell_of.keys() - set(items):
+                self.remove(item)
+
+    def rebuild(self, items):
+        """Clear the hash and insert a collection of objects.
+
+        Args:
+            items: All objects that should be in the hash.
+        """
+        self._cells.clear()
+        self._cell_of.clear()
+        for item in items:
+            self.insert(item)
+
+    def query(self, position, radius: float):
+        """Get the objects in the cells overlapping a circle.
+
+        The result is a superset of the objects within ``radius`` of ``position``;
+        callers still apply their exact distance test.
+
+        Args:
+            position: Center of the circle, with ``x`` and ``y`` coordinates.
+            radius: Radius of the circle.
+
+        Returns:
+            list: Candidate objects.
+        """
+        size = self.cell_size
+        min_x, max_x = math.floor((position.x - radius) / size), math.floor((position.x + radius) / size)
+        min_y, max_y = math.floor((position.y - radius) / size), math.floor((position.y + radius) / size)
+        cells = self._cells
+        candidates = []
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                bucket = cells.get((x, y))
+                if bucket:
+                    candidates.extend(bucket)
+        return candidates
+
+    def _discard(self, item, cell):
+        """Remove an object from a cell, dropping the cell when it becomes empty."""
+        bucket = self._cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self._cells[cell]
+
+
+def grid_pairs(points_a, points_b, cell_size: float):
+    """Find the index pairs of two point sets that lie in the same or adjacent cells.
+
+    Batched counterpart of ``SpatialHash.query`` with a radius of at most
+    ``cell_size``: every pair of points closer than ``cell_size`` is returned, along
+    with some farther ones that callers filter with their exact distance test.
+
+    Args:
+        points_a: (N, 2) array of query points.
+        points_b: (M, 2) array of candidate points.
+        cell_size: Side length of the cells.
+
+    Returns:
+        tuple: (a, b) index arrays, one entry per candidate pair.
+    """
+    cells_a = np.floor(np.asarray(points_a, dtype=float).reshape(-1, 2) / cell_size).astype(np.int64)
+    cells_b = np.floor(np.asarray(points_b, dtype=float).reshape(-1, 2) / cell_size).astype(np.int64)
+    if not len(cells_a) or not len(cells_b):
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    # One sortable key per cell, with the rows of a column kept contiguous
+    offset = min(cells_a[:, 1].min(), cells_b[:, 1].min()) - 1
+    stride = max(cells_a[:, 1].max(), cells_b[:, 1].max()) - offset + 2
+    keys_b = cells_b[:, 0] * stride + (cells_b[:, 1] - offset)
+    order = np.argsort(keys_b, kind='stable')
+    sorted_keys = keys_b[order]
+
+    a_parts, b_parts = [], []
+    for dx, dy in _NEIGHBOR_OFFSETS:
+        keys_a = (cells_a[:, 0] + dx) * stride + (cells_a[:, 1] + dy - offset)
+        lo = np.searchsorted(sorted_keys, keys_a, 'left')
+        hi = np.searchsorted(sorted_keys, keys_a, 'right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            continue
+        a_parts.append(np.repeat(np.arange(len(cells_a)), counts))
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        b_parts.append(order[np.repeat(lo, counts) + offsets])
+    if not a_parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(a_parts), np.concatenate(b_parts)
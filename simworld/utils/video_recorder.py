@@ -21,7 +21,8 @@ class VideoRecorder:
             fps=25.0,
             frame_num=500,
             move_pattern=None,
-            camera_mode='lit'):
+            camera_mode='lit',
+            clock=None):
         """Initialize the recorder with target communicator and humanoid.
 
         Parameters
@@ -42,6 +43,10 @@ class VideoRecorder:
             Total number of frames to record. Use >0 to enable progress.
         camera_mode: str
             Unreal render mode, e.g., 'lit', 'depth', etc.
+        clock: SimClock
+            Optional simulation clock. If given, background recording captures one
+            frame every ``1 / fps`` seconds of simulated time instead of wall-clock time.
+            The recorder only waits on the clock and never ticks it.
         """
         self.communicator = communicator
         self.humanoid = humanoid
@@ -53,6 +58,7 @@ class VideoRecorder:
         self.fps = fps
         self.frame_num = frame_num
         self.camera_mode = camera_mode
+        self.clock = clock
         if move_pattern:
             self.move_pattern = lambda timestamp: move_pattern(self, timestamp)
         else:
@@ -68,6 +74,7 @@ class VideoRecorder:
         # Async recording state
         self.is_recording = False
         self._recording_thread = None
+        self._stop_event = threading.Event()  # wakes the background loop up when stopping
         self._frames = []
         self._camera_positions = []
         self._actions = []
@@ -119,6 +126,11 @@ class VideoRecorder:
         """
         try:
             # If pose not provided, sync and get it now
+            if camera_loc is None or camera_rot is None:
+                if self._recording_thread:
+                    # Background recordings share one batched camera sync per frame
+                    poses = self.communicator.sync_recording_cameras(max_age=0.5 / self.fps)
+                    camera_loc, camera_rot = poses.get(self.humanoid.id, (None, None))
             if camera_loc is None or camera_rot is None:
                 camera_loc, camera_rot = self.communicator.sync_camera_to_actor(
                     self.humanoid.id, self.humanoid.camera_id
@@ -151,7 +163,8 @@ class VideoRecorder:
         self._camera_positions = []
         self._actions = []
         self.is_recording = True
-        self._start_time = time.time()
+        self._stop_event.clear()
+        self._start_time = self._now()
 
         self._recording_thread = threading.Thread(target=self._async_recording_loop, daemon=True)
         self._recording_thread.start()
@@ -170,7 +183,8 @@ class VideoRecorder:
 
         self.video_path = os.path.join(self.output_dir, f'{self.humanoid.id} - {time.time()}.mp4')
         self.is_recording = False
-        duration = time.time() - self._start_time
+        self._stop_event.set()
+        duration = self._now() - self._start_time
         if self._recording_thread:
             self._recording_thread.join()
         if len(self._frames) <= 1:
@@ -192,7 +206,12 @@ class VideoRecorder:
         """Background loop for capturing frames."""
         interval = 1.0 / self.fps
         timestamp = 0
-        
+
+        while self.is_recording and not self._stop_event.is_set() and self.clock is not None:
+            self._capture_step(timestamp)
+            timestamp += 1
+            self.clock.wait_until(self._start_time + timestamp * interval, self._stop_event, tick=False)
+
         while self.is_recording:
             loop_start = time.time()
             
@@ -205,6 +224,10 @@ class VideoRecorder:
             if sleep_time > 0:
                 time.sleep(sleep_time)
 
+    def _now(self):
+        """Get the current time, simulated if the recorder has a clock."""
+        return self.clock.time if self.clock is not None else time.time()
+
     def _move_pattern(self, timestamp):
         """Generate a movement pattern for the humanoid at given timestamp."""
         actions = []
@@ -0,0 +1,88 @@
+"""Tests for recording and replaying UnrealCV sessions."""
+import gzip
+import pickle
+import time
+
+import pytest
+
+from simworld.communicator.session_record import (ReplayClient,
+                                                  SessionRecorder,
+                                                  load_session)
+
+
+class _FakeClient:
+    """Client stub answering every command, with a binary response for images."""
+
+    def __init__(self, send_time=0.0):
+        self.send_time = send_time
+        self.async_batches = []
+
+    def request(self, cmd, timeout=5):
+        if timeout < 0:
+            return None
+        return b'\x89PNG\x00' if cmd.startswith('vget /camera/') else f'ok {cmd}'
+
+    def request_batch(self, cmds):
+        return [self.request(cmd) for cmd in cmds]
+
+    def request_batch_async(self, cmds):
+        time.sleep(self.send_time)
+        self.async_batches.append(list(cmds))
+
+
+def _record(path, send_time=0.0):
+    recorder = SessionRecorder(str(path))
+    client = recorder.wrap(_FakeClient(send_time))
+    client.request('vget /object/GEN_BP_Vehicle_0/location')
+    client.request_batch(['vget /camera/0/lit png', 'vget /objects'])
+    client.request_batch_async(['vset /object/GEN_BP_Vehicle_0/destroy', 'vget /unrealcv/status'])
+    recorder.close()
+
+
+def test_round_trip(tmp_path):
+    """Text and binary responses are served back, and async batches are kept without responses."""
+    path = tmp_path / 'session.ucvrec'
+    _record(path)
+
+    records = load_session(str(path))
+    assert [responses for _, _, _, responses in records] == [
+        ('ok vget /object/GEN_BP_Vehicle_0/location',),
+        (b'\x89PNG\x00', 'ok vget /objects'),
+        (),
+    ]
+
+    replay = ReplayClient(str(path))
+    assert replay.request_batch(['vget /camera/0/lit png', 'vget /objects']) == [b'\x89PNG\x00', 'ok vget /objects']
+    assert replay.request_batch_async(['vset /object/GEN_BP_Vehicle_0/destroy', 'vget /unrealcv/status']) is None
+    assert replay.miss_count == 0
+
+
+def test_realtime_replay_waits_for_async_batches(tmp_path):
+    """The recorded send time of an async batch is replayed."""
+    path = tmp_path / 'session.ucvrec'
+    _record(path, send_time=0.2)
+
+    replay = ReplayClient(str(path), realtime=True)
+    start = time.perf_counter()
+    replay.request_batch_async(['vset /object/GEN_BP_Vehicle_0/destroy', 'vget /unrealcv/status'])
+    assert time.perf_counter() - start >= 0.15
+
+
+def test_truncated_session_is_readable(tmp_path):
+    """A session cut off inside a record keeps the records before it."""
+    path = tmp_path / 'session.ucvrec'
+    _record(path)
+    with gzip.open(path, 'rb') as f:
+        data = f.read()
+    with gzip.open(path, 'wb') as f:
+        f.write(data[:-10])
+    assert len(load_session(str(path))) == 2
+
+
+def test_pickled_session_is_rejected(tmp_path):
+    """Files in the former pickle format are not unpickled."""
+    path = tmp_path / 'session.ucvrec'
+    with gzip.open(path, 'wb') as f:
+        pickle.dump(('simworld-unrealcv-session', 1, 0.0), f)
+    with pytest.raises(ValueError):
+        load_session(str(path))
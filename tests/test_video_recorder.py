@@ -0,0 +1,78 @@
+"""Tests for background video recording on a simulation clock."""
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from simworld.utils.sim_clock import SimClock
+from simworld.utils.video_recorder import VideoRecorder
+
+
+class _FakeCommunicator:
+    """Communicator stub returning blank frames and a fixed camera pose."""
+
+    def __init__(self):
+        self.unrealcv = SimpleNamespace(set_camera_resolution=lambda camera_id, resolution: None)
+        self.captures = 0
+
+    def sync_recording_cameras(self, max_age=None):
+        return {}
+
+    def sync_camera_to_actor(self, humanoid_id, camera_id):
+        return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+
+    def get_camera_observation(self, camera_id, viewmode, mode='direct'):
+        self.captures += 1
+        return np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def _make_recorder(tmp_path, clock):
+    humanoid = SimpleNamespace(id=0, camera_id=1)
+    return VideoRecorder(_FakeCommunicator(), humanoid, output_dir=str(tmp_path), resolution=(8, 8),
+                         fps=10.0, clock=clock)
+
+
+def test_stop_does_not_wait_for_the_driver(tmp_path):
+    """Stopping returns while the loop driving the clock is paused."""
+    clock = SimClock(0.1, 'fast')
+    recorder = _make_recorder(tmp_path, clock)
+    paused, release = threading.Event(), threading.Event()
+
+    def drive():
+        with clock.driving():
+            for _ in range(5):
+                clock.tick()
+                time.sleep(0.01)
+            paused.set()
+            release.wait()
+
+    driver = threading.Thread(target=drive, daemon=True)
+    driver.start()
+    while not clock.is_driven:
+        time.sleep(0.001)
+    recorder.start_async()
+    assert paused.wait(5)
+
+    stopper = threading.Thread(target=recorder.stop_async, daemon=True)
+    stopper.start()
+    stopper.join(2)
+    stopped = not stopper.is_alive()
+    release.set()
+    driver.join(5)
+    assert stopped
+
+
+def test_recorder_does_not_tick_a_shared_clock(tmp_path):
+    """A recorder follows the time taken by a planner on the same clock without adding to it."""
+    clock = SimClock(0.1, 'fast')
+    recorder = _make_recorder(tmp_path, clock)
+    recorder.start_async()
+    # Waits of a local planner on an undriven clock, see LocalPlanner.navigate_rule_based
+    for _ in range(20):
+        clock.sleep(0.1)
+        time.sleep(0.005)
+    time.sleep(0.05)
+    recorder.stop_async()
+    assert clock.step_count == 20
+    assert 1 < recorder.communicator.captures <= 21